@@ -0,0 +1,179 @@
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+import tempfile
+
+CHUNK_SIZE = 1024 * 1024  # 1 MiB
+# Room for the other multipart form fields (notes, title) next to the audio part
+FORM_OVERHEAD_BYTES = 1024 * 1024
+
+AUDIO_MIME_TYPES = {
+    ".webm": "audio/webm",
+    ".wav": "audio/wav",
+    ".m4a": "audio/mp4",
+    ".mp3": "audio/mp3",
+    ".ogg": "audio/ogg",
+    ".opus": "audio/ogg",
+    ".flac": "audio/flac",
+}
+
+
+class AudioTooLargeError(ValueError):
+    pass
+
+
+def max_audio_bytes():
+    return int(float(os.getenv("SCRIBE_MAX_AUDIO_MB", "500")) * 1024 * 1024)
+
+
+def guess_audio_mime_type(filename, content_type=None):
+    """Pick a MIME type Gemini accepts, preferring the browser-supplied one."""
+    if content_type and content_type.startswith("audio/"):
+        return content_type.split(";")[0]
+    ext = os.path.splitext(filename or "")[1].lower()
+    if ext in AUDIO_MIME_TYPES:
+        return AUDIO_MIME_TYPES[ext]
+    guessed, _ = mimetypes.guess_type(filename or "")
+    return guessed if guessed and guessed.startswith("audio/") else "audio/mp3"
+
+
+class IngestedAudio:
+    """
+    An uploaded recording ready to hand to Gemini.
+    `file` is the request's own spooled upload buffer, rewound to the start,
+    so the bytes are never copied to a second location on disk.
+    """
+
+    def __init__(self, file, filename, mime_type, size, sha256):
+        self.file = file
+        self.filename = filename
+        self.mime_type = mime_type
+        self.size = size
+        self.sha256 = sha256
+
+    def __repr__(self):
+        return f"IngestedAudio({self.filename!r}, {self.mime_type}, {self.size} bytes, sha256={self.sha256[:12]})"
+
+
+def _too_large(max_bytes):
+    return AudioTooLargeError(f"Audio file exceeds the {max_bytes // (1024 * 1024)} MB limit (SCRIBE_MAX_AUDIO_MB).")
+
+
+def _read_upload(upload, max_bytes, sink=None):
+    """Hash and size the upload (copying it into `sink` in the same pass). Returns (size, sha256)."""
+    if getattr(upload, "size", None) and upload.size > max_bytes:
+        raise _too_large(max_bytes)  # Starlette already knows the spooled size
+    fileobj = upload.file
+    fileobj.seek(0)
+
+    digest = hashlib.sha256()
+    size = 0
+    while True:
+        chunk = fileobj.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > max_bytes:
+            raise _too_large(max_bytes)
+        digest.update(chunk)
+        if sink is not None:
+            sink.write(chunk)
+    fileobj.seek(0)
+    return size, digest.hexdigest()
+
+
+def ingest_upload(upload, max_bytes=None):
+    """
+    Hash and size-check a FastAPI UploadFile in a single streaming pass.
+    Raises AudioTooLargeError once the cap is crossed, without reading the rest.
+    Blocking; call it via run_in_threadpool from async handlers.
+    """
+    size, sha256 = _read_upload(upload, max_bytes or max_audio_bytes())
+    return IngestedAudio(
+        file=upload.file,
+        filename=upload.filename or "audio",
+        mime_type=guess_audio_mime_type(upload.filename, upload.content_type),
+        size=size,
+        sha256=sha256,
+    )
+
+
+def detach_audio(upload, max_bytes=None):
+    """
+    Like ingest_upload(), but copies the upload into an anonymous temp file
+    owned by the caller while hashing it (one read of the upload). Needed for
+    work that outlives the request, since Starlette closes the upload buffer
+    once the response is sent. Blocking; run it in a thread.
+    """
+    copy = tempfile.TemporaryFile()
+    try:
+        size, sha256 = _read_upload(upload, max_bytes or max_audio_bytes(), sink=copy)
+    except BaseException:
+        copy.close()
+        raise
+    copy.seek(0)
+    return IngestedAudio(copy, upload.filename or "audio",
+                         guess_audio_mime_type(upload.filename, upload.content_type), size, sha256)
+
+
+class UploadLimitMiddleware:
+    """
+    ASGI middleware rejecting audio uploads over SCRIBE_MAX_AUDIO_MB with a
+    413 before Starlette has spooled the body: up front from Content-Length,
+    or, for chunked requests, as soon as the received bytes cross the cap.
+    ingest_upload() still checks the exact size of the audio part.
+    """
+
+    def __init__(self, app, paths, max_bytes=None):
+        self.app = app
+        self.paths = set(paths)
+        self.max_bytes = max_bytes
+
+    async def _reject(self, send, max_bytes):
+        body = json.dumps({"error": str(_too_large(max_bytes))}).encode()
+        await send({"type": "http.response.start", "status": 413,
+                    "headers": [(b"content-type", b"application/json"),
+                                (b"content-length", str(len(body)).encode())]})
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        max_bytes = self.max_bytes or max_audio_bytes()
+        limit = max_bytes + FORM_OVERHEAD_BYTES
+        length = dict(scope.get("headers") or []).get(b"content-length")
+        if length is not None and length.isdigit() and int(length) > limit:
+            await self._reject(send, max_bytes)
+            return
+
+        state = {"received": 0, "exceeded": False, "started": False}
+
+        async def limited_receive():
+            if state["exceeded"]:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                state["received"] += len(message.get("body", b""))
+                if state["received"] > limit:
+                    # Stop feeding the form parser; the app's error response is replaced below
+                    state["exceeded"] = True
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message):
+            if state["exceeded"]:
+                return
+            state["started"] = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not state["exceeded"]:
+                raise
+        if state["exceeded"] and not state["started"]:
+            await self._reject(send, max_bytes)
@@ -0,0 +1,377 @@
+import hashlib
+import io
+import os
+import re
+from collections import deque
+
+import numpy as np
+
+from stream_transcriber import SAMPLE_RATE, EnergyVad
+
+FRAME_MS = 30
+NOTE_TIME_RE = re.compile(r"^\[(?:(\d{1,2}):)?(\d{1,3}):(\d{2})\]")
+
+
+class TimeMap:
+    """
+    Piecewise-linear map between the source recording and the trimmed audio.
+    Each segment is [output_start, source_start, duration] in seconds.
+    """
+
+    def __init__(self, segments=None):
+        self.segments = [list(s) for s in segments or []]
+
+    def add(self, output_start, source_start, duration):
+        if self.segments:
+            out, src, dur = self.segments[-1]
+            if abs(out + dur - output_start) < 1e-9 and abs(src + dur - source_start) < 1e-9:
+                self.segments[-1][2] += duration
+                return
+        self.segments.append([output_start, source_start, duration])
+
+    def to_output(self, source_t):
+        """Trimmed-audio time for a source time; times inside removed silence snap forward."""
+        for out, src, dur in self.segments:
+            if source_t < src:
+                return out
+            if source_t <= src + dur:
+                return out + (source_t - src)
+        return self.output_duration
+
+    def to_source(self, output_t):
+        for out, src, dur in self.segments:
+            if output_t <= out + dur:
+                return src + max(0.0, output_t - out)
+        return self.segments[-1][1] + self.segments[-1][2] if self.segments else 0.0
+
+    @property
+    def output_duration(self):
+        return self.segments[-1][0] + self.segments[-1][2] if self.segments else 0.0
+
+    def to_list(self):
+        return [[round(v, 3) for v in segment] for segment in self.segments]
+
+
+def _format_time(seconds):
+    seconds = int(round(seconds))
+    h, rest = divmod(seconds, 3600)
+    m, s = divmod(rest, 60)
+    return f"{h}:{m:02d}:{s:02d}" if h else f"{m:02d}:{s:02d}"
+
+
+def remap_notes(notes, time_map):
+    """
+    Rewrite leading "[MM:SS]" note timestamps onto the trimmed timeline so
+    they line up with what Gemini hears; the original time is kept alongside.
+    """
+    remapped = []
+    for note in notes or []:
+        source_t = _note_seconds(note)
+        if source_t is None:
+            remapped.append(note)
+            continue
+        output_t = time_map.to_output(source_t)
+        rest = note[NOTE_TIME_RE.match(note).end():]
+        remapped.append(f"[{_format_time(output_t)}] (원본 {_format_time(source_t)}){rest}")
+    return remapped
+
+
+class SilenceTrimmer:
+    """
+    Streaming silence removal over fixed-size frames.
+    Silent stretches longer than `min_silence_frames` are cut down to
+    `pad_frames` of context on each side; shorter pauses are kept as-is.
+    push() returns the (frame_index, frame) pairs to keep, in order.
+    """
+
+    def __init__(self, min_silence_frames, pad_frames, vad=None):
+        self.min_silence_frames = min_silence_frames
+        self.pad_frames = pad_frames
+        self.vad = vad or EnergyVad()
+        self._silence = []  # Silent frames since the last speech (while short enough to keep)
+        self._tail = deque(maxlen=pad_frames)  # Last frames of a long silence (pre-roll)
+        self._dropping = False
+        self._seen_speech = False
+
+    def push(self, index, frame):
+        speech = self.vad.is_speech(frame.astype(np.float32) / 32768.0)
+        if speech:
+            if self._dropping:
+                kept = list(self._tail)
+            else:
+                kept = self._silence
+            kept = kept + [(index, frame)]
+            self._silence = []
+            self._tail.clear()
+            self._dropping = False
+            self._seen_speech = True
+            return kept
+
+        if self._dropping:
+            self._tail.append((index, frame))
+            return []
+        self._silence.append((index, frame))
+        if len(self._silence) <= self.min_silence_frames:
+            return []
+        # Long silence: keep a short tail after the last speech, drop the rest
+        head = self._silence[:self.pad_frames] if self._seen_speech else []
+        for item in self._silence[self.pad_frames:]:
+            self._tail.append(item)
+        self._silence = []
+        self._dropping = True
+        return head
+
+    def flush(self):
+        if self._dropping or not self._seen_speech:
+            return []
+        kept, self._silence = self._silence[:self.pad_frames], []
+        return kept
+
+
+class PreprocessedAudio:
+    def __init__(self, file, mime_type, size, sha256, time_map, stats):
+        self.file = file
+        self.mime_type = mime_type
+        self.size = size
+        self.sha256 = sha256
+        self.time_map = time_map
+        self.stats = stats
+
+
+def _frames(container, stream, frame_samples):
+    """Decode, downmix and resample to 16 kHz mono int16, re-chunked into fixed frames."""
+    import av
+
+    resampler = av.AudioResampler(format="s16", layout="mono", rate=SAMPLE_RATE)
+    pending = np.zeros(0, dtype=np.int16)
+    for packet in container.demux(stream):
+        for frame in packet.decode():
+            for resampled in resampler.resample(frame):
+                pending = np.concatenate([pending, resampled.to_ndarray().reshape(-1)])
+                while len(pending) >= frame_samples:
+                    yield pending[:frame_samples]
+                    pending = pending[frame_samples:]
+    for resampled in resampler.resample(None):
+        pending = np.concatenate([pending, resampled.to_ndarray().reshape(-1)])
+    while len(pending) >= frame_samples:
+        yield pending[:frame_samples]
+        pending = pending[frame_samples:]
+
+
+def _opus_settings(bitrate=None, complexity=None):
+    bitrate = bitrate or int(os.getenv("SCRIBE_PREPROCESS_BITRATE", "24000"))
+    # libopus complexity 0-10; 2 with the speech-tuned "voip" mode is ~2x faster than 10 at the same size
+    complexity = complexity if complexity is not None else int(os.getenv("SCRIBE_PREPROCESS_COMPLEXITY", "2"))
+    return bitrate, complexity
+
+
+class _OpusWriter:
+    """Encodes 16 kHz mono int16 frames into an in-memory Ogg/Opus file."""
+
+    def __init__(self, bitrate, complexity):
+        import av
+
+        self._av = av
+        self.output = io.BytesIO()
+        self._container = av.open(self.output, mode="w", format="ogg")
+        self._stream = self._container.add_stream(
+            "libopus", rate=SAMPLE_RATE, layout="mono",
+            options={"application": "voip", "compression_level": str(complexity)})
+        self._stream.bit_rate = bitrate
+        self._batch = []
+
+    def write(self, frame):
+        self._batch.append(frame)
+        # Encoding ~1 s per call instead of one 30 ms frame keeps per-call overhead low
+        if len(self._batch) * FRAME_MS >= 1000:
+            self._encode()
+
+    def _encode(self):
+        if not self._batch:
+            return
+        out_frame = self._av.AudioFrame.from_ndarray(np.concatenate(self._batch).reshape(1, -1),
+                                                     format="s16", layout="mono")
+        out_frame.sample_rate = SAMPLE_RATE
+        self._batch = []
+        for packet in self._stream.encode(out_frame):
+            self._container.mux(packet)
+
+    def close(self):
+        """Flush the encoder. Returns (file rewound to 0, size, sha256)."""
+        self._encode()
+        for packet in self._stream.encode(None):
+            self._container.mux(packet)
+        self._container.close()
+        data = self.output.getbuffer()
+        size, sha256 = len(data), hashlib.sha256(data).hexdigest()
+        data.release()
+        self.output.seek(0)
+        return self.output, size, sha256
+
+
+def _open_input(audio):
+    import av
+
+    if not isinstance(audio, (str, os.PathLike)):
+        audio.seek(0)
+    # mode="r" explicitly: upload buffers report "w+b", which PyAV would treat as an output
+    return av.open(audio, mode="r")
+
+
+def _rewind(audio):
+    if not isinstance(audio, (str, os.PathLike)):
+        audio.seek(0)
+
+
+def preprocess_audio(audio, size=0, bitrate=None, min_silence_ms=None, pad_ms=None, trim_silence=True,
+                     complexity=None):
+    """
+    Trim silence, downmix to mono 16 kHz and re-encode to Opus (Ogg).
+    `audio` is a path or a binary file object (rewound afterwards). Streams
+    frame by frame, so long recordings are never held in memory as PCM.
+    Blocking and CPU-bound; run it in a thread.
+    """
+    bitrate, complexity = _opus_settings(bitrate, complexity)
+    min_silence_ms = min_silence_ms or int(os.getenv("SCRIBE_PREPROCESS_MIN_SILENCE_MS", "1000"))
+    pad_ms = pad_ms if pad_ms is not None else int(os.getenv("SCRIBE_PREPROCESS_PAD_MS", "200"))
+    frame_samples = SAMPLE_RATE * FRAME_MS // 1000
+    frame_seconds = FRAME_MS / 1000
+    trimmer = SilenceTrimmer(max(1, min_silence_ms // FRAME_MS), pad_ms // FRAME_MS)
+    if isinstance(audio, (str, os.PathLike)):
+        size = size or os.path.getsize(audio)
+
+    time_map = TimeMap()
+    source_frames = 0
+    writer = _OpusWriter(bitrate, complexity)
+
+    def write(kept):
+        for index, frame in kept:
+            time_map.add(time_map.output_duration, index * frame_seconds, frame_seconds)
+            writer.write(frame)
+
+    with _open_input(audio) as container:
+        for index, frame in enumerate(_frames(container, container.streams.audio[0], frame_samples)):
+            source_frames += 1
+            write(trimmer.push(index, frame) if trim_silence else [(index, frame)])
+        write(trimmer.flush() if trim_silence else [])
+    output, out_size, sha256 = writer.close()
+    _rewind(audio)
+
+    seconds_in = source_frames * frame_seconds
+    seconds_out = time_map.output_duration
+    stats = {
+        "bytes_in": size,
+        "bytes_out": out_size,
+        "bytes_saved": max(0, size - out_size),
+        "seconds_in": round(seconds_in, 2),
+        "seconds_out": round(seconds_out, 2),
+        "seconds_saved": round(max(0.0, seconds_in - seconds_out), 2),
+    }
+    return PreprocessedAudio(output, "audio/ogg", out_size, sha256, time_map, stats)
+
+
+def probe_duration(audio):
+    """
+    Duration in seconds, or None if it cannot be determined. Uses container
+    metadata, falling back to a demux-only scan (MediaRecorder WebM has no
+    duration header). Blocking; the file object is rewound afterwards.
+    """
+    import av
+
+    try:
+        with _open_input(audio) as container:
+            if container.duration:
+                return container.duration / av.time_base
+            stream = container.streams.audio[0]
+            end = 0.0
+            for packet in container.demux(stream):
+                if packet.pts is not None and packet.time_base is not None:
+                    end = max(end, float((packet.pts + (packet.duration or 0)) * packet.time_base))
+            return end or None
+    finally:
+        _rewind(audio)
+
+
+def plan_windows(duration, window, overlap):
+    """
+    Overlapping [start, end) windows covering `duration` seconds. Overlap is
+    capped at half a window; a tail shorter than a quarter window is folded
+    into the previous window.
+    """
+    if duration <= window:
+        return [(0.0, duration)]
+    step = max(1.0, window - min(overlap, window / 2))
+    windows = []
+    start = 0.0
+    while start + window < duration:
+        windows.append((start, start + window))
+        start += step
+    windows.append((start, duration))
+    if len(windows) > 1 and windows[-1][1] - windows[-1][0] < window / 4:
+        windows.pop()
+        windows[-1] = (windows[-1][0], duration)
+    return windows
+
+
+class AudioSegment:
+    def __init__(self, file, mime_type, size, sha256, start, end):
+        self.file = file
+        self.mime_type = mime_type
+        self.size = size
+        self.sha256 = sha256
+        self.start = start
+        self.end = end
+
+
+def split_audio(audio, windows, bitrate=None, complexity=None):
+    """
+    Cut audio into the given (overlapping) windows as separate 16 kHz mono
+    Opus files, decoding the source once. Audio past the last planned window
+    (inaccurate duration metadata) goes into the last window. Windows with no
+    audio are left out, so label results by each segment's start/end rather
+    than by position in `windows`. Blocking.
+    """
+    bitrate, complexity = _opus_settings(bitrate, complexity)
+    frame_samples = SAMPLE_RATE * FRAME_MS // 1000
+    frame_seconds = FRAME_MS / 1000
+    writers = {}
+    segments = [None] * len(windows)
+    last = len(windows) - 1
+
+    def finish(i, end):
+        file, size, sha256 = writers.pop(i).close()
+        segments[i] = AudioSegment(file, "audio/ogg", size, sha256, windows[i][0], end)
+
+    t = 0.0
+    with _open_input(audio) as container:
+        for index, frame in enumerate(_frames(container, container.streams.audio[0], frame_samples)):
+            t = index * frame_seconds
+            for i, (start, end) in enumerate(windows):
+                if start <= t and (t < end or i == last):
+                    if i not in writers:
+                        writers[i] = _OpusWriter(bitrate, complexity)
+                    writers[i].write(frame)
+                elif t >= end and i in writers:
+                    finish(i, end)
+    for i in list(writers):
+        finish(i, max(windows[i][1], t + frame_seconds) if i == last else windows[i][1])
+    _rewind(audio)
+    return [segment for segment in segments if segment is not None]
+
+
+def _note_seconds(note):
+    match = NOTE_TIME_RE.match(note) if isinstance(note, str) else None
+    if not match:
+        return None
+    h, m, s = (int(g) if g else 0 for g in match.groups())
+    return h * 3600 + m * 60 + s
+
+
+def notes_in_window(notes, start, end):
+    """Notes timestamped inside [start, end], plus every untimestamped note (e.g. attendees)."""
+    kept = []
+    for note in notes or []:
+        seconds = _note_seconds(note)
+        if seconds is None or start <= seconds <= end:
+            kept.append(note)
+    return kept
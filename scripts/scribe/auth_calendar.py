@@ -1,9 +1,12 @@
 import os.path
 import datetime
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+import threading
+from metrics import google_api_call
+from calendar_cache import EventCache
+from google_clients import GoogleClients
+
+# The Google client libraries are imported inside the methods that use them:
+# together they take hundreds of milliseconds to import and slow down startup.
 
 SCOPES = [
     'https://www.googleapis.com/auth/calendar.readonly',
@@ -13,15 +16,46 @@ SCOPES = [
 ]
 
 class CalendarService:
+    # Google batch requests accept up to 50 calls each
+    BATCH_SIZE = 50
+    # Client-side retries (with exponential backoff) for transient upload errors
+    UPLOAD_RETRIES = 3
+
     def __init__(self, credentials_path="credentials.json", token_path="token.json"):
         self.credentials_path = credentials_path
         self.token_path = token_path
         self.creds = None
         self.service = None
         self.people_service = None # For Contacts
+        self.drive_service = None
+        # Resumable upload chunk size (a multiple of 256 KiB, as the Drive API requires)
+        chunk_kib = max(256, int(os.getenv("SCRIBE_DRIVE_CHUNK_KIB", "1024")) // 256 * 256)
+        self.upload_chunk_bytes = chunk_kib * 1024
+        # Service objects, per-thread HTTP sessions and background token refresh shared by all calls
+        self.clients = GoogleClients()
+        self._auth_lock = threading.Lock()
+        # Upcoming events across calendars, kept current with syncToken incremental syncs
+        self.events = EventCache(self.fetch_event_changes)
 
     def authenticate(self):
-        """Authenticates with Google Calendar API."""
+        """Authenticates with Google Calendar API (services are built once and reused)."""
+        with self._auth_lock:
+            if self.service:
+                return True, "인증 성공 (Calendar + People)"
+            return self._authenticate_locked()
+
+    def _save_token(self, creds):
+        # Written by the background refresher too: replace the file atomically
+        tmp_path = self.token_path + ".tmp"
+        with open(tmp_path, 'w') as token:
+            token.write(creds.to_json())
+        os.replace(tmp_path, self.token_path)
+
+    def _authenticate_locked(self):
+        from google.auth.transport.requests import Request
+        from google.oauth2.credentials import Credentials
+        from google_auth_oauthlib.flow import InstalledAppFlow
+
         if os.path.exists(self.token_path):
             self.creds = Credentials.from_authorized_user_file(self.token_path, SCOPES)
         
@@ -30,6 +64,7 @@ class CalendarService:
             if self.creds and self.creds.expired and self.creds.refresh_token:
                 try:
                     self.creds.refresh(Request())
+                    self._save_token(self.creds)
                 except Exception as e:
                     print(f"Error refreshing token: {e}")
                     self.creds = None
@@ -45,129 +80,163 @@ class CalendarService:
                     self.creds = flow.run_local_server(port=0)
                     
                     # Save the credentials for the next run
-                    with open(self.token_path, 'w') as token:
-                        token.write(self.creds.to_json())
+                    self._save_token(self.creds)
                 except Exception as e:
                     return False, f"인증 실패: {e}"
 
         try:
-            self.service = build('calendar', 'v3', credentials=self.creds)
-            self.people_service = build('people', 'v1', credentials=self.creds)
+            self.clients.set_credentials(self.creds, on_refresh=self._save_token)
+            self.people_service = self.clients.service('people', 'v1')
+            self.drive_service = self.clients.service('drive', 'v3')
+            self.service = self.clients.service('calendar', 'v3')
             return True, "인증 성공 (Calendar + People)"
         except Exception as e:
             return False, f"서비스 생성 실패: {e}"
 
-    def get_upcoming_events(self, max_results=10):
-        """Fetches upcoming events from the user's primary calendar."""
+    def close(self):
+        """Stop the background token refresher."""
+        self.clients.close()
+
+    def get_upcoming_events(self, max_results=10, refresh=False):
+        """Upcoming events from all of the user's calendars (served from the local event cache)."""
         if not self.service:
             success, msg = self.authenticate()
             if not success:
                 return {"error": msg}
 
         try:
-            now = datetime.datetime.utcnow().isoformat() + 'Z'  # 'Z' indicates UTC time
-            # 1. Get list of all calendars
-            calendar_list_result = self.service.calendarList().list().execute()
-            calendars = calendar_list_result.get('items', [])
-            
-            all_events = []
-            now = datetime.datetime.utcnow().isoformat() + 'Z'  # 'Z' indicates UTC time
+            if refresh:
+                self.events.sync()
+            return {"events": self.events.upcoming(max_results)}
+        except Exception as e:
+            return {"error": f"이벤트 조회 실패: {str(e)}"}
 
-            # 2. Fetch events from each calendar
-            for calendar_entry in calendars:
-                cal_id = calendar_entry['id']
-                cal_summary = calendar_entry.get('summary', 'Unknown')
-                
-                # Skip some heavy or irrelevant calendars if needed (optional)
-                # For now, we try to fetch from all to include KakaoTalk etc.
-                try:
-                    events_result = self.service.events().list(
-                        calendarId=cal_id, timeMin=now,
-                        maxResults=max_results, singleEvents=True,
-                        orderBy='startTime').execute()
-                    
-                    items = events_result.get('items', [])
-                    for item in items:
-                        # Inject calendar name for context
-                        item['calendar_name'] = cal_summary 
-                        all_events.append(item)
-                except Exception as e:
-                    print(f"Skipping calendar {cal_summary} ({cal_id}): {e}")
-                    continue
+    def fetch_event_changes(self, sync_tokens, time_min, time_max):
+        """
+        Events of every calendar in the calendar list: all events in
+        [time_min, time_max] for calendars without a sync token, changes since
+        the token otherwise. The per-calendar events.list calls go out as batch
+        requests (one round-trip per page for all calendars); an expired token
+        (HTTP 410) restarts that calendar with a full listing.
+        Returns {calendar_id: {"name", "items", "sync_token", "full"} or {"name", "error"}}.
+        """
+        def to_rfc3339(ts):
+            return datetime.datetime.fromtimestamp(ts, datetime.timezone.utc).isoformat().replace("+00:00", "Z")
 
-            # 3. Sort all events by start time
-            # Key: Start time can be dateTime or date
-            all_events.sort(key=lambda x: x['start'].get('dateTime', x['start'].get('date')))
+        def list_params(calendar_id, sync_token):
+            params = dict(calendarId=calendar_id, singleEvents=True, maxResults=250)
+            if sync_token:
+                params['syncToken'] = sync_token  # Cannot be combined with timeMin/timeMax/orderBy
+            else:
+                params.update(timeMin=to_rfc3339(time_min), timeMax=to_rfc3339(time_max))
+            return params
 
-            # 4. Slice to max_results
-            final_events = all_events[:max_results]
+        with google_api_call("calendar", "calendarList.list"):
+            calendars = self.service.calendarList().list().execute().get('items', [])
 
-            formatted_events = []
-            for event in final_events:
-                start = event['start'].get('dateTime', event['start'].get('date'))
-                summary = event.get('summary', '제목 없음')
-                cal_name = event.get('calendar_name', '')
-                
-                # Append calendar name to summary if it's not the primary one to help distinguish
-                # But user just wanted "included", maybe just list them all.
-                # Let's append [CalendarName] if it's not too long, or just let users see the list.
-                
-                formatted_events.append({
-                    "summary": f"[{cal_name}] {summary}" if cal_name else summary,
-                    "start": start,
-                    "description": event.get('description', ''),
-                    "id": event['id'],
-                    "attendees": event.get('attendees', [])
-                })
-            return {"events": formatted_events}
-            
-            
-        except Exception as e:
-            return {"error": f"이벤트 조회 실패: {str(e)}"}
+        results = {}
+        pending = {}
+        for calendar_entry in calendars:
+            cal_id = calendar_entry['id']
+            token = sync_tokens.get(cal_id)
+            results[cal_id] = {"name": calendar_entry.get('summary', 'Unknown'), "items": [],
+                               "sync_token": None, "full": not token}
+            pending[cal_id] = list_params(cal_id, token)
+
+        while pending:
+            responses = {}
+
+            def collect(request_id, response, exception):
+                responses[request_id] = (response, exception)
+
+            ids = list(pending)
+            for offset in range(0, len(ids), self.BATCH_SIZE):
+                batch = self.service.new_batch_http_request(callback=collect)
+                for cal_id in ids[offset:offset + self.BATCH_SIZE]:
+                    batch.add(self.service.events().list(**pending[cal_id]), request_id=cal_id)
+                with google_api_call("calendar", "events.list.batch"):
+                    batch.execute()
+
+            next_pending = {}
+            for cal_id, params in pending.items():
+                response, exception = responses.get(cal_id, (None, RuntimeError("no response in batch")))
+                if exception is not None:
+                    if params.get('syncToken') and getattr(getattr(exception, 'resp', None), 'status', None) == 410:
+                        print(f"Sync token expired for calendar {results[cal_id]['name']}; doing a full sync")
+                        results[cal_id].update(items=[], full=True)
+                        next_pending[cal_id] = list_params(cal_id, None)
+                    else:
+                        results[cal_id] = {"name": results[cal_id]["name"], "error": str(exception)}
+                    continue
+                results[cal_id]["items"].extend(response.get('items', []))
+                if response.get('nextPageToken'):
+                    next_pending[cal_id] = dict(params, pageToken=response['nextPageToken'])
+                else:
+                    results[cal_id]["sync_token"] = response.get('nextSyncToken')
+            pending = next_pending
+        return results
+
+    def upload_to_drive(self, filename, content, mimetype="text/markdown", progress=None):
+        """
+        Uploads content as a Google Doc and returns (file ID, WebLink). Raises on failure.
+        Content larger than one chunk goes up as a chunked resumable upload: a
+        transient error resumes from the last acknowledged chunk instead of
+        starting over, and `progress(sent_bytes, total_bytes)` is called per chunk.
+        """
+        import io
+        from googleapiclient.http import MediaIoBaseUpload
 
-    def upload_to_drive(self, filename, content, mimetype="text/markdown"):
-        """Uploads content as a file to Google Drive and returns file ID and WebLink."""
         if not self.service:
-            self.authenticate()
+            success, msg = self.authenticate()
+            if not success:
+                raise RuntimeError(msg)
 
-        try:
-            # Build Drive service
-            drive_service = build('drive', 'v3', credentials=self.creds)
+        file_metadata = {
+            'name': filename,
+            'mimeType': 'application/vnd.google-apps.document' # Save as Google Doc
+        }
+        data = content.encode('utf-8')
+        resumable = len(data) > self.upload_chunk_bytes
+        # Small files: one multipart request instead of a session round-trip plus the upload
+        media = MediaIoBaseUpload(io.BytesIO(data), mimetype=mimetype,
+                                  chunksize=self.upload_chunk_bytes, resumable=resumable)
+        request = self.drive_service.files().create(body=file_metadata, media_body=media, fields='id, webViewLink')
 
-            file_metadata = {
-                'name': filename,
-                'mimeType': 'application/vnd.google-apps.document' # Save as Google Doc
-            }
-            
-            # Create media from string content
-            import io
-            from googleapiclient.http import MediaIoBaseUpload
-            
-            # Simple text content
-            media = MediaIoBaseUpload(io.BytesIO(content.encode('utf-8')), mimetype=mimetype, resumable=True)
-
-            print(f"Uploading {filename} to Drive...")
-            file = drive_service.files().create(
-                body=file_metadata,
-                media_body=media,
-                fields='id, webViewLink'
-            ).execute()
-            
-            print(f"File ID: {file.get('id')}")
-            return file.get('id'), file.get('webViewLink')
+        print(f"Uploading {filename} to Drive ({len(data)} bytes{', resumable' if resumable else ''})...")
+        with google_api_call("drive", "files.create"):
+            if resumable:
+                file = None
+                while file is None:
+                    # Retries transient errors itself, resuming at the last chunk the server acknowledged
+                    status, file = request.next_chunk(num_retries=self.UPLOAD_RETRIES)
+                    if status and progress:
+                        progress(status.resumable_progress, len(data))
+            else:
+                file = request.execute(num_retries=self.UPLOAD_RETRIES)
+        if progress:
+            progress(len(data), len(data))
 
-        except Exception as e:
-            print(f"Drive upload failed: {e}")
-            return None, None
+        print(f"File ID: {file.get('id')}")
+        return file.get('id'), file.get('webViewLink')
+
+    def get_event(self, event_id):
+        """The event as stored in the primary calendar (needed to extend its attachments)."""
+        if not self.service:
+            success, msg = self.authenticate()
+            if not success:
+                raise RuntimeError(msg)
+        with google_api_call("calendar", "events.get"):
+            return self.service.events().get(calendarId='primary', eventId=event_id).execute()
 
-    def attach_to_calendar_event(self, event_id, file_id, file_link, file_title):
-        """Attaches a Drive file to an existing Calendar event."""
+    def attach_to_calendar_event(self, event_id, file_id, file_link, file_title, event=None):
+        """Attaches a Drive file to an existing Calendar event (`event`: already fetched copy, if any)."""
         if not self.service:
             self.authenticate()
 
         try:
             # 1. Fetch existing event to preserve data
-            event = self.service.events().get(calendarId='primary', eventId=event_id).execute()
+            if event is None:
+                event = self.get_event(event_id)
             
             # 2. Prepare attachment
             attachment = {
@@ -178,21 +247,23 @@ class CalendarService:
                 'iconLink': '' # Optional
             }
             
-            # 3. Append to existing attachments or create new list
-            attachments = event.get('attachments', [])
-            attachments.append(attachment)
+            # 3. Append to existing attachments or create new list (once, so retries do not duplicate it)
+            attachments = list(event.get('attachments', []))
+            if not any(a.get('fileId') == file_id for a in attachments):
+                attachments.append(attachment)
             
             event_patch = {
                 'attachments': attachments
             }
             
             # 4. Update event
-            updated_event = self.service.events().patch(
-                calendarId='primary',
-                eventId=event_id,
-                body=event_patch,
-                supportsAttachments=True
-            ).execute()
+            with google_api_call("calendar", "events.patch"):
+                updated_event = self.service.events().patch(
+                    calendarId='primary',
+                    eventId=event_id,
+                    body=event_patch,
+                    supportsAttachments=True
+                ).execute(num_retries=self.UPLOAD_RETRIES)  # Idempotent: sets the full attachment list
             
             print(f"Event updated with attachment: {updated_event.get('htmlLink')}")
             return True, updated_event.get('htmlLink')
@@ -209,38 +280,80 @@ class CalendarService:
         if not self.people_service: return []
         
         try:
-            results = self.people_service.people().searchContacts(
-                query=query,
-                readMask='names,emailAddresses,organizations',
-                pageSize=10
-            ).execute()
+            with google_api_call("people", "searchContacts"):
+                results = self.people_service.people().searchContacts(
+                    query=query,
+                    readMask='names,emailAddresses,organizations',
+                    pageSize=10
+                ).execute()
             
-            contacts = []
-            if 'results' in results:
-                for item in results['results']:
-                    person = item.get('person', {})
-                    
-                    names = person.get('names', [])
-                    display_name = names[0].get('displayName') if names else "No Name"
-                    
-                    emails = person.get('emailAddresses', [])
-                    email = emails[0].get('value') if emails else ""
-                    
-                    orgs = person.get('organizations', [])
-                    org_info = ""
-                    if orgs:
-                        org = orgs[0]
-                        parts = [p for p in [org.get('name'), org.get('department'), org.get('title')] if p]
-                        if parts: org_info = f" ({', '.join(parts)})"
-                            
-                    full_str = f"{display_name}{org_info}"
-                    if email: full_str += f" <{email}>"
-                    contacts.append(full_str)
-            return contacts
+            return [format_contact(item.get('person', {}))["label"] for item in results.get('results', [])]
         except Exception as e:
             print(f"Contact search failed: {e}")
             return []
 
+    def list_contact_changes(self, sync_token=None):
+        """
+        Contacts (connections) changed since sync_token, or all of them without one.
+        Returns {"contacts": [...], "deleted": [resource names], "sync_token": ..., "full": bool}.
+        An expired sync token (HTTP 410) falls back to a full listing.
+        """
+        from googleapiclient.errors import HttpError
+
+        if not self.people_service:
+            self.authenticate()
+        if not self.people_service:
+            raise RuntimeError("People API is not authenticated")
+
+        contacts, deleted = [], []
+        page_token = None
+        while True:
+            params = dict(resourceName='people/me', personFields='names,emailAddresses,organizations,metadata',
+                          pageSize=1000, requestSyncToken=True)
+            if page_token:
+                params['pageToken'] = page_token
+            if sync_token:
+                params['syncToken'] = sync_token
+            try:
+                with google_api_call("people", "connections.list"):
+                    response = self.people_service.people().connections().list(**params).execute()
+            except HttpError as e:
+                if sync_token and getattr(e.resp, 'status', None) == 410:
+                    print("Contacts sync token expired; doing a full sync")
+                    return self.list_contact_changes(None)
+                raise
+
+            for person in response.get('connections', []):
+                if person.get('metadata', {}).get('deleted'):
+                    deleted.append(person.get('resourceName'))
+                else:
+                    contacts.append(format_contact(person))
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                return {"contacts": contacts, "deleted": deleted,
+                        "sync_token": response.get('nextSyncToken'), "full": not sync_token}
+
+
+def format_contact(person):
+    """People API person -> {"id", "name", "email", "organization", "label"} ("Name (Org, Dept) <email>")."""
+    names = person.get('names', [])
+    display_name = names[0].get('displayName') if names else "No Name"
+    
+    emails = person.get('emailAddresses', [])
+    email = emails[0].get('value') if emails else ""
+    
+    orgs = person.get('organizations', [])
+    org_info = ""
+    if orgs:
+        org = orgs[0]
+        parts = [p for p in [org.get('name'), org.get('department'), org.get('title')] if p]
+        if parts: org_info = ', '.join(parts)
+            
+    label = f"{display_name} ({org_info})" if org_info else display_name
+    if email: label += f" <{email}>"
+    return {"id": person.get('resourceName') or email or display_name, "name": display_name, "email": email,
+            "organization": org_info, "label": label}
+
 if __name__ == '__main__':
     # Test execution
     cal = CalendarService()
@@ -0,0 +1,225 @@
+"""
+Offline load test for the scribe server.
+
+By default the app is driven in-process with SCRIBE_FAKE_BACKEND=1, so no
+Gemini quota or Google credentials are used; pass --url to hit a running
+server instead (start it with SCRIBE_FAKE_BACKEND=1 for the same effect).
+
+    python scripts/scribe/benchmark.py --concurrency 16 --requests 200
+    python scripts/scribe/benchmark.py --save-baseline
+    python scripts/scribe/benchmark.py --compare   # exit 1 on regression
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "baseline.json")
+SCENARIOS = ("summarize", "analyze_audio", "calendar_events", "contacts_search")
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize_latencies(latencies, errors, elapsed, concurrency):
+    ordered = sorted(latencies)
+    return {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "concurrency": concurrency,
+        "duration_s": round(elapsed, 3),
+        "rps": round(len(latencies) / elapsed, 2) if elapsed > 0 else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 1),
+        "p90_ms": round(percentile(ordered, 90) * 1000, 1),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 1),
+        "max_ms": round(ordered[-1] * 1000, 1) if ordered else 0.0,
+    }
+
+
+def build_request(scenario, i, audio):
+    """(method, path, kwargs) for request number i of a scenario."""
+    session_id = f"bench-{i % 32}"
+    if scenario == "summarize":
+        # Unique text per request so the response cache does not short-circuit Gemini
+        text = f"[00:{i % 60:02d}] 화자{i % 4}: 벤치마크 발화 {i} 입니다. " * 20
+        return "POST", "/summarize", {"json": {"text": text, "session_id": session_id, "meeting_title": "Benchmark"}}
+    if scenario == "analyze_audio":
+        payload = audio + i.to_bytes(8, "big")  # Distinct content defeats upload dedup
+        return "POST", "/analyze_audio", {
+            "files": {"file": (f"bench-{i}.webm", payload, "audio/webm")},
+            "data": {"session_id": session_id, "meeting_title": "Benchmark"},
+        }
+    if scenario == "calendar_events":
+        return "GET", "/calendar/events", {}
+    if scenario == "contacts_search":
+        return "GET", "/contacts/search", {"params": {"q": f"김{i % 10}"}}
+    raise ValueError(f"Unknown scenario: {scenario}")
+
+
+async def run_scenario(client, scenario, total, concurrency, audio, warmup=0):
+    # Untimed requests first, so lazy initialization (clients, indexes) is not measured
+    for i in range(warmup):
+        method, path, kwargs = build_request(scenario, total + i, audio)
+        await client.request(method, path, **kwargs)
+
+    latencies = []
+    errors = 0
+    counter = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            method, path, kwargs = build_request(scenario, i, audio)
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, **kwargs)
+                ok = response.status_code < 400 and "error" not in response.json()
+            except Exception as e:
+                print(f"  {scenario} request {i} failed: {e}")
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize_latencies(latencies, errors, time.perf_counter() - start, concurrency)
+
+
+async def run_benchmark(args):
+    import httpx
+
+    audio = os.urandom(args.audio_kb * 1024)
+    timeout = httpx.Timeout(300.0)
+    results = {}
+
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, timeout=timeout) as client:
+            for scenario in args.scenarios:
+                results[scenario] = await run_scenario(client, scenario, args.requests, args.concurrency, audio, args.warmup)
+                print_result(scenario, results[scenario])
+        return results
+
+    # In-process: configure the fake backends before scribe is imported
+    os.environ.setdefault("SCRIBE_FAKE_BACKEND", "1")
+    os.environ.setdefault("WHISPER_PRELOAD", "0")
+    # Throwaway session log so runs neither read nor grow the real one
+    os.environ.setdefault("SCRIBE_SESSION_DB", os.path.join(tempfile.mkdtemp(prefix="scribe-bench-"), "sessions.db"))
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import scribe
+
+    transport = httpx.ASGITransport(app=scribe.app)
+    async with scribe.app.router.lifespan_context(scribe.app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=timeout) as client:
+            for scenario in args.scenarios:
+                results[scenario] = await run_scenario(client, scenario, args.requests, args.concurrency, audio, args.warmup)
+                print_result(scenario, results[scenario])
+    return results
+
+
+def print_result(scenario, r):
+    print(f"{scenario:<16} {r['rps']:>8.1f} req/s  p50 {r['p50_ms']:>8.1f} ms  p90 {r['p90_ms']:>8.1f} ms  "
+          f"p99 {r['p99_ms']:>8.1f} ms  errors {r['errors']}/{r['requests']}")
+
+
+def fake_backend_settings():
+    from fake_backend import FakeBackendConfig
+    config = FakeBackendConfig()
+    return {
+        "gemini_latency_ms": config.latency * 1000,
+        "gemini_output_chars": config.output_chars,
+        "gemini_stream_chunks": config.stream_chunks,
+        "gemini_upload_ms_per_mb": config.upload_per_mb * 1000,
+        "google_latency_ms": config.google_latency * 1000,
+    }
+
+
+def environment_info(args):
+    return {
+        "recorded_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "target": args.url or "in-process",
+        "concurrency": args.concurrency,
+        "requests": args.requests,
+        "warmup": args.warmup,
+        "audio_kb": args.audio_kb,
+        "fake_backend": fake_backend_settings(),
+    }
+
+
+P99_SLACK_MS = 5.0
+
+
+def compare(results, baseline, tolerance):
+    """Return regression messages: throughput down or p99 up by more than tolerance."""
+    regressions = []
+    for scenario, current in results.items():
+        base = baseline.get("results", {}).get(scenario)
+        if not base:
+            continue
+        if base["rps"] and current["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{scenario}: {current['rps']} req/s vs baseline {base['rps']}")
+        # Sub-millisecond scenarios: ignore p99 jitter below P99_SLACK_MS
+        if base["p99_ms"] and current["p99_ms"] > max(base["p99_ms"] * (1 + tolerance), base["p99_ms"] + P99_SLACK_MS):
+            regressions.append(f"{scenario}: p99 {current['p99_ms']} ms vs baseline {base['p99_ms']}")
+        if current["errors"] > base.get("errors", 0):
+            regressions.append(f"{scenario}: {current['errors']} errors vs baseline {base.get('errors', 0)}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the scribe server against fake Gemini/Google backends.")
+    parser.add_argument("--url", help="Base URL of a running server (default: drive the app in-process)")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated subset of " + ", ".join(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=64, help="Requests per scenario")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed requests per scenario before measuring")
+    parser.add_argument("--audio-kb", type=int, default=256, help="Size of the synthetic upload for analyze_audio")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--compare", action="store_true", help="Compare against the baseline; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown before flagging")
+    args = parser.parse_args(argv)
+    args.scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    for scenario in args.scenarios:
+        if scenario not in SCENARIOS:
+            parser.error(f"unknown scenario {scenario!r}")
+
+    results = asyncio.run(run_benchmark(args))
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment_info(args), "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f"No baseline at {args.baseline}; run with --save-baseline first")
+            return 1
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            return 1
+        print("No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
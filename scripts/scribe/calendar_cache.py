@@ -0,0 +1,145 @@
+import datetime
+import heapq
+import os
+import threading
+import time
+
+
+def event_time(value):
+    """Google Calendar start/end ({"dateTime"} or all-day {"date"}) -> POSIX timestamp."""
+    value = value or {}
+    if value.get("dateTime"):
+        return datetime.datetime.fromisoformat(value["dateTime"].replace("Z", "+00:00")).timestamp()
+    if value.get("date"):
+        # All-day events start at local midnight
+        return datetime.datetime.fromisoformat(value["date"]).timestamp()
+    return 0.0
+
+
+def format_event(event, calendar_name):
+    summary = event.get('summary', '제목 없음')
+    return {
+        "summary": f"[{calendar_name}] {summary}" if calendar_name else summary,
+        "start": event['start'].get('dateTime', event['start'].get('date')),
+        "description": event.get('description', ''),
+        "id": event['id'],
+        "attendees": event.get('attendees', [])
+    }
+
+
+class _CalendarState:
+    def __init__(self, name):
+        self.name = name
+        self.sync_token = None
+        self.horizon = 0.0  # timeMax of the last full sync
+        self.events = {}  # event id -> (start, end, formatted event)
+        self.ordered = []  # events sorted by (start, id); replaced on every change
+
+    def apply(self, items, full):
+        if full:
+            self.events = {}
+        for item in items:
+            if item.get('status') == 'cancelled' or 'start' not in item:
+                self.events.pop(item.get('id'), None)
+                continue
+            start = event_time(item['start'])
+            end = event_time(item.get('end')) or start
+            self.events[item['id']] = (start, end, format_event(item, self.name))
+        self.ordered = sorted(self.events.values(), key=lambda e: (e[0], e[2]["id"]))
+
+
+class EventCache:
+    """
+    Local copy of upcoming events across all calendars.
+
+    `fetch_changes(sync_tokens, time_min, time_max)` returns, per calendar
+    in the user's calendar list, either a full listing (no token) or the
+    changes since its sync token (see CalendarService.fetch_event_changes).
+    Each calendar keeps its events sorted by start time; reads k-way merge
+    those lists. Reads are served from the cache and trigger at most one
+    background refresh once it is older than SCRIBE_CALENDAR_REFRESH_SECONDS.
+    Calendars are fully re-synced when their window (SCRIBE_CALENDAR_WINDOW_DAYS)
+    is half used up, so recurring instances further out get picked up.
+    """
+
+    def __init__(self, fetch_changes, refresh_seconds=None, window_days=None, clock=time.time):
+        self.fetch_changes = fetch_changes
+        self.refresh_seconds = refresh_seconds if refresh_seconds is not None else float(
+            os.getenv("SCRIBE_CALENDAR_REFRESH_SECONDS", "60"))
+        self.window = 86400 * (window_days if window_days is not None else float(
+            os.getenv("SCRIBE_CALENDAR_WINDOW_DAYS", "30")))
+        self.clock = clock
+        self.calendars = {}  # calendar id -> _CalendarState
+        self.synced_at = None
+        self._sync_lock = threading.Lock()
+        self._refreshing = False
+
+    @property
+    def ready(self):
+        return self.synced_at is not None
+
+    def sync(self):
+        """Fetch and apply changes for every calendar (blocking). Concurrent callers share one sync."""
+        if not self._sync_lock.acquire(blocking=False):
+            with self._sync_lock:  # Someone else is syncing; their result is fresh enough
+                return
+        try:
+            now = self.clock()
+            time_min, time_max = now - 86400, now + self.window
+            tokens = {}
+            for calendar_id, state in self.calendars.items():
+                # Incremental while the window still covers the next half window; otherwise start over
+                fresh = state.horizon - now > self.window / 2
+                tokens[calendar_id] = state.sync_token if fresh else None
+
+            changes = self.fetch_changes(tokens, time_min, time_max)
+            calendars = {}
+            for calendar_id, change in changes.items():
+                state = self.calendars.get(calendar_id) or _CalendarState(change.get("name", ""))
+                calendars[calendar_id] = state
+                if change.get("error"):
+                    print(f"Skipping calendar {state.name} ({calendar_id}): {change['error']}")
+                    continue
+                state.name = change.get("name", state.name)
+                state.apply(change.get("items", []), change.get("full", False))
+                state.sync_token = change.get("sync_token")
+                if change.get("full"):
+                    state.horizon = time_max
+            self.calendars = calendars  # Calendars no longer in the list are dropped
+            self.synced_at = self.clock()
+        finally:
+            self._sync_lock.release()
+
+    def _refresh_quietly(self):
+        try:
+            self.sync()
+        except Exception as e:
+            print(f"Calendar refresh failed (serving cached events): {e}")
+        finally:
+            self._refreshing = False
+
+    def refresh_in_background(self):
+        if self._refreshing:
+            return
+        self._refreshing = True
+        threading.Thread(target=self._refresh_quietly, name="calendar-refresh", daemon=True).start()
+
+    def upcoming(self, max_results=10):
+        """Events that have not ended yet, soonest first. Syncs first only when nothing is cached."""
+        if not self.ready:
+            self.sync()
+        elif self.clock() - self.synced_at > self.refresh_seconds:
+            self.refresh_in_background()
+
+        if max_results <= 0:
+            return []
+        now = self.clock()
+        merged = heapq.merge(*(state.ordered for state in list(self.calendars.values())),
+                             key=lambda e: (e[0], e[2]["id"]))
+        result = []
+        for start, end, event in merged:
+            if end > now:
+                result.append(event)
+                if len(result) >= max_results:
+                    break
+        return result
@@ -0,0 +1,372 @@
+import asyncio
+import bisect
+import hashlib
+import io
+import os
+import re
+import shutil
+import struct
+import tempfile
+import threading
+
+from audio_ingest import AudioTooLargeError, max_audio_bytes
+from session_registry import SessionRegistry
+
+RECORDING_ID_RE = re.compile(r"^[A-Za-z0-9_-]{1,80}$")
+READ_PIECE_BYTES = 64 * 1024
+
+EBML_MAGIC = b"\x1a\x45\xdf\xa3"
+WEBM_SEGMENT_ID = 0x18538067
+WEBM_CLUSTER_ID = 0x1F43B675
+
+
+def _read_vint(data, pos, keep_marker):
+    """One EBML variable-length integer at data[pos:]: (value, next pos), or None if it is cut off."""
+    if pos >= len(data):
+        return None
+    first = data[pos]
+    if first == 0:
+        raise ValueError("Invalid EBML variable-length integer")
+    length = 9 - first.bit_length()
+    if pos + length > len(data):
+        return None
+    value = first if keep_marker else first & ((1 << (8 - length)) - 1)
+    for byte in data[pos + 1:pos + length]:
+        value = (value << 8) | byte
+    if not keep_marker and value == (1 << (7 * length)) - 1:
+        value = -1  # All ones: unknown size (live MediaRecorder Segment/Cluster)
+    return value, pos + length
+
+
+def scan_webm(data, pos=0):
+    """
+    Walk WebM elements from data[pos:], descending into Segment and Cluster
+    (both usually of unknown size in a live recording) and skipping all
+    others by their size. Returns (Cluster offsets, offset to resume at once
+    more bytes arrive). Raises ValueError if the stream cannot be indexed.
+    """
+    clusters = []
+    while True:
+        element_id = _read_vint(data, pos, keep_marker=True)
+        size = element_id and _read_vint(data, element_id[1], keep_marker=False)
+        if not size:
+            return clusters, pos
+        if element_id[0] == WEBM_CLUSTER_ID:
+            clusters.append(pos)
+        if element_id[0] in (WEBM_SEGMENT_ID, WEBM_CLUSTER_ID):
+            pos = size[1]
+        elif size[0] < 0:
+            raise ValueError(f"Unknown-size WebM element {element_id[0]:#x}")
+        else:
+            pos = size[1] + size[0]
+
+
+def scan_mp4(data, pos=0):
+    """
+    Walk top-level boxes of a fragmented MP4 (Safari's MediaRecorder) from
+    data[pos:]. Returns (moof offsets, offset to resume at) like scan_webm().
+    """
+    fragments = []
+    while pos + 8 <= len(data):
+        size, kind = struct.unpack_from(">I4s", data, pos)
+        header = 8
+        if size == 1:
+            if pos + 16 > len(data):
+                break
+            size, header = struct.unpack_from(">Q", data, pos + 8)[0], 16
+        if size < header:
+            raise ValueError(f"Unsupported MP4 box size {size} for {kind!r}")
+        if kind == b"moof":
+            fragments.append(pos)
+        pos += size
+    return fragments, pos
+
+
+def container_scanner(head):
+    """Fragment scanner for the container that starts with `head` (None if unknown)."""
+    if head.startswith(EBML_MAGIC):
+        return scan_webm
+    if head[4:8] == b"ftyp":
+        return scan_mp4
+    return None
+
+
+class ChunkConflictError(ValueError):
+    pass
+
+
+def max_chunk_bytes():
+    return int(float(os.getenv("SCRIBE_LIVE_MAX_CHUNK_MB", "16")) * 1024 * 1024)
+
+
+class Recording:
+    """Server-side state of one live recording being uploaded in numbered chunks."""
+
+    def __init__(self):
+        self.recording_id = None
+        self.directory = None
+        self.chunks = {}  # index -> (sha256, size)
+        self.total_bytes = 0
+        self.mime_type = "audio/webm"
+        self.session_id = None
+        self.meeting_title = None
+        self.user_notes = []
+        self.analyzed_upto = 0  # Chunks [0, analyzed_upto) are already in the summary
+        self.last_result = None
+        self.finalized = False
+        self.lock = asyncio.Lock()  # Analyses of one recording must run in order
+        self.write_lock = threading.Lock()  # Serializes put_chunk() retries racing in the threadpool
+        self.task = None
+        # Index of the byte stream (see ChunkStore.assemble); updated under `lock`
+        self.scanner = None  # scan_webm / scan_mp4, picked from chunk 0
+        self.header = None  # Container header: chunk 0 up to the first Cluster/moof
+        self.fragments = []  # Stream offsets where a Cluster/moof starts
+        self.scan_pos = 0  # Stream offset the index resumes from (None: not indexable)
+
+    def contiguous(self):
+        """Number of chunks received without gaps from index 0."""
+        n = 0
+        while n in self.chunks:
+            n += 1
+        return n
+
+    def status(self):
+        return {
+            "recording_id": self.recording_id,
+            "received": sorted(self.chunks),
+            "next_index": self.contiguous(),
+            "bytes": self.total_bytes,
+            "analyzed_upto": self.analyzed_upto,
+            "analyzing": bool(self.task and not self.task.done()),
+            "finalized": self.finalized,
+        }
+
+
+class ChunkStore:
+    """
+    Idempotent, resumable chunk ingest for live recordings.
+    Chunks are written to SCRIBE_CHUNK_DIR/<recording_id>/ with atomic renames;
+    re-sending a chunk with the same bytes is a no-op. Once
+    SCRIBE_LIVE_SEGMENT_CHUNKS new contiguous chunks are in, that segment is
+    analyzed in the background so finalize() only has the tail left.
+    """
+
+    def __init__(self, root=None, segment_chunks=None, max_bytes=None, chunk_max_bytes=None):
+        self.root = root or os.getenv("SCRIBE_CHUNK_DIR", os.path.join(tempfile.gettempdir(), "ai4scribe_chunks"))
+        self.segment_chunks = segment_chunks or int(os.getenv("SCRIBE_LIVE_SEGMENT_CHUNKS", "30"))
+        self.max_bytes = max_bytes or max_audio_bytes()
+        # Chunks are a few seconds of audio; one request must not carry a whole upload
+        self.chunk_max_bytes = chunk_max_bytes or max_chunk_bytes()
+        self.recordings = SessionRegistry(Recording, on_evict=self._remove_files)
+        os.makedirs(self.root, exist_ok=True)
+
+    def get(self, recording_id):
+        if not recording_id or not RECORDING_ID_RE.match(recording_id):
+            raise ValueError("Invalid recording id")
+        recording = self.recordings.get(recording_id)
+        if recording.directory is None:
+            recording.recording_id = recording_id
+            recording.directory = os.path.join(self.root, recording_id)
+            os.makedirs(recording.directory, exist_ok=True)
+        return recording
+
+    def _chunk_path(self, recording, index):
+        return os.path.join(recording.directory, f"{index:06d}.part")
+
+    async def read_chunk(self, upload):
+        """Read one chunk upload in bounded pieces; AudioTooLargeError once it exceeds chunk_max_bytes."""
+        limit = self.chunk_max_bytes
+        error = AudioTooLargeError(f"Chunk exceeds the {limit / (1024 * 1024):g} MB limit (SCRIBE_LIVE_MAX_CHUNK_MB).")
+        if getattr(upload, "size", None) and upload.size > limit:
+            raise error
+        data = bytearray()
+        while True:
+            piece = await upload.read(READ_PIECE_BYTES)
+            if not piece:
+                return bytes(data)
+            data += piece
+            if len(data) > limit:
+                raise error
+
+    def put_chunk(self, recording, index, data):
+        """
+        Store chunk `index`. Returns "stored" or "duplicate".
+        Blocking (disk I/O); call via run_in_threadpool.
+        """
+        if index < 0:
+            raise ValueError("Chunk index must be >= 0")
+        if recording.finalized:
+            raise ChunkConflictError("Recording is already finalized")
+
+        sha256 = hashlib.sha256(data).hexdigest()
+        with recording.write_lock:
+            existing = recording.chunks.get(index)
+            if existing:
+                if existing[0] == sha256:
+                    return "duplicate"
+                raise ChunkConflictError(f"Chunk {index} was already received with different content")
+            if recording.total_bytes + len(data) > self.max_bytes:
+                raise AudioTooLargeError(
+                    f"Recording exceeds the {self.max_bytes // (1024 * 1024)} MB limit (SCRIBE_MAX_AUDIO_MB)."
+                )
+
+            fd, tmp_path = tempfile.mkstemp(dir=recording.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, self._chunk_path(recording, index))
+            except BaseException:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
+
+            recording.chunks[index] = (sha256, len(data))
+            recording.total_bytes += len(data)
+        return "stored"
+
+    def _offsets(self, recording, end):
+        """Stream offset of the start of every chunk in [0, end]."""
+        offsets = [0]
+        for index in range(end):
+            offsets.append(offsets[-1] + recording.chunks[index][1])
+        return offsets
+
+    def _read_range(self, recording, offsets, lo, hi):
+        """Bytes [lo, hi) of the recording's stream, read from the chunk files."""
+        buffer = io.BytesIO()
+        index = bisect.bisect_right(offsets, lo) - 1
+        while lo < hi:
+            with open(self._chunk_path(recording, index), "rb") as f:
+                f.seek(lo - offsets[index])
+                data = f.read(min(hi, offsets[index + 1]) - lo)
+            if not data:
+                raise OSError(f"Chunk {index} of recording {recording.recording_id} is truncated")
+            buffer.write(data)
+            lo += len(data)
+            index += 1
+        return buffer
+
+    def _index_stream(self, recording, offsets):
+        """Extend the header/fragment index over the stream up to offsets[-1]."""
+        if recording.scan_pos is None or recording.scan_pos >= offsets[-1]:
+            return
+        if recording.scan_pos == 0:
+            with open(self._chunk_path(recording, 0), "rb") as f:
+                recording.scanner = container_scanner(f.read(8))
+            if recording.scanner is None:
+                recording.scan_pos = None
+                return
+        base = recording.scan_pos
+        data = self._read_range(recording, offsets, base, offsets[-1]).getbuffer()
+        try:
+            found, resume = recording.scanner(data)
+        except ValueError as e:
+            print(f"Recording {recording.recording_id} cannot be split on fragments, resending chunk 0: {e}")
+            recording.scan_pos = None
+            return
+        finally:
+            data.release()
+        recording.fragments.extend(base + offset for offset in found)
+        recording.scan_pos = base + resume
+        if recording.header is None and recording.fragments:
+            recording.header = self._read_range(recording, offsets, 0, recording.fragments[0]).getvalue()
+
+    def assemble(self, recording, start, end):
+        """
+        Concatenate chunks [start, end) into one playable blob.
+        MediaRecorder writes the container header only into chunk 0, and its
+        timeslices do not line up with WebM Clusters (or MP4 fragments). A
+        later segment is therefore the cached header followed by the stream
+        from the start of the fragment holding the first byte of chunk
+        `start`; only that one fragment overlaps the previous segment's tail.
+        Streams that cannot be indexed are prefixed with the whole chunk 0.
+        Blocking; call it from a thread while holding recording.lock.
+        """
+        offsets = self._offsets(recording, end)
+        if start == 0:
+            buffer = self._read_range(recording, offsets, 0, offsets[end])
+            buffer.seek(0)
+            return buffer
+
+        self._index_stream(recording, offsets)
+        fragments = recording.fragments
+        first = bisect.bisect_right(fragments, offsets[start]) - 1
+        if recording.header is None or first < 0:
+            buffer = self._read_range(recording, offsets, 0, offsets[1])
+            buffer.write(self._read_range(recording, offsets, offsets[start], offsets[end]).getbuffer())
+        else:
+            buffer = io.BytesIO()
+            buffer.write(recording.header)
+            buffer.write(self._read_range(recording, offsets, fragments[first], offsets[end]).getbuffer())
+        buffer.seek(0)
+        return buffer
+
+    async def analyze_upto(self, recording, end, summarizer):
+        """Analyze chunks [analyzed_upto, end) into the session summary, in order."""
+        async with recording.lock:
+            start = recording.analyzed_upto
+            if end <= start:
+                return recording.last_result
+
+            audio = await asyncio.to_thread(self.assemble, recording, start, end)
+            view = audio.getbuffer()
+            sha256, size = hashlib.sha256(view).hexdigest(), len(view)
+            view.release()
+
+            print(f"Analyzing recording {recording.recording_id} chunks [{start}, {end})")
+            # Serialized with the session's text summaries through its coalescer
+            result = await summarizer.coalescer.submit_audio(
+                audio,
+                meeting_title=recording.meeting_title,
+                user_notes=recording.user_notes,
+                mime_type=recording.mime_type,
+                sha256=sha256,
+                size=size,
+            ).result()
+            if "error" not in result:
+                recording.analyzed_upto = end
+            recording.last_result = result
+            return result
+
+    def maybe_schedule(self, recording, summarizer):
+        """Start a background analysis once a full segment of new chunks is available."""
+        if recording.task and not recording.task.done():
+            return False
+        ready = recording.contiguous()
+        if ready - recording.analyzed_upto < self.segment_chunks:
+            return False
+        recording.task = asyncio.create_task(self.analyze_upto(recording, ready, summarizer))
+        return True
+
+    async def finalize(self, recording, summarizer):
+        """Wait for background analysis, then analyze only the remaining tail."""
+        if recording.finalized:
+            return recording.last_result
+        if recording.task:
+            try:
+                await asyncio.shield(recording.task)
+            except Exception as e:
+                print(f"Background segment analysis failed, retrying in finalize: {e}")
+        ready = recording.contiguous()
+        if ready < len(recording.chunks):
+            return {"error": f"Missing chunk {ready}; resend it before finalizing", "next_index": ready}
+        if ready == 0:
+            return {"error": "No audio chunks received"}
+
+        result = await self.analyze_upto(recording, ready, summarizer)
+        if result and "error" not in result:
+            recording.finalized = True
+            await asyncio.to_thread(self._remove_files, recording.recording_id, recording)
+        return result
+
+    def discard(self, recording_id):
+        recording = self.recordings.peek(recording_id)
+        if recording:
+            self.recordings.discard(recording_id)
+            self._remove_files(recording_id, recording)
+
+    def _remove_files(self, recording_id, recording):
+        if recording.directory and os.path.isdir(recording.directory):
+            shutil.rmtree(recording.directory, ignore_errors=True)
@@ -0,0 +1,285 @@
+import asyncio
+import bisect
+import heapq
+import os
+import re
+import threading
+import time
+
+import metrics
+
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_HANGUL_FIRST, _HANGUL_LAST = 0xAC00, 0xD7A3
+_TOKEN_SPLIT = re.compile(r"[\s.@_\-(),<>/]+")
+
+
+def _is_syllable(char):
+    return _HANGUL_FIRST <= ord(char) <= _HANGUL_LAST
+
+
+def choseong(text):
+    """Initial consonants of the Hangul syllables in text ("김철수" -> "ㄱㅊㅅ"); other characters are kept."""
+    return "".join(CHOSEONG[(ord(c) - _HANGUL_FIRST) // 588] if _is_syllable(c) else c for c in text)
+
+
+def _char_matches(query_char, char, last):
+    """
+    One query character against one name character. A lone consonant matches
+    any syllable starting with it; the last query character may also be a
+    syllable still being composed by the IME ("처" while typing "철").
+    """
+    if query_char == char:
+        return True
+    if query_char in CHOSEONG:
+        return _is_syllable(char) and CHOSEONG[(ord(char) - _HANGUL_FIRST) // 588] == query_char
+    if last and _is_syllable(query_char) and _is_syllable(char):
+        q, c = ord(query_char) - _HANGUL_FIRST, ord(char) - _HANGUL_FIRST
+        return q % 28 == 0 and q // 28 == c // 28  # Same initial + medial, query has no final yet
+    return False
+
+
+def _hangul_prefix_match(query, text):
+    return len(text) >= len(query) and all(
+        _char_matches(q, text[i], i == len(query) - 1) for i, q in enumerate(query))
+
+
+def _prefix_range(keys, prefix):
+    return bisect.bisect_left(keys, prefix), bisect.bisect_left(keys, prefix + "\U0010ffff")
+
+
+def _hangul_match_at(query, text):
+    """Position of the first fuzzy Hangul match of query in text, or -1."""
+    for start in range(len(text) - len(query) + 1):
+        if all(_char_matches(q, text[start + i], i == len(query) - 1) for i, q in enumerate(query)):
+            return start
+    return -1
+
+
+def _bigrams(text):
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class _Entry:
+    __slots__ = ("contact", "name", "text", "initials", "tokens", "keys", "sort_key")
+
+    def __init__(self, contact):
+        self.contact = contact
+        self.name = contact["name"].lower()
+        parts = [contact["name"], contact.get("email", ""), contact.get("organization", "")]
+        self.text = " ".join(p for p in parts if p).lower()
+        self.initials = choseong(self.name)
+        self.sort_key = (self.name, contact["id"])
+        self.tokens = [t for t in _TOKEN_SPLIT.split(self.text) if t]
+        # Index keys: bigrams of the searchable text and initials, plus word / initials first characters
+        self.keys = (_bigrams(self.text) | _bigrams(self.initials)
+                     | {"^" + t[0] for t in self.tokens + self.initials.split()})
+
+
+class ContactDirectory:
+    """
+    In-memory contact index for participant autocomplete.
+
+    Contacts are pulled from `source.list_contact_changes(sync_token)`
+    (CalendarService: People API connections) on start and every
+    SCRIBE_CONTACTS_SYNC_SECONDS, incrementally via sync tokens. Queries are
+    answered locally from a bigram / first-character inverted index with
+    prefix, substring and Korean initial-consonant (choseong) matching, so
+    keystrokes never wait on the network once the first sync completed.
+    """
+
+    def __init__(self, source, sync_interval=None):
+        self.source = source
+        self.sync_interval = sync_interval if sync_interval is not None else float(
+            os.getenv("SCRIBE_CONTACTS_SYNC_SECONDS", "300"))
+        self._entries = {}  # contact id -> _Entry
+        self._postings = {}  # key -> {contact ids}
+        # Entries sorted by name and by initials (replaced, never mutated, on each sync)
+        self._by_name, self._name_keys = [], []
+        self._by_initials, self._initial_keys = [], []
+        self._lock = threading.Lock()
+        self.sync_token = None
+        self.ready = False
+        self.attempted = False  # First sync finished (successfully or not)
+        self.last_sync = None
+        self._task = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    # --- index maintenance -------------------------------------------------
+
+    def _remove_locked(self, contact_id):
+        entry = self._entries.pop(contact_id, None)
+        if entry is None:
+            return
+        for key in entry.keys:
+            ids = self._postings.get(key)
+            if ids is not None:
+                ids.discard(contact_id)
+                if not ids:
+                    del self._postings[key]
+
+    def _add_locked(self, contact):
+        self._remove_locked(contact["id"])
+        entry = _Entry(contact)
+        self._entries[contact["id"]] = entry
+        for key in entry.keys:
+            self._postings.setdefault(key, set()).add(contact["id"])
+
+    def apply(self, changes):
+        """Apply one list_contact_changes() result (full listings replace the index)."""
+        with self._lock:
+            if changes.get("full"):
+                self._entries.clear()
+                self._postings.clear()
+            for contact_id in changes.get("deleted", []):
+                self._remove_locked(contact_id)
+            for contact in changes.get("contacts", []):
+                self._add_locked(contact)
+            self._by_name = sorted(self._entries.values(), key=lambda e: e.sort_key)
+            self._name_keys = [e.name for e in self._by_name]
+            self._by_initials = sorted(self._by_name, key=lambda e: e.initials)  # Stable: name order within
+            self._initial_keys = [e.initials for e in self._by_initials]
+            self.sync_token = changes.get("sync_token")
+            self.ready = True
+            self.last_sync = time.time()
+
+    def sync(self):
+        """Blocking incremental sync; returns the number of changed contacts."""
+        changes = self.source.list_contact_changes(self.sync_token)
+        self.apply(changes)
+        changed = len(changes.get("contacts", [])) + len(changes.get("deleted", []))
+        metrics.CONTACTS_INDEXED.set(len(self._entries))
+        print(f"Contacts synced: {changed} changed, {len(self._entries)} indexed"
+              f"{' (full)' if changes.get('full') else ''}")
+        return changed
+
+    async def _sync_loop(self):
+        while True:
+            try:
+                await asyncio.to_thread(self.sync)
+            except Exception as e:
+                # Keep serving the current index; the next round retries
+                print(f"Contacts sync failed: {e}")
+            self.attempted = True
+            if self.sync_interval <= 0:
+                return
+            await asyncio.sleep(self.sync_interval)
+
+    def start(self):
+        """Start background syncing on the running loop (idempotent)."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._sync_loop())
+
+    async def wait_ready(self, timeout):
+        """Wait up to `timeout` seconds for the first sync attempt; returns whether the index is usable."""
+        deadline = time.monotonic() + timeout
+        while not self.ready and not self.attempted and self._task and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        return self.ready
+
+    async def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    # --- search ------------------------------------------------------------
+
+    def _candidates_locked(self, keys):
+        """Ids containing every key, or None when the keys are too common to be worth intersecting."""
+        postings = [self._postings.get(key) for key in keys]
+        if not postings or any(p is None for p in postings):
+            return set()
+        postings.sort(key=len)
+        if len(postings[0]) * 8 > len(self._entries):
+            return None
+        return postings[0].intersection(*postings[1:])
+
+    def _name_prefix(self, query, by_name, name_keys, by_initials, initial_keys, limit):
+        """Tier 0: entries whose name starts with the query, in name order."""
+        if not any(c in CHOSEONG for c in query):
+            last = query[-1]
+            if _is_syllable(last) and (ord(last) - _HANGUL_FIRST) % 28 == 0:
+                # Syllable still being composed: "기" also matches 긱, 긴, ... 깋 (same initial + medial)
+                start = bisect.bisect_left(name_keys, query)
+                end = bisect.bisect_left(name_keys, query[:-1] + chr(ord(last) + 27) + "\U0010ffff")
+            else:
+                start, end = _prefix_range(name_keys, query)
+            return by_name[start:min(end, start + limit)]
+
+        start, end = _prefix_range(initial_keys, choseong(query))
+        matches = by_initials[start:end]
+        if any(_is_syllable(c) for c in query):
+            matches = [e for e in matches if _hangul_prefix_match(query, e.name)]
+        return heapq.nsmallest(limit, matches, key=lambda e: e.sort_key)
+
+    @staticmethod
+    def _ordered(ids, by_name, entries):
+        """Candidate entries in name order (ids None: every entry)."""
+        if ids is None:
+            return by_name
+        if len(ids) * 8 < len(by_name):
+            return sorted((entries[i] for i in ids if i in entries), key=lambda e: e.sort_key)
+        return (e for e in by_name if e.contact["id"] in ids)  # Lazy: the scan usually stops early
+
+    def search(self, query, limit=10):
+        """
+        Labels of the best matching contacts ("Name (Org) <email>"), ranked
+        name prefix < word prefix < substring < initial-consonant match, then
+        by name (single characters only match prefixes). Name-prefix hits come
+        from binary searches over the sorted names/initials; word-prefix and
+        substring hits from the bigram index, scanned in name order until the
+        word-prefix tier is full; initial-consonant hits only if still short.
+        """
+        query = (query or "").strip().lower()
+        if not query or limit <= 0:
+            return []
+        initials = choseong(query)
+        last = query[-1]
+        composing = _is_syllable(last) and (ord(last) - _HANGUL_FIRST) % 28 == 0
+        fuzzy = len(query) > 1 and (composing or any(c in CHOSEONG for c in query))
+
+        with self._lock:
+            if len(query) == 1:
+                literal_ids = set(self._postings.get("^" + query, ()))
+                if composing:  # "기" -> 김, 길, ...
+                    literal_ids |= self._postings.get("^" + initials, set())
+            else:
+                literal_ids = self._candidates_locked(_bigrams(query))
+            fuzzy_ids = self._candidates_locked(_bigrams(initials)) if fuzzy else set()
+            entries = self._entries
+            by_name, name_keys = self._by_name, self._name_keys
+            by_initials, initial_keys = self._by_initials, self._initial_keys
+
+            first = self._name_prefix(query, by_name, name_keys, by_initials, initial_keys, limit)
+            need = limit - len(first)
+            if need <= 0:
+                return [e.contact["label"] for e in first]
+            seen = {e.contact["id"] for e in first}
+
+            # Word prefix (1) and substring (2)
+            prefix_hits, substring_hits = [], []
+            for entry in self._ordered(literal_ids, by_name, entries):
+                if entry.contact["id"] in seen:
+                    continue
+                if any(token.startswith(query) for token in entry.tokens):
+                    prefix_hits.append(entry)
+                    if len(prefix_hits) >= need:
+                        break
+                elif len(query) > 1 and query in entry.text:
+                    substring_hits.append(entry)
+            rest = prefix_hits + substring_hits
+
+            # Initial-consonant / composing-syllable match inside the name (3)
+            if fuzzy and len(rest) < need:
+                seen.update(e.contact["id"] for e in rest)
+                for entry in self._ordered(fuzzy_ids, by_name, entries):
+                    if entry.contact["id"] not in seen and _hangul_match_at(query, entry.name) > 0:
+                        rest.append(entry)
+                        if len(rest) >= need:
+                            break
+        return [e.contact["label"] for e in first + rest[:need]]
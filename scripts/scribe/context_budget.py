@@ -0,0 +1,107 @@
+import os
+import re
+
+PARTICIPANTS_PREFIX = "참석자 명단:"
+
+
+def estimate_tokens(text):
+    """
+    Rough local token estimate without a network call.
+    ASCII averages ~4 chars/token; Hangul and other non-ASCII text
+    tokenizes much denser, ~1.5 chars/token.
+    """
+    if not text:
+        return 0
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    other_chars = len(text) - ascii_chars
+    return int(ascii_chars / 4 + other_chars / 1.5) + 1
+
+
+def _normalize_note(note):
+    # Exact duplicates only: the timestamp is part of the note (a timeline anchor)
+    return re.sub(r"\s+", " ", note.strip())
+
+
+class ContextBudget:
+    """
+    Token budget for the context re-sent on every incremental call.
+    `summary_max_tokens` bounds the running summary (compacted once crossed);
+    `notes_max_tokens` bounds the human notes (deduplicated, then trimmed).
+    """
+
+    def __init__(self, summary_max_tokens=None, notes_max_tokens=None, compact_ratio=None):
+        self.summary_max_tokens = summary_max_tokens or int(os.getenv("SUMMARY_CONTEXT_MAX_TOKENS", "4000"))
+        self.notes_max_tokens = notes_max_tokens or int(os.getenv("SUMMARY_NOTES_MAX_TOKENS", "1000"))
+        self.compact_ratio = compact_ratio or float(os.getenv("SUMMARY_COMPACT_RATIO", "0.5"))
+
+    @property
+    def compact_target_tokens(self):
+        return int(self.summary_max_tokens * self.compact_ratio)
+
+    def needs_compaction(self, summary_tokens):
+        return self.summary_max_tokens > 0 and summary_tokens > self.summary_max_tokens
+
+    def fit_notes(self, notes, timeline=False):
+        """
+        Drop exact duplicate notes and trim the rest to notes_max_tokens.
+        Text summaries keep the newest notes. With timeline=True (audio
+        analysis, where timestamped notes anchor the recording) the first
+        and last notes are kept and the middle is trimmed.
+        The participants line is always kept first.
+        """
+        if not notes:
+            return notes
+
+        pinned = [n for n in notes if n.startswith(PARTICIPANTS_PREFIX)][:1]
+        seen = set()
+        unique = []
+        for note in notes:
+            key = _normalize_note(note)
+            if key and key not in seen and not note.startswith(PARTICIPANTS_PREFIX):
+                seen.add(key)
+                unique.append(note)
+
+        budget = self.notes_max_tokens - sum(estimate_tokens(n) for n in pinned)
+        if self.notes_max_tokens <= 0 or sum(estimate_tokens(n) for n in unique) <= budget:
+            kept = unique
+        elif timeline:
+            kept = self._trim_middle(unique, budget)
+        else:
+            kept = self._keep_newest(unique, budget)
+
+        dropped = len(notes) - len(pinned) - len(kept)
+        if dropped:
+            print(f"Context budget: dropped {dropped} duplicate/over-budget notes")
+        return pinned + kept
+
+    @staticmethod
+    def _keep_newest(notes, budget):
+        kept = []
+        for note in reversed(notes):
+            cost = estimate_tokens(note)
+            if cost > budget:
+                break
+            budget -= cost
+            kept.append(note)
+        return list(reversed(kept))
+
+    @staticmethod
+    def _trim_middle(notes, budget):
+        """Take notes alternately from both ends until the budget runs out."""
+        head, tail = [], []
+        lo, hi = 0, len(notes) - 1
+        from_head = True
+        while lo <= hi:
+            index = lo if from_head else hi
+            cost = estimate_tokens(notes[index])
+            if cost > budget:
+                break
+            budget -= cost
+            if from_head:
+                head.append(notes[lo])
+                lo += 1
+            else:
+                tail.append(notes[hi])
+                hi -= 1
+            from_head = not from_head
+        return head + list(reversed(tail))
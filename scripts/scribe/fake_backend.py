@@ -0,0 +1,228 @@
+import asyncio
+import datetime
+import os
+import time
+import uuid
+from types import SimpleNamespace
+
+from calendar_cache import EventCache
+
+
+def _ms(name, default):
+    return float(os.getenv(name, default)) / 1000.0
+
+
+class FakeBackendConfig:
+    """Latency and output size of the fake backends (FAKE_* environment variables)."""
+
+    def __init__(self, latency=None, output_chars=None, stream_chunks=None, upload_per_mb=None, google_latency=None):
+        self.latency = latency if latency is not None else _ms("FAKE_GEMINI_LATENCY_MS", "200")
+        self.output_chars = output_chars or int(os.getenv("FAKE_GEMINI_OUTPUT_CHARS", "1500"))
+        self.stream_chunks = stream_chunks or int(os.getenv("FAKE_GEMINI_STREAM_CHUNKS", "10"))
+        self.upload_per_mb = upload_per_mb if upload_per_mb is not None else _ms("FAKE_GEMINI_UPLOAD_MS_PER_MB", "50")
+        self.google_latency = google_latency if google_latency is not None else _ms("FAKE_GOOGLE_LATENCY_MS", "100")
+
+
+def _contents_chars(contents):
+    if isinstance(contents, str):
+        return len(contents)
+    if isinstance(contents, (list, tuple)):
+        # Uploaded files count as a fixed-size audio prompt
+        return sum(len(c) if isinstance(c, str) else 32000 for c in contents)
+    return len(str(contents))
+
+
+def _usage(contents, output_text):
+    input_tokens = max(1, _contents_chars(contents) // 4)
+    output_tokens = max(1, len(output_text) // 4)
+    return SimpleNamespace(
+        prompt_token_count=input_tokens,
+        candidates_token_count=output_tokens,
+        total_token_count=input_tokens + output_tokens,
+    )
+
+
+def _size_of(file):
+    if isinstance(file, (str, os.PathLike)):
+        return os.path.getsize(file)
+    position = file.tell()
+    file.seek(0, os.SEEK_END)
+    size = file.tell()
+    file.seek(position)
+    return size
+
+
+class _Models:
+    def __init__(self, config):
+        self.config = config
+
+    def _text(self):
+        line = "- 논의 내용 요약 (fake backend)\n"
+        return (line * (self.config.output_chars // len(line) + 1))[:self.config.output_chars]
+
+    def _response(self, contents, text):
+        return SimpleNamespace(text=text, usage_metadata=_usage(contents, text))
+
+    def generate_content(self, model, contents, config=None):
+        time.sleep(self.config.latency)
+        return self._response(contents, self._text())
+
+    def generate_content_stream(self, model, contents, config=None):
+        text = self._text()
+        n = self.config.stream_chunks
+        step = len(text) // n + 1
+        for i in range(0, len(text), step):
+            time.sleep(self.config.latency / n)
+            chunk = text[i:i + step]
+            last = i + step >= len(text)
+            yield SimpleNamespace(text=chunk, usage_metadata=_usage(contents, text) if last else None)
+
+    def count_tokens(self, model, contents, config=None):
+        return SimpleNamespace(total_tokens=max(1, _contents_chars(contents) // 4))
+
+
+class _AsyncModels(_Models):
+    async def generate_content(self, model, contents, config=None):
+        await asyncio.sleep(self.config.latency)
+        return self._response(contents, self._text())
+
+    async def generate_content_stream(self, model, contents, config=None):
+        text = self._text()
+        n = self.config.stream_chunks
+        step = len(text) // n + 1
+
+        async def chunks():
+            for i in range(0, len(text), step):
+                await asyncio.sleep(self.config.latency / n)
+                last = i + step >= len(text)
+                yield SimpleNamespace(text=text[i:i + step], usage_metadata=_usage(contents, text) if last else None)
+        return chunks()
+
+    async def count_tokens(self, model, contents, config=None):
+        return SimpleNamespace(total_tokens=max(1, _contents_chars(contents) // 4))
+
+
+class _Files:
+    def __init__(self, config):
+        self.config = config
+        self.uploaded = {}
+
+    def _handle(self, file, config):
+        name = f"files/fake-{uuid.uuid4().hex[:12]}"
+        mime_type = (config or {}).get("mime_type", "audio/mp3")
+        handle = SimpleNamespace(name=name, uri=f"https://fake.invalid/{name}", mime_type=mime_type, expiration_time=None)
+        self.uploaded[name] = handle
+        return handle, _size_of(file) / (1024 * 1024) * self.config.upload_per_mb
+
+    def upload(self, file, config=None):
+        handle, delay = self._handle(file, config)
+        time.sleep(delay)
+        return handle
+
+    def delete(self, name, config=None):
+        self.uploaded.pop(name, None)
+
+
+class _AsyncFiles(_Files):
+    async def upload(self, file, config=None):
+        handle, delay = self._handle(file, config)
+        await asyncio.sleep(delay)
+        return handle
+
+    async def delete(self, name, config=None):
+        self.uploaded.pop(name, None)
+
+
+class FakeGenaiClient:
+    """
+    Offline stand-in for google.genai.Client covering what Summarizer uses:
+    models.generate_content(_stream), models.count_tokens, files.upload/delete,
+    on both the sync client and client.aio. Responses carry usage_metadata
+    estimated from the prompt size, so cost accounting still works.
+    """
+
+    def __init__(self, config=None, **kwargs):
+        self.config = config or FakeBackendConfig()
+        self.models = _Models(self.config)
+        self.files = _Files(self.config)
+        self.aio = SimpleNamespace(models=_AsyncModels(self.config), files=_AsyncFiles(self.config))
+
+
+class FakeCalendarService:
+    """
+    Offline stand-in for auth_calendar.CalendarService. Calls block for
+    FAKE_GOOGLE_LATENCY_MS, like the synchronous Google API client does.
+    """
+
+    def __init__(self, config=None, **kwargs):
+        self.config = config or FakeBackendConfig()
+        self.service = True
+        self.people_service = True
+        self.events = EventCache(self.fetch_event_changes)
+
+    def authenticate(self):
+        return True, "인증 성공 (fake)"
+
+    def close(self):
+        pass
+
+    def get_upcoming_events(self, max_results=10, refresh=False):
+        if refresh:
+            self.events.sync()
+        return {"events": self.events.upcoming(max_results)}
+
+    def fetch_event_changes(self, sync_tokens, time_min, time_max):
+        time.sleep(self.config.google_latency * 2)  # calendarList + one events batch
+        results = {}
+        for c, name in enumerate(["fake", "팀 캘린더", "휴가"]):
+            cal_id = f"fake-calendar-{c}"
+            if sync_tokens.get(cal_id):
+                results[cal_id] = {"name": name, "items": [], "sync_token": sync_tokens[cal_id], "full": False}
+                continue
+            items = []
+            for i in range(20):
+                start = datetime.datetime.fromtimestamp(time_min + 86400 + 3600 * (3 * i + c), datetime.timezone.utc)
+                end = start + datetime.timedelta(minutes=50)
+                items.append({"id": f"fake-event-{c}-{i}", "summary": f"회의 {i}", "description": "", "attendees": [],
+                              "start": {"dateTime": start.isoformat()}, "end": {"dateTime": end.isoformat()}})
+            results[cal_id] = {"name": name, "items": items, "sync_token": f"fake-events-sync-{c}", "full": True}
+        return results
+
+    def upload_to_drive(self, filename, content, mimetype="text/markdown", progress=None):
+        time.sleep(self.config.google_latency)
+        if progress:
+            size = len(content.encode("utf-8"))
+            progress(size, size)
+        file_id = f"fake-{uuid.uuid4().hex[:12]}"
+        return file_id, f"https://docs.fake.invalid/{file_id}"
+
+    def get_event(self, event_id):
+        time.sleep(self.config.google_latency)
+        return {"id": event_id, "attachments": []}
+
+    def attach_to_calendar_event(self, event_id, file_id, file_link, file_title, event=None):
+        if event is None:
+            self.get_event(event_id)
+        time.sleep(self.config.google_latency)  # patch
+        return True, f"https://calendar.fake.invalid/{event_id}"
+
+    def search_contacts(self, query):
+        time.sleep(self.config.google_latency)
+        return [f"{query}{i} (Fake Org) <{query}{i}@fake.invalid>" for i in range(3)]
+
+    def list_contact_changes(self, sync_token=None):
+        time.sleep(self.config.google_latency)
+        if sync_token:
+            return {"contacts": [], "deleted": [], "sync_token": sync_token, "full": False}
+        surnames, given = "김이박최정강조윤장임", ["민준", "서연", "도윤", "하은", "지호", "수아", "현우", "지민"]
+        contacts = []
+        for i in range(len(surnames) * len(given) * 5):
+            name = f"{surnames[i % len(surnames)]}{given[i // len(surnames) % len(given)]}"
+            email = f"user{i}@fake.invalid"
+            contacts.append({"id": f"people/fake{i}", "name": name, "email": email,
+                             "organization": f"Fake Org, 팀{i % 12}", "label": f"{name} (Fake Org, 팀{i % 12}) <{email}>"})
+        return {"contacts": contacts, "deleted": [], "sync_token": "fake-sync-1", "full": True}
+
+
+def enabled():
+    return os.getenv("SCRIBE_FAKE_BACKEND", "0") == "1"
@@ -0,0 +1,156 @@
+import asyncio
+import datetime
+import os
+import time
+
+import metrics
+
+
+class _RemoteFile:
+    def __init__(self, handle, size, expires_at):
+        self.handle = handle
+        self.size = size
+        self.expires_at = expires_at
+        self.refs = 0
+        self.last_used = time.monotonic()
+
+
+class GeminiFileManager:
+    """
+    Dedup cache and lifecycle manager for Gemini Files API uploads.
+    Maps the SHA-256 of an audio file to its uploaded handle and reuses it
+    until shortly before the remote expiry. Files no longer referenced by an
+    in-flight request are deleted by a background sweeper after an idle grace
+    period, so re-analysing the same recording soon after is free.
+    """
+
+    def __init__(self, client, idle_seconds=None, ttl=None, sweep_interval=None):
+        self.client = client
+        self.idle_seconds = idle_seconds if idle_seconds is not None else float(os.getenv("GEMINI_FILE_IDLE_SECONDS", "900"))
+        # Gemini keeps uploads for 48h; used only when the handle has no expiration_time
+        self.ttl = ttl if ttl is not None else float(os.getenv("GEMINI_FILE_TTL_SECONDS", str(47 * 3600)))
+        self.sweep_interval = sweep_interval or float(os.getenv("GEMINI_FILE_SWEEP_SECONDS", "60"))
+
+        self._files = {}  # sha256 -> _RemoteFile
+        self._inflight = {}  # sha256 -> Future of an upload in progress
+        self._retired = {}  # handle name -> _RemoteFile replaced while still referenced
+        self._deletes = set()  # Background delete tasks (kept referenced until done)
+        self._sweeper = None
+        self.stats = {"uploads": 0, "reuses": 0, "bytes_uploaded": 0, "bytes_saved": 0, "deletes": 0}
+
+    def _expires_at(self, handle):
+        expiration = getattr(handle, "expiration_time", None)
+        if isinstance(expiration, datetime.datetime):
+            remaining = (expiration - datetime.datetime.now(datetime.timezone.utc)).total_seconds()
+            # Stop reusing 10 minutes early so a long generation never races the expiry
+            return time.monotonic() + max(0.0, remaining - 600)
+        return time.monotonic() + self.ttl
+
+    async def acquire(self, sha256, audio, mime_type, size=0):
+        """
+        Return a Gemini file handle for this content, uploading only if needed.
+        Every acquire() must be paired with release(sha256).
+        """
+        entry = self._files.get(sha256)
+        if entry and entry.expires_at > time.monotonic():
+            entry.refs += 1
+            entry.last_used = time.monotonic()
+            self.stats["reuses"] += 1
+            self.stats["bytes_saved"] += entry.size
+            print(f"Reusing uploaded file {entry.handle.name} ({entry.size} bytes saved)")
+            return entry.handle, True
+
+        inflight = self._inflight.get(sha256)
+        if inflight:
+            # Same content is being uploaded by another request: wait for it
+            await asyncio.shield(inflight)
+            return await self.acquire(sha256, audio, mime_type, size)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[sha256] = future
+        try:
+            if entry:
+                # Too close to expiry to reuse; in-flight users keep it until they release it
+                self._files.pop(sha256, None)
+                if entry.refs == 0:
+                    self._delete_later(entry.handle)
+                else:
+                    self._retired[entry.handle.name] = entry
+            with metrics.gemini_call("files", "upload"):
+                handle = await self.client.aio.files.upload(file=audio, config={'mime_type': mime_type})
+            entry = _RemoteFile(handle, size, self._expires_at(handle))
+            entry.refs = 1
+            self._files[sha256] = entry
+            self.stats["uploads"] += 1
+            self.stats["bytes_uploaded"] += size
+            future.set_result(None)
+            return handle, False
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody else may be waiting; mark the exception as retrieved
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(sha256, None)
+
+    def release(self, sha256, handle=None):
+        """Drop one reference; pass the handle acquire() returned so a replaced upload is released correctly."""
+        entry = self._retired.get(getattr(handle, "name", None)) or self._files.get(sha256)
+        if entry:
+            entry.refs = max(0, entry.refs - 1)
+            entry.last_used = time.monotonic()
+
+    def _delete_later(self, handle):
+        task = asyncio.create_task(self.delete(handle))
+        self._deletes.add(task)
+        task.add_done_callback(self._deletes.discard)
+
+    async def sweep(self):
+        """Delete unreferenced files that are idle past the grace period or expired."""
+        now = time.monotonic()
+        stale = [
+            sha for sha, entry in self._files.items()
+            if entry.refs == 0 and (now - entry.last_used > self.idle_seconds or entry.expires_at <= now)
+        ]
+        for sha in stale:
+            entry = self._files.pop(sha)
+            await self.delete(entry.handle)
+        retired = [name for name, entry in self._retired.items() if entry.refs == 0]
+        for name in retired:
+            await self.delete(self._retired.pop(name).handle)
+        return len(stale) + len(retired)
+
+    async def delete(self, handle):
+        """Delete a remote file now (errors are logged, not raised)."""
+        try:
+            with metrics.gemini_call("files", "delete"):
+                await self.client.aio.files.delete(name=handle.name)
+            self.stats["deletes"] += 1
+            print(f"Deleted remote file {handle.name}")
+        except Exception as e:
+            print(f"Failed to delete remote file {handle.name}: {e}")
+
+    async def _sweep_loop(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                await self.sweep()
+            except Exception as e:
+                print(f"File sweep failed: {e}")
+
+    def start(self):
+        """Start the background sweeper on the running event loop."""
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._sweep_loop())
+
+    async def close(self):
+        """Stop the sweeper and delete every unreferenced file."""
+        if self._sweeper:
+            self._sweeper.cancel()
+            self._sweeper = None
+        for sha in [sha for sha, entry in self._files.items() if entry.refs == 0]:
+            await self.delete(self._files.pop(sha).handle)
+        for name in [name for name, entry in self._retired.items() if entry.refs == 0]:
+            await self.delete(self._retired.pop(name).handle)
+        if self._deletes:
+            await asyncio.gather(*self._deletes)
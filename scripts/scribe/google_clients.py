@@ -0,0 +1,137 @@
+import datetime
+import os
+import threading
+
+import metrics
+
+
+class GoogleClients:
+    """
+    Google API service objects shared by all requests.
+
+    Each (api, version) is built once from the discovery documents bundled
+    with google-api-python-client (no discovery fetch) and reused. httplib2
+    connections are not thread-safe, so every request runs on an
+    AuthorizedHttp owned by the calling thread (kept open across calls) that
+    shares the one Credentials object. A background thread refreshes those
+    credentials SCRIBE_GOOGLE_REFRESH_MARGIN_SECONDS before they expire and
+    hands them to `on_refresh` (to persist token.json), so API calls never
+    wait for a token refresh.
+    """
+
+    def __init__(self, refresh_margin=None, timeout=None):
+        self.refresh_margin = refresh_margin if refresh_margin is not None else float(
+            os.getenv("SCRIBE_GOOGLE_REFRESH_MARGIN_SECONDS", "600"))
+        self.timeout = timeout if timeout is not None else float(
+            os.getenv("SCRIBE_GOOGLE_HTTP_TIMEOUT_SECONDS", "60"))
+        self.creds = None
+        self.on_refresh = None
+        self._generation = 0  # Bumped when credentials are replaced; stale per-thread sessions are rebuilt
+        self._services = {}
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._local = threading.local()
+        self._wake = threading.Event()  # Set to re-check expiry now (new credentials) or to stop
+        self._closed = False
+        self._refresher = None
+
+    def set_credentials(self, creds, on_refresh=None):
+        """Use these credentials from now on (drops services built for the previous ones)."""
+        with self._lock:
+            self.creds = creds
+            self.on_refresh = on_refresh
+            self._generation += 1
+            self._services = {}
+        self._wake.set()
+        self.start_refresher()
+
+    # --- HTTP sessions and services ---------------------------------------
+
+    def http(self):
+        """The calling thread's authorized HTTP session."""
+        local = self._local
+        if getattr(local, "generation", None) != self._generation:
+            import httplib2
+            import google_auth_httplib2
+            local.http = google_auth_httplib2.AuthorizedHttp(self.creds, http=httplib2.Http(timeout=self.timeout))
+            local.generation = self._generation
+        return local.http
+
+    def _build_request(self, http, *args, **kwargs):
+        from googleapiclient.http import HttpRequest
+        return HttpRequest(self.http(), *args, **kwargs)
+
+    def service(self, api, version):
+        """Cached service object for api/version (e.g. "drive", "v3")."""
+        key = (api, version)
+        service = self._services.get(key)
+        if service is None:
+            with self._lock:
+                service = self._services.get(key)
+                if service is None:
+                    from googleapiclient.discovery import build
+                    service = build(api, version, http=self.http(), requestBuilder=self._build_request,
+                                    static_discovery=True, cache_discovery=False)
+                    self._services[key] = service
+        return service
+
+    # --- credential refresh ------------------------------------------------
+
+    def seconds_until_refresh(self):
+        """Seconds until the credentials should be renewed (None: they never expire or cannot be refreshed)."""
+        creds = self.creds
+        if creds is None or not getattr(creds, "refresh_token", None) or creds.expiry is None:
+            return None
+        expiry = creds.expiry
+        now = datetime.datetime.now(datetime.timezone.utc)
+        if expiry.tzinfo is None:  # google-auth keeps naive UTC expiry times
+            now = now.replace(tzinfo=None)
+        return (expiry - now).total_seconds() - self.refresh_margin
+
+    def refresh(self):
+        """Renew the access token now (one refresh at a time)."""
+        from google.auth.transport.requests import Request
+
+        with self._refresh_lock:
+            creds = self.creds
+            try:
+                with metrics.google_api_call("oauth", "token.refresh"):
+                    creds.refresh(Request())
+            except Exception:
+                metrics.GOOGLE_TOKEN_REFRESHES.inc(outcome="error")
+                raise
+            metrics.GOOGLE_TOKEN_REFRESHES.inc(outcome="ok")
+            if self.on_refresh:
+                self.on_refresh(creds)
+
+    def _refresh_loop(self):
+        failures = 0
+        while not self._closed:
+            self._wake.clear()
+            delay = self.seconds_until_refresh()
+            if delay is None:
+                self._wake.wait()  # Nothing to refresh until credentials are replaced
+            elif delay > 0:
+                self._wake.wait(delay)
+            else:
+                try:
+                    self.refresh()
+                    failures = 0
+                except Exception as e:
+                    failures += 1
+                    print(f"Google token refresh failed (attempt {failures}): {e}")
+                    self._wake.wait(min(300, 5 * 2 ** failures))
+
+    def start_refresher(self):
+        """Start the background refresher thread (idempotent)."""
+        with self._lock:
+            if not self._closed and (self._refresher is None or not self._refresher.is_alive()):
+                self._refresher = threading.Thread(target=self._refresh_loop, name="google-token-refresh", daemon=True)
+                self._refresher.start()
+
+    def close(self):
+        self._closed = True
+        self._wake.set()
+        if self._refresher is not None:
+            self._refresher.join(timeout=5)
+            self._refresher = None
@@ -0,0 +1,190 @@
+import asyncio
+import itertools
+import os
+import time
+import uuid
+from collections import OrderedDict
+
+FINISHED_STATES = ("done", "failed", "cancelled")
+
+
+class QueueFullError(RuntimeError):
+    pass
+
+
+class Job:
+    """A unit of background work plus the status visible to /jobs/{id}."""
+
+    def __init__(self, kind, priority=0, meta=None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.priority = priority
+        self.meta = meta or {}
+        self.status = "queued"
+        self.phase = "queued"
+        self.progress = {}
+        self.partial = ""
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.version = 0
+        self._changed = asyncio.Condition()
+        self._work = None
+
+    @property
+    def finished(self):
+        return self.status in FINISHED_STATES
+
+    async def update(self, **fields):
+        """Update status fields and wake every watcher."""
+        for key, value in fields.items():
+            setattr(self, key, value)
+        self.version += 1
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def wait_changed(self, seen_version):
+        async with self._changed:
+            await self._changed.wait_for(lambda: self.version != seen_version)
+
+    def snapshot(self):
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "priority": self.priority,
+            "status": self.status,
+            "phase": self.phase,
+            "progress": self.progress,
+            "partial": self.partial if not self.finished else "",
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobQueue:
+    """
+    Bounded priority queue served by a fixed pool of asyncio workers.
+    Jobs run independently of the HTTP request that submitted them, so a
+    client disconnect does not cancel the work; throughput is set by
+    SCRIBE_JOB_WORKERS rather than by the number of open sockets.
+    Higher `priority` runs first; equal priorities run FIFO.
+    """
+
+    def __init__(self, workers=None, max_queued=None, max_retained=None):
+        self.workers = workers or int(os.getenv("SCRIBE_JOB_WORKERS", "2"))
+        self.max_queued = max_queued or int(os.getenv("SCRIBE_JOB_QUEUE_MAX", "100"))
+        self.max_retained = max_retained or int(os.getenv("SCRIBE_JOB_RETAIN", "500"))
+        self.jobs = OrderedDict()  # job_id -> Job, oldest first
+        self._queue = None
+        self._seq = itertools.count()
+        self._tasks = []
+
+    def start(self):
+        """Spawn the worker pool on the running event loop."""
+        if self._tasks:
+            return
+        self._queue = asyncio.PriorityQueue()
+        self._tasks = [asyncio.create_task(self._worker(n)) for n in range(self.workers)]
+        print(f"Job queue started with {self.workers} workers")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        # Jobs that never started still own resources (e.g. detached upload files)
+        for job in self.jobs.values():
+            self._cleanup(job)
+
+    def queued_count(self):
+        return sum(1 for job in self.jobs.values() if job.status == "queued")
+
+    def running_count(self):
+        return sum(1 for job in self.jobs.values() if job.status == "running")
+
+    def submit(self, kind, work, priority=0, meta=None, cleanup=None):
+        """
+        Queue `work(job)` (an async function) and return the Job immediately.
+        `cleanup()` runs after the job finishes, whatever the outcome.
+        """
+        if self._queue is None:
+            raise RuntimeError("Job queue is not running")
+        if self.queued_count() >= self.max_queued:
+            raise QueueFullError("Too many queued jobs; try again later")
+
+        job = Job(kind, priority=priority, meta=meta)
+        job._work = (work, cleanup)
+        self.jobs[job.id] = job
+        self._trim()
+        self._queue.put_nowait((-priority, next(self._seq), job))
+        print(f"Job {job.id} ({kind}) queued, priority {priority}")
+        return job
+
+    def get(self, job_id):
+        return self.jobs.get(job_id)
+
+    async def cancel(self, job_id):
+        job = self.jobs.get(job_id)
+        if job and job.status == "queued":
+            await job.update(status="cancelled", phase="cancelled", finished_at=time.time())
+            self._cleanup(job)
+            return True
+        return False
+
+    async def watch(self, job):
+        """Yield a snapshot on every change until the job finishes."""
+        seen = -1
+        while True:
+            if job.version != seen:
+                seen = job.version
+                yield job.snapshot()
+            if job.finished:
+                return
+            await job.wait_changed(seen)
+
+    @staticmethod
+    def _cleanup(job):
+        """Run the job's cleanup() once and drop its work."""
+        if job._work is None:
+            return
+        _, cleanup = job._work
+        job._work = None
+        if cleanup:
+            try:
+                cleanup()
+            except Exception as e:
+                print(f"Job {job.id} cleanup failed: {e}")
+
+    def _trim(self):
+        # Forget the oldest finished jobs beyond the retention limit
+        excess = len(self.jobs) - self.max_retained
+        for job_id in [jid for jid, job in self.jobs.items() if job.finished][:max(0, excess)]:
+            del self.jobs[job_id]
+
+    async def _worker(self, n):
+        while True:
+            _, _, job = await self._queue.get()
+            try:
+                if job.status != "queued":
+                    continue
+                work, _ = job._work
+                await job.update(status="running", phase="running", started_at=time.time())
+                try:
+                    result = await work(job)
+                    if isinstance(result, dict) and result.get("error"):
+                        await job.update(status="failed", phase="failed", error=result["error"],
+                                         result=result, finished_at=time.time())
+                    else:
+                        await job.update(status="done", phase="done", result=result, finished_at=time.time())
+                except Exception as e:
+                    print(f"Job {job.id} failed: {e}")
+                    await job.update(status="failed", phase="failed", error=str(e), finished_at=time.time())
+                finally:
+                    self._cleanup(job)
+            finally:
+                self._queue.task_done()
@@ -0,0 +1,333 @@
+import bisect
+import contextvars
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+# Default latency buckets (seconds): sub-second HTTP through multi-minute audio analysis
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+# Route template of the request being served ("/summarize", "/jobs/{job_id}", ...),
+# used to attribute Gemini tokens and cost to the endpoint that caused them
+current_endpoint = contextvars.ContextVar("current_endpoint", default="none")
+
+
+def _escape(value):
+    """Escape a label value: backslash, double quote and line feed."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _escape_help(text):
+    """HELP text escapes only backslash and line feed."""
+    return str(text).replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_bound(bound):
+    # Canonical float form (le="1.0", not le="1"), as the client libraries write it
+    return "+Inf" if bound == math.inf else repr(float(bound))
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=(), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+        (registry if registry is not None else REGISTRY).register(self)
+
+    def labels(self, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            child = self._children.get(key)
+            if child is None:
+                child = self._children[key] = self._new_child()
+            return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _samples(self):
+        raise NotImplementedError
+
+    def render(self):
+        lines = [f"# HELP {self.name} {_escape_help(self.documentation)}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class _Value:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount=1):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value):
+        with self._lock:
+            self.value = value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount=1, **labels):
+        self.labels(**labels).inc(amount)
+
+    def _samples(self):
+        with self._lock:
+            items = list(self._children.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}" for key, child in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        self.labels(**labels).set(value)
+
+    @contextmanager
+    def track_inprogress(self, **labels):
+        child = self.labels(**labels)
+        child.inc()
+        try:
+            yield
+        finally:
+            child.dec()
+
+
+class _HistogramValue:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            if index < len(self.counts):
+                self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS, registry=None):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value, **labels):
+        self.labels(**labels).observe(value)
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.labels(**labels).observe(time.perf_counter() - start)
+
+    def _samples(self):
+        with self._lock:
+            items = list(self._children.items())
+        lines = []
+        for key, child in items:
+            with child._lock:
+                counts, total, count = list(child.counts), child.sum, child.count
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, key, [("le", _format_bound(bound))])
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key, [("le", "+Inf")])
+            lines.append(f"{self.name}_bucket{labels} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class Registry:
+    """
+    Metric collection rendered for /metrics. A small in-process
+    implementation of the Prometheus text format, kept dependency-free like
+    the rest of the server's startup path.
+    """
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        if any(m.name == metric.name for m in self._metrics):
+            raise ValueError(f"Duplicate metric name: {metric.name}")
+        self._metrics.append(metric)
+
+    def render(self):
+        """Text exposition format (Prometheus 0.0.4)."""
+        return "\n".join(metric.render() for metric in self._metrics) + "\n"
+
+
+REGISTRY = Registry()
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+HTTP_REQUESTS = Counter(
+    "scribe_http_requests_total", "HTTP requests handled.", ["method", "endpoint", "status"])
+HTTP_LATENCY = Histogram(
+    "scribe_http_request_duration_seconds", "HTTP request latency, including streamed bodies.", ["method", "endpoint"])
+HTTP_IN_FLIGHT = Gauge(
+    "scribe_http_requests_in_flight", "HTTP requests currently being served.", ["endpoint"])
+
+GEMINI_LATENCY = Histogram(
+    "scribe_gemini_call_duration_seconds", "Gemini API call latency.", ["model", "operation"])
+GEMINI_IN_FLIGHT = Gauge(
+    "scribe_gemini_calls_in_flight", "Gemini API calls currently running.", ["operation"])
+GEMINI_ERRORS = Counter(
+    "scribe_gemini_errors_total", "Gemini API calls that raised.", ["model", "operation"])
+GEMINI_TOKENS = Counter(
+    "scribe_gemini_tokens_total", "Gemini tokens billed.", ["model", "endpoint", "direction"])
+GEMINI_COST = Counter(
+    "scribe_gemini_cost_usd_total", "Estimated Gemini cost in USD.", ["model", "endpoint"])
+GEMINI_CACHE_HITS = Counter(
+    "scribe_gemini_cache_hits_total", "Generations served from the response cache.", ["endpoint"])
+GEMINI_THROTTLES = Counter(
+    "scribe_gemini_throttles_total", "Gemini calls rejected with 429/503 (rate limited or overloaded).", ["model", "operation"])
+GEMINI_RETRIES = Counter(
+    "scribe_gemini_retries_total", "Gemini calls retried after a transient error.", ["model", "operation"])
+GEMINI_CONCURRENCY_LIMIT = Gauge(
+    "scribe_gemini_concurrency_limit", "Current adaptive limit on concurrent Gemini calls.", ["model"])
+GEMINI_LIMITER_WAIT = Histogram(
+    "scribe_gemini_limiter_wait_seconds", "Time spent waiting for rate limiter capacity.", ["model", "operation"])
+SUMMARY_COALESCED = Counter(
+    "scribe_summary_coalesced_total", "Summarize requests served by an in-flight or follow-up call.", ["outcome"])
+UPLOAD_BYTES = Counter(
+    "scribe_audio_upload_bytes_total", "Audio bytes sent to (or saved from) the Gemini Files API.", ["reused"])
+PREPROCESS_SAVED = Counter(
+    "scribe_audio_preprocess_saved_total", "Bytes and seconds of audio removed by preprocessing before upload.", ["unit"])
+
+CONTACTS_INDEXED = Gauge(
+    "scribe_contacts_indexed", "Contacts in the local autocomplete directory.")
+GOOGLE_API_LATENCY = Histogram(
+    "scribe_google_api_duration_seconds", "Google Calendar/Drive/People API call latency.", ["api", "operation"])
+GOOGLE_API_ERRORS = Counter(
+    "scribe_google_api_errors_total", "Google API calls that raised.", ["api", "operation"])
+MINUTES_SAVE_RETRIES = Counter(
+    "scribe_minutes_save_retries_total", "Retried Google calls in background /save_minutes jobs.", ["step"])
+GOOGLE_TOKEN_REFRESHES = Counter(
+    "scribe_google_token_refreshes_total", "Background OAuth access token refreshes.", ["outcome"])
+
+
+@contextmanager
+def _timed(histogram, errors, gauge, labels, gauge_labels):
+    start = time.perf_counter()
+    if gauge:
+        gauge.labels(**gauge_labels).inc()
+    try:
+        yield
+    except Exception:
+        errors.inc(**labels)
+        raise
+    finally:
+        histogram.observe(time.perf_counter() - start, **labels)
+        if gauge:
+            gauge.labels(**gauge_labels).dec()
+
+
+def gemini_call(model, operation):
+    """Time one Gemini API call: `with gemini_call(model, "generate"): ...`"""
+    return _timed(GEMINI_LATENCY, GEMINI_ERRORS, GEMINI_IN_FLIGHT,
+                  {"model": model, "operation": operation}, {"operation": operation})
+
+
+def google_api_call(api, operation):
+    """Time one Google API call: `with google_api_call("drive", "files.create"): ...`"""
+    return _timed(GOOGLE_API_LATENCY, GOOGLE_API_ERRORS, None, {"api": api, "operation": operation}, {})
+
+
+def record_usage(model, input_tokens, output_tokens, cost):
+    endpoint = current_endpoint.get()
+    GEMINI_TOKENS.inc(input_tokens, model=model, endpoint=endpoint, direction="input")
+    GEMINI_TOKENS.inc(output_tokens, model=model, endpoint=endpoint, direction="output")
+    GEMINI_COST.inc(cost, model=model, endpoint=endpoint)
+
+
+def record_cache_hit():
+    GEMINI_CACHE_HITS.inc(endpoint=current_endpoint.get())
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording per-endpoint request counts, latency and in-flight
+    requests. Endpoints are labelled by route template so path parameters do not
+    explode label cardinality; unmatched paths are grouped as "unmatched".
+    """
+
+    def __init__(self, app, routes_app=None):
+        self.app = app
+        self.routes_app = routes_app
+
+    def _endpoint(self, scope):
+        from starlette.routing import Match
+        routes = getattr(self.routes_app, "routes", [])
+        for route in routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return getattr(route, "path", "unmatched")
+        return "unmatched"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        endpoint = self._endpoint(scope)
+        method = scope.get("method", "GET")
+        status = {"code": 500}
+        token = current_endpoint.set(endpoint)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        HTTP_IN_FLIGHT.labels(endpoint=endpoint).inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.labels(endpoint=endpoint).dec()
+            HTTP_LATENCY.observe(time.perf_counter() - start, method=method, endpoint=endpoint)
+            HTTP_REQUESTS.inc(method=method, endpoint=endpoint, status=status["code"])
+            current_endpoint.reset(token)
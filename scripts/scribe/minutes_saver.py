@@ -0,0 +1,85 @@
+import asyncio
+import datetime
+import os
+
+import metrics
+from rate_limiter import is_retryable
+
+
+def minutes_filename(meeting_title, now=None):
+    """Drive file name, timestamped to avoid duplicates: "[회의록] 2026-03-02 주간회의 (14-30)"."""
+    now = now or datetime.datetime.now()
+    return f"[회의록] {now.strftime('%Y-%m-%d')} {meeting_title} ({now.strftime('%H-%M')})"
+
+
+class MinutesSaver:
+    """
+    Job body for /save_minutes: uploads the minutes to Drive and attaches
+    them to the selected Calendar event, reporting each step through the
+    job's phase/progress. The event GET runs alongside the upload, so an
+    attached save costs one upload plus one PATCH of wall time. Transient
+    Google errors are retried with exponential backoff
+    (SCRIBE_SAVE_MAX_ATTEMPTS, SCRIBE_SAVE_BACKOFF_SECONDS).
+    """
+
+    def __init__(self, calendar_service, max_attempts=None, backoff_base=None, backoff_max=30.0):
+        self.calendar_service = calendar_service
+        self.max_attempts = max_attempts or int(os.getenv("SCRIBE_SAVE_MAX_ATTEMPTS", "4"))
+        self.backoff_base = backoff_base if backoff_base is not None else float(
+            os.getenv("SCRIBE_SAVE_BACKOFF_SECONDS", "2"))
+        self.backoff_max = backoff_max
+
+    async def _retrying(self, job, step, fn, *args, **kwargs):
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return await asyncio.to_thread(fn, *args, **kwargs)
+            except Exception as e:
+                if attempt >= self.max_attempts or not is_retryable(e):
+                    raise
+                delay = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+                metrics.MINUTES_SAVE_RETRIES.inc(step=step)
+                print(f"Save job {job.id}: {step} failed ({e}); retry {attempt}/{self.max_attempts - 1} in {delay:.1f}s")
+                await job.update(progress=dict(job.progress, attempt=attempt + 1, last_error=str(e)))
+                await asyncio.sleep(delay)
+
+    async def run(self, job, text, filename, event_id=None):
+        loop = asyncio.get_running_loop()
+
+        def on_progress(sent, total):
+            # Called from the upload thread, once per chunk
+            asyncio.run_coroutine_threadsafe(
+                job.update(progress=dict(job.progress, bytes=sent, total=total)), loop)
+
+        event_task = None
+        if event_id:
+            # The GET does not depend on the upload; failures fall back to a GET inside attach
+            event_task = asyncio.create_task(self._retrying(job, "events.get", self.calendar_service.get_event, event_id))
+
+        await job.update(phase="uploading", progress={"bytes": 0, "total": len(text.encode("utf-8"))})
+        try:
+            file_id, web_link = await self._retrying(
+                job, "files.create", self.calendar_service.upload_to_drive, filename, text, progress=on_progress)
+        except Exception as e:
+            if event_task:
+                event_task.cancel()
+            print(f"Drive upload failed: {e}")
+            return {"error": f"Google Drive 업로드 실패: {e}"}
+
+        result = {"status": "success", "message": f"회의록이 저장되었습니다. (Drive)\n링크: {web_link}",
+                  "link": web_link, "file_id": file_id}
+        if event_id:
+            await job.update(phase="attaching")
+            try:
+                event = await event_task
+            except Exception as e:
+                print(f"Save job {job.id}: event prefetch failed ({e}); fetching again while attaching")
+                event = None
+            success, msg = await asyncio.to_thread(
+                self.calendar_service.attach_to_calendar_event, event_id, file_id, web_link, filename, event=event)
+            if success:
+                result["message"] += "\n\n캘린더 일정에도 첨부되었습니다! 📅"
+            else:
+                result["message"] += f"\n\n캘린더 첨부 실패: {msg}"
+        return result
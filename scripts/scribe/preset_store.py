@@ -0,0 +1,162 @@
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+
+
+class PresetStore:
+    """
+    Attendee presets ({name: [participants]}) backed by a JSON file.
+
+    Reads are served from memory and re-loaded only when the file's
+    (mtime, size, inode) changes, so page renders do no file I/O. Writes
+    re-read, modify and replace the file atomically (temp file + fsync +
+    rename) under a thread lock and, where available, an flock on a sidecar
+    lock file so concurrent saves from other workers are not lost either.
+    A name index (by first character) and a participant index keep title
+    matching and lookups cheap with hundreds of presets.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.getenv("SCRIBE_PRESETS_PATH", "attendee_presets.json")
+        self._lock = threading.Lock()
+        self._signature = None
+        self._presets = {}
+        self._json = "{}"
+        self._by_initial = {}  # first character (lowercased) -> [preset names]
+        self._by_participant = {}  # participant (lowercased) -> {preset names}
+
+    # --- loading -----------------------------------------------------------
+
+    def _stat_signature(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def _refresh_locked(self):
+        signature = self._stat_signature()
+        if signature == self._signature:
+            return
+        presets = {}
+        if signature is not None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    presets = json.load(f)
+                if not isinstance(presets, dict):
+                    raise ValueError("presets file must contain a JSON object")
+            except (OSError, ValueError) as e:
+                # Keep serving the last good copy; a later save rewrites the file
+                print(f"Error loading presets: {e}")
+                return
+        self._install(presets, signature)
+
+    def _install(self, presets, signature):
+        self._presets = presets
+        self._signature = signature
+        self._json = json.dumps(presets, ensure_ascii=False)
+        by_initial = {}
+        by_participant = {}
+        for name, participants in presets.items():
+            if name:
+                by_initial.setdefault(name[0].lower(), []).append(name)
+            for participant in participants or []:
+                by_participant.setdefault(str(participant).lower(), set()).add(name)
+        self._by_initial = by_initial
+        self._by_participant = by_participant
+
+    def _snapshot(self):
+        with self._lock:
+            self._refresh_locked()
+            return self._presets, self._json, self._by_initial, self._by_participant
+
+    # --- reads -------------------------------------------------------------
+
+    def all(self):
+        return dict(self._snapshot()[0])
+
+    def as_json(self):
+        """Serialized presets for embedding in the page (cached between changes)."""
+        return self._snapshot()[1]
+
+    def get(self, name):
+        participants = self._snapshot()[0].get(name)
+        return list(participants) if participants is not None else None
+
+    def __len__(self):
+        return len(self._snapshot()[0])
+
+    def match_title(self, title):
+        """Names of presets contained in a meeting title (case-insensitive)."""
+        presets, _, by_initial, _ = self._snapshot()
+        lowered = (title or "").lower()
+        matches = []
+        for position, char in enumerate(lowered):
+            for name in by_initial.get(char, ()):
+                if name not in matches and lowered.startswith(name.lower(), position):
+                    matches.append(name)
+        return matches
+
+    def with_participant(self, participant):
+        """Names of presets that include a participant (case-insensitive)."""
+        return sorted(self._snapshot()[3].get((participant or "").lower(), ()))
+
+    # --- writes ------------------------------------------------------------
+
+    @contextmanager
+    def _file_lock(self):
+        try:
+            import fcntl
+        except ImportError:  # Windows: the thread lock still serializes this process
+            yield
+            return
+        with open(self.path + ".lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _write_locked(self, presets):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".presets.", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(presets, f, ensure_ascii=False, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        self._install(presets, self._stat_signature())
+
+    def _update(self, mutate):
+        with self._lock, self._file_lock():
+            self._signature = None  # Force a re-read: another worker may have written
+            self._refresh_locked()
+            presets = dict(self._presets)
+            mutate(presets)
+            self._write_locked(presets)
+            return dict(presets)
+
+    def save(self, name, participants):
+        """Create or replace a preset. Returns all presets."""
+        name = (name or "").strip()
+        cleaned = []
+        for participant in participants or []:
+            participant = str(participant).strip()
+            if participant and participant not in cleaned:
+                cleaned.append(participant)
+        if not name or not cleaned:
+            raise ValueError("Invalid data")
+        return self._update(lambda presets: presets.__setitem__(name, cleaned))
+
+    def delete(self, name):
+        """Remove a preset if present. Returns all presets."""
+        return self._update(lambda presets: presets.pop(name, None))
@@ -0,0 +1,242 @@
+import asyncio
+import os
+import random
+import re
+import threading
+import time
+
+import metrics
+
+# HTTP codes / API statuses worth retrying; 429 and 503 also count as throttling
+RETRYABLE_CODES = {429, 500, 502, 503, 504}
+THROTTLE_CODES = {429, 503}
+RETRYABLE_STATUSES = {"RESOURCE_EXHAUSTED", "UNAVAILABLE", "INTERNAL", "DEADLINE_EXCEEDED"}
+
+_RETRY_DELAY_RE = re.compile(r"retry(?:Delay| in|[- ]after)['\":= ]*([0-9.]+)\s*s", re.IGNORECASE)
+
+
+class RateLimitTimeout(RuntimeError):
+    """Raised when a call could not get a slot within GEMINI_LIMITER_MAX_WAIT_SECONDS."""
+
+
+class TokenBucket:
+    """
+    Classic token bucket refilled continuously at `per_minute / 60` per second.
+    A non-positive rate disables the bucket. The balance may go negative when
+    actual usage is reconciled after a call (debt is paid back by the refill).
+    """
+
+    def __init__(self, per_minute, capacity=None):
+        self.rate = per_minute / 60.0
+        self.capacity = float(capacity if capacity is not None else per_minute)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    @property
+    def enabled(self):
+        return self.rate > 0
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount, now):
+        """Seconds until `amount` tokens are available (0 if they are now)."""
+        if not self.enabled:
+            return 0.0
+        self._refill(now)
+        amount = min(amount, self.capacity)  # Oversized requests wait for a full bucket, not forever
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def take(self, amount, now):
+        if self.enabled:
+            self._refill(now)
+            self.tokens -= min(amount, self.capacity)
+
+    def adjust(self, amount):
+        """Charge (or refund, if negative) tokens after the fact."""
+        if self.enabled:
+            self.tokens = min(self.capacity, self.tokens - amount)
+
+
+def retry_after(exc):
+    """Server-suggested delay in seconds from a Gemini/HTTP error, or None."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers:
+        value = headers.get("retry-after") or headers.get("Retry-After")
+        try:
+            return float(value) if value is not None else None
+        except ValueError:
+            pass
+    match = _RETRY_DELAY_RE.search(str(getattr(exc, "details", "") or exc))
+    return float(match.group(1)) if match else None
+
+
+def error_code(exc):
+    code = getattr(exc, "code", None)
+    if isinstance(code, int):
+        return code
+    status = getattr(exc, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_retryable(exc):
+    if isinstance(exc, (ConnectionError, TimeoutError, asyncio.TimeoutError)):
+        return True
+    return error_code(exc) in RETRYABLE_CODES or getattr(exc, "status", None) in RETRYABLE_STATUSES
+
+
+def is_throttle(exc):
+    return error_code(exc) in THROTTLE_CODES or getattr(exc, "status", None) == "RESOURCE_EXHAUSTED"
+
+
+class RateLimiter:
+    """
+    Client-side limiter shared by every Summarizer on one API key.
+
+    - RPM/TPM token buckets (GEMINI_RPM / GEMINI_TPM, 0 = unlimited) pace
+      bursts instead of letting them fail; token cost is estimated up front
+      and reconciled with the billed usage afterwards.
+    - Concurrency is adaptive (AIMD): halved on a 429/503, grown back by about
+      one slot per limit's worth of successful calls, within
+      GEMINI_MIN_CONCURRENCY..GEMINI_MAX_CONCURRENCY.
+    - Retryable errors are retried up to GEMINI_MAX_RETRIES times with full
+      jitter exponential backoff; a server retry hint is honored and pauses
+      all callers, not just the one that was throttled.
+
+    State is guarded by a threading lock so callers on different event
+    loops (e.g. a script next to the server) share the same quota.
+    """
+
+    POLL_SECONDS = 0.05
+
+    def __init__(self, model_name="gemini", rpm=None, tpm=None, max_concurrency=None, min_concurrency=None,
+                 max_retries=None, backoff_base=None, backoff_max=None, max_wait=None):
+        self.model_name = model_name
+        rpm = rpm if rpm is not None else float(os.getenv("GEMINI_RPM", "0"))
+        tpm = tpm if tpm is not None else float(os.getenv("GEMINI_TPM", "0"))
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.max_concurrency = max_concurrency or int(os.getenv("GEMINI_MAX_CONCURRENCY", "16"))
+        self.min_concurrency = min_concurrency or int(os.getenv("GEMINI_MIN_CONCURRENCY", "1"))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("GEMINI_MAX_RETRIES", "4"))
+        self.backoff_base = backoff_base if backoff_base is not None else float(os.getenv("GEMINI_BACKOFF_BASE_SECONDS", "1"))
+        self.backoff_max = backoff_max if backoff_max is not None else float(os.getenv("GEMINI_BACKOFF_MAX_SECONDS", "30"))
+        self.max_wait = max_wait if max_wait is not None else float(os.getenv("GEMINI_LIMITER_MAX_WAIT_SECONDS", "120"))
+
+        self.limit = float(self.max_concurrency)
+        self.active = 0
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+        self.throttles = 0
+        self.retries = 0
+        metrics.GEMINI_CONCURRENCY_LIMIT.set(self.limit, model=self.model_name)
+
+    # --- admission ---------------------------------------------------------
+
+    def _try_acquire(self, cost):
+        """Reserve a slot and budget now; returns 0 on success or seconds to wait."""
+        now = time.monotonic()
+        with self._lock:
+            if now < self.paused_until:
+                return self.paused_until - now
+            if self.active >= max(1, int(self.limit)):
+                return self.POLL_SECONDS
+            wait = max(self.requests.wait_time(1, now), self.tokens.wait_time(cost, now))
+            if wait > 0:
+                return wait
+            self.requests.take(1, now)
+            self.tokens.take(cost, now)
+            self.active += 1
+            return 0.0
+
+    def _check_deadline(self, started, operation):
+        if time.monotonic() - started > self.max_wait:
+            raise RateLimitTimeout(f"Gemini {operation} waited over {self.max_wait:.0f}s for rate limit capacity")
+
+    async def acquire(self, cost=0, operation="generate"):
+        started = time.monotonic()
+        while True:
+            wait = self._try_acquire(cost)
+            if not wait:
+                break
+            self._check_deadline(started, operation)
+            await asyncio.sleep(min(wait, 1.0))
+        self._observe_wait(started, operation)
+
+    def _observe_wait(self, started, operation):
+        metrics.GEMINI_LIMITER_WAIT.observe(time.monotonic() - started, model=self.model_name, operation=operation)
+
+    def release(self, cost=0, used_tokens=None, exc=None):
+        """Free the slot; reconcile token usage and adapt concurrency to the outcome."""
+        with self._lock:
+            self.active -= 1
+            if used_tokens is not None:
+                self.tokens.adjust(used_tokens - cost)
+            if exc is not None and is_throttle(exc):
+                self.limit = max(float(self.min_concurrency), self.limit / 2)
+            elif exc is None:
+                self.limit = min(float(self.max_concurrency), self.limit + 1 / max(1.0, self.limit))
+            limit = self.limit
+        metrics.GEMINI_CONCURRENCY_LIMIT.set(limit, model=self.model_name)
+
+    # --- retry -------------------------------------------------------------
+
+    def backoff(self, attempt, exc, operation="generate"):
+        """
+        Delay before retry number `attempt` (1-based), or None to give up.
+        Throttles with a retry hint pause every caller until the hint expires.
+        """
+        if attempt > self.max_retries or not is_retryable(exc):
+            return None
+        hint = retry_after(exc)
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+        if hint is not None:
+            delay = max(delay, min(hint, self.backoff_max))
+        with self._lock:
+            self.retries += 1
+            if is_throttle(exc):
+                self.throttles += 1
+                if hint is not None:
+                    self.paused_until = max(self.paused_until, time.monotonic() + delay)
+        if is_throttle(exc):
+            metrics.GEMINI_THROTTLES.inc(model=self.model_name, operation=operation)
+        metrics.GEMINI_RETRIES.inc(model=self.model_name, operation=operation)
+        print(f"Gemini {operation} failed ({exc}); retry {attempt}/{self.max_retries} in {delay:.1f}s")
+        return delay
+
+    async def call(self, fn, operation="generate", cost=0, tokens_used=None):
+        """
+        Run `await fn()` under the limiter, retrying transient failures.
+        `cost` is the estimated token count; `tokens_used(result)` returns the
+        billed total for reconciliation.
+        """
+        attempt = 0
+        while True:
+            await self.acquire(cost, operation)
+            try:
+                with metrics.gemini_call(self.model_name, operation):
+                    result = await fn()
+            except Exception as e:
+                self.release(cost, exc=e)
+                attempt += 1
+                delay = self.backoff(attempt, e, operation)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            self.release(cost, tokens_used(result) if tokens_used else None)
+            return result
+
+    def stats(self):
+        with self._lock:
+            return {
+                "concurrency_limit": round(self.limit, 2),
+                "active": self.active,
+                "throttles": self.throttles,
+                "retries": self.retries,
+                "paused_for_seconds": round(max(0.0, self.paused_until - time.monotonic()), 2),
+            }
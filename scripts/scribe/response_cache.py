@@ -0,0 +1,181 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ResponseCache:
+    """
+    Content-addressed cache of Gemini text responses.
+    Keys are SHA-256 of (model, fully built prompt). An in-memory LRU tier is
+    always used; an on-disk tier is added when `disk_dir` is set, with TTL and
+    total-size eviction (oldest files first). The disk tier's sizes are
+    tracked in memory (one directory scan at first use) and files are written
+    on a background thread, so put() never blocks the event loop on disk I/O.
+    """
+
+    def __init__(self, max_entries=None, ttl=None, disk_dir=None, disk_max_mb=None):
+        self.max_entries = max_entries if max_entries is not None else int(os.getenv("SUMMARY_CACHE_SIZE", "256"))
+        self.ttl = ttl if ttl is not None else float(os.getenv("SUMMARY_CACHE_TTL_SECONDS", "86400"))
+        self.disk_dir = disk_dir if disk_dir is not None else os.getenv("SUMMARY_CACHE_DIR", "")
+        self.disk_max_bytes = int(float(disk_max_mb or os.getenv("SUMMARY_CACHE_DISK_MB", "100")) * 1024 * 1024)
+
+        self._memory = OrderedDict()  # key -> (created_at, text)
+        self._lock = threading.Lock()
+        self._disk_index = None  # key -> (created_at, size), oldest first; loaded on first disk access
+        self._disk_bytes = 0
+        self._disk_lock = threading.Lock()
+        self._writer = None
+        self.hits = 0
+        self.misses = 0
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0
+
+    @staticmethod
+    def make_key(model_name, contents):
+        digest = hashlib.sha256()
+        digest.update(model_name.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(contents.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _expired(self, created_at):
+        return self.ttl > 0 and time.time() - created_at > self.ttl
+
+    def get(self, key):
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if not self._expired(entry[0]):
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._memory[key]
+
+        entry = self._disk_get(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            # Promote disk hits into the memory tier
+            self._memory_put(key, entry)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, text):
+        if not self.enabled or not text:
+            return
+        entry = (time.time(), text)
+        with self._lock:
+            self._memory_put(key, entry)
+        if self.disk_dir:
+            if self._writer is None:
+                with self._lock:
+                    if self._writer is None:
+                        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="response-cache")
+            self._writer.submit(self._disk_put, key, entry)
+
+    def flush(self):
+        """Wait until every queued disk write has landed."""
+        if self._writer is not None:
+            self._writer.submit(lambda: None).result()
+
+    def _memory_put(self, key, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _load_disk_index(self):
+        """Index the files already on disk (once; callers hold _disk_lock)."""
+        if self._disk_index is not None:
+            return
+        files = []
+        for name in os.listdir(self.disk_dir):
+            if not name.endswith(".json"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.disk_dir, name))
+            except OSError:
+                continue
+            files.append((stat.st_mtime, name[:-len(".json")], stat.st_size))
+        files.sort()
+        self._disk_index = OrderedDict((key, (mtime, size)) for mtime, key, size in files)
+        self._disk_bytes = sum(size for _, _, size in files)
+
+    def _disk_forget(self, key):
+        """Remove a file and its index entry (callers hold _disk_lock)."""
+        entry = self._disk_index.pop(key, None)
+        if entry:
+            self._disk_bytes -= entry[1]
+        try:
+            os.remove(self._disk_path(key))
+        except OSError:
+            pass
+
+    def _disk_get(self, key):
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if self._expired(data.get("created_at", 0)):
+            with self._disk_lock:
+                self._load_disk_index()
+                self._disk_forget(key)
+            return None
+        return data["created_at"], data["text"]
+
+    def _disk_put(self, key, entry):
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"created_at": entry[0], "text": entry[1]}, f, ensure_ascii=False)
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Response cache write failed: {e}")
+            return
+        with self._disk_lock:
+            self._load_disk_index()
+            previous = self._disk_index.pop(key, None)
+            if previous:
+                self._disk_bytes -= previous[1]
+            self._disk_index[key] = (entry[0], size)
+            self._disk_bytes += size
+            self._disk_evict()
+
+    def _disk_evict(self):
+        """Drop expired files, then the oldest ones until under disk_max_bytes (callers hold _disk_lock)."""
+        for key, (created_at, _) in list(self._disk_index.items()):
+            if not self._expired(created_at):
+                break  # Index is oldest-first
+            self._disk_forget(key)
+        while self._disk_index and self._disk_bytes > self.disk_max_bytes:
+            self._disk_forget(next(iter(self._disk_index)))
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._memory), "hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        """Finish queued disk writes and stop the writer thread."""
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+            self._writer = None
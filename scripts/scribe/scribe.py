@@ -1,83 +1,290 @@
-from fastapi import FastAPI, Request, UploadFile, File, Form
+import time
+_import_started = time.perf_counter()
+
+from fastapi import FastAPI, Request, UploadFile, File, Form, WebSocket, WebSocketDisconnect
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse
-from fastapi.staticfiles import StaticFiles
-import uvicorn
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse, Response
+from starlette.concurrency import run_in_threadpool
+from typing import Any
 from pydantic import BaseModel
 import os
 import json
-import shutil
-from summarizer import Summarizer
-from auth_calendar import CalendarService
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from session_registry import SessionRegistry, DEFAULT_SESSION_ID
+from session_store import SessionStore, CLIENT_EVENT_KINDS
+from audio_ingest import ingest_upload, detach_audio, AudioTooLargeError, UploadLimitMiddleware
+from transcriber import WhisperPool
+from chunk_ingest import ChunkStore
+from job_queue import JobQueue, QueueFullError
+from preset_store import PresetStore
+from contact_directory import ContactDirectory
+from minutes_saver import MinutesSaver, minutes_filename
+import metrics
+import fake_backend
 from dotenv import load_dotenv
-import sys
-
 
+# Heavy modules (google.genai, googleapiclient, oauth, numpy, uvicorn) are
+# imported on first use so the server can bind its port quickly.
 
 load_dotenv()
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app):
+    if os.getenv("WHISPER_PRELOAD", "0") == "1":
+        # Opt-in; load in the background so the server binds its port immediately
+        whisper_pool.preload_in_background()
+    warmup_task = None
+    if os.getenv("SCRIBE_WARMUP", "1") == "1":
+        warmup_task = asyncio.create_task(warm_up())
+    job_queue.start()
+    save_queue.start()
+    yield
+    if warmup_task and not warmup_task.done():
+        warmup_task.cancel()
+    await job_queue.stop()
+    await save_queue.stop()
+    if _contact_directory:
+        await _contact_directory.stop()
+    if _calendar_service:
+        _calendar_service.close()
+    session_log_writer.shutdown(wait=True)
+    session_store.close()
+    whisper_pool.close()
+    if _summarizer:
+        await _summarizer.files.close()
+        _summarizer.cache.close()
+
+app = FastAPI(lifespan=lifespan)
+# Reject oversized audio uploads before they are spooled (SCRIBE_MAX_AUDIO_MB)
+app.add_middleware(UploadLimitMiddleware, paths=("/analyze_audio", "/jobs/analyze_audio", "/transcribe"))
+# Per-endpoint request counts, latency and in-flight gauges for /metrics
+app.add_middleware(metrics.MetricsMiddleware, routes_app=app)
 templates_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
 templates = Jinja2Templates(directory=templates_dir)
 
-# Initialize Summarizer once
-try:
-    gemini_summarizer = Summarizer()
-except Exception as e:
-    print(f"Warning: Failed to init Summarizer (Check API Key): {e}")
-    gemini_summarizer = None
+# Summarizer and CalendarService are built on first use (or by warm_up()).
+# A failed build (e.g. missing API key) is retried on the next request.
+_summarizer = None
+_calendar_service = None
+_contact_directory = None
+_init_lock = threading.Lock()
+
+def get_summarizer():
+    """Base Summarizer shared by all sessions. Raises if it cannot be built."""
+    global _summarizer
+    if _summarizer is None:
+        with _init_lock:
+            if _summarizer is None:
+                from summarizer import Summarizer
+                if fake_backend.enabled():
+                    # Offline load testing: no Gemini quota or network needed
+                    print("SCRIBE_FAKE_BACKEND=1: using fake Gemini and Google backends")
+                    _summarizer = Summarizer(client=fake_backend.FakeGenaiClient())
+                else:
+                    _summarizer = Summarizer()
+    try:
+        # The upload sweeper needs the event loop; start() is a no-op once running
+        asyncio.get_running_loop()
+        _summarizer.files.start()
+    except RuntimeError:
+        pass
+    return _summarizer
+
+def summarizer_unavailable():
+    """Error response if the Summarizer cannot be built, else None."""
+    try:
+        get_summarizer()
+        return None
+    except Exception as e:
+        print(f"Warning: Failed to init Summarizer (Check API Key): {e}")
+        return {"error": f"Summarizer not initialized (Check server logs/API Key): {e}"}
+
+def get_calendar_service():
+    """CalendarService built on first use; the Google client libraries load with it. Blocking: call off the event loop."""
+    global _calendar_service
+    if _calendar_service is None:
+        with _init_lock:
+            if _calendar_service is None:
+                if fake_backend.enabled():
+                    service_class = fake_backend.FakeCalendarService
+                else:
+                    from auth_calendar import CalendarService
+                    service_class = CalendarService
+                _calendar_service = service_class(
+                    credentials_path=os.path.join(os.getcwd(), "credentials.json"),
+                    token_path=os.path.join(os.getcwd(), "token.json")
+                )
+    return _calendar_service
+
+def get_contact_directory():
+    """
+    Local contact index, built on first use. Blocking (may build the
+    CalendarService); call it off the event loop, then start() its People
+    API sync on the loop.
+    """
+    global _contact_directory
+    if _contact_directory is None:
+        calendar_service = get_calendar_service()
+        with _init_lock:
+            if _contact_directory is None:
+                _contact_directory = ContactDirectory(calendar_service)
+    return _contact_directory
+
+async def warm_up():
+    """Build the lazy singletons off the event loop right after startup (SCRIBE_WARMUP=1)."""
+    started = time.perf_counter()
+    try:
+        await asyncio.to_thread(get_summarizer)
+        get_summarizer()  # Starts the upload sweeper on the loop
+    except Exception as e:
+        print(f"Warning: Failed to init Summarizer (Check API Key): {e}")
+    calendar_service = await asyncio.to_thread(get_calendar_service)
+    # Fill the contact directory and event cache early, but only with stored credentials (never start an OAuth flow here)
+    has_credentials = fake_backend.enabled() or os.path.exists(getattr(calendar_service, "token_path", ""))
+    if os.getenv("SCRIBE_CONTACTS_PRELOAD", "1") == "1" and has_credentials:
+        (await asyncio.to_thread(get_contact_directory)).start()
+    if os.getenv("SCRIBE_CALENDAR_PRELOAD", "1") == "1" and has_credentials:
+        asyncio.get_running_loop().create_task(asyncio.to_thread(calendar_service.get_upcoming_events, max_results=0))
+    print(f"Warm-up finished in {time.perf_counter() - started:.2f}s")
+
+# Durable meeting state (transcript, notes, attendees, summary versions) in an append-only SQLite log
+session_store = SessionStore()
+
+# Summary and reset records go through one thread, in order; the summary hook fires on any thread, the loop included
+session_log_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session-log")
+# session_id -> number of /reset calls; a summary made before the latest reset is not logged
+session_resets = {}
 
-# Initialize Calendar Service
-calendar_service = CalendarService(
-    credentials_path=os.path.join(os.getcwd(), "credentials.json"),
-    token_path=os.path.join(os.getcwd(), "token.json")
-)
+def log_summary(session_id, generation, summary):
+    """Log a new running summary unless its session has been reset since (runs on session_log_writer)."""
+    if session_resets.get(session_id, 0) == generation:
+        session_store.append(session_id, "summary", summary)
+
+def restore_session(session_id, summarizer):
+    """Resume a session's summary context from the store (after a restart) and log every new summary. Blocking."""
+    generation = session_resets.get(session_id, 0)
+    state = session_store.get(session_id)
+    if state and state["summary"]:
+        summarizer.current_summary = state["summary"]
+    summarizer.on_summary = lambda summary: session_log_writer.submit(log_summary, session_id, generation, summary)
+
+# Per-meeting summary contexts, all sharing the base summarizer's genai client
+sessions = SessionRegistry(lambda: get_summarizer().for_session())
+
+async def get_session(session_id):
+    """The session's summarizer, restored from the store on first use (off the loop, outside the registry lock)."""
+    session_id = session_id or DEFAULT_SESSION_ID
+    summarizer = sessions.get(session_id)
+    if summarizer.restored is None:
+        summarizer.restored = asyncio.ensure_future(run_in_threadpool(restore_session, session_id, summarizer))
+    restored = summarizer.restored
+    try:
+        # Shielded: one cancelled request must not cancel the restore other requests are waiting on
+        await asyncio.shield(restored)
+    except Exception:
+        if summarizer.restored is restored:
+            summarizer.restored = None  # A failed read (e.g. a locked database) is retried by the next request
+        raise
+    return summarizer
+
+# Live recordings uploaded in numbered chunks (resumable, analyzed while recording)
+chunk_store = ChunkStore()
+
+# Background audio analysis jobs, processed by a fixed worker pool
+job_queue = JobQueue()
+
+# Background /save_minutes jobs (Drive upload + Calendar attach); separate so saves never wait behind analyses
+save_queue = JobQueue(workers=int(os.getenv("SCRIBE_SAVE_WORKERS", "4")))
+
+def find_job(job_id):
+    """(queue, job) for a job id from either queue, or (None, None)."""
+    for queue in (job_queue, save_queue):
+        job = queue.get(job_id)
+        if job:
+            return queue, job
+    return None, None
+
+# Attendee presets (attendee_presets.json), cached in memory and written atomically
+preset_store = PresetStore()
+
+# Local speech-to-text (faster-whisper), shared by every request
+whisper_pool = WhisperPool()
 
 class SummarizeRequest(BaseModel):
     text: str
+    offset: int | None = None  # Where `text` starts in the client's transcript; dedupes overlapping requests
+    session_id: str | None = None
     meeting_title: str | None = None
-    user_notes: list[str] = []
+    user_notes: list[str] | None = None  # None: use the notes and attendees recorded in the session store
+    stream: bool = False
+
+def sse_response(events):
+    """Wrap an async iterator of dict events as a Server-Sent Events response."""
+    async def body():
+        async for event in events:
+            yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @app.get("/", response_class=HTMLResponse)
 async def read_root(request: Request):
     transcription_language = os.getenv("TRANSCRIPTION_LANGUAGE", "ko-KR")
+    transcription_engine = os.getenv("TRANSCRIPTION_ENGINE", "browser")  # browser | whisper
     auto_summarize_interval = os.getenv("AUTO_SUMMARIZE_INTERVAL", "0")
     audio_chunk_seconds = os.getenv("AUDIO_CHUNK_SECONDS", "0")
-    import json
-    presets = {}
-    if os.path.exists("attendee_presets.json"):
-        try:
-            with open("attendee_presets.json", "r", encoding="utf-8") as f:
-                presets = json.load(f)
-        except Exception as e:
-            print(f"Error loading presets: {e}")
+    live_chunk_seconds = os.getenv("SCRIBE_LIVE_CHUNK_SECONDS", "10")
 
     return templates.TemplateResponse("index.html", {
         "request": request,
         "transcription_language": transcription_language,
+        "transcription_engine": transcription_engine,
         "auto_summarize_interval": auto_summarize_interval,
         "audio_chunk_seconds": audio_chunk_seconds,
-        "attendee_presets": json.dumps(presets)
+        "live_chunk_seconds": live_chunk_seconds,
+        "attendee_presets": preset_store.as_json()  # In-memory copy; no file I/O per render
     })
 
 @app.post("/reset")
-async def reset_endpoint():
-    if gemini_summarizer:
-        gemini_summarizer.reset()
-        return {"status": "Summary context reset"}
-    return {"error": "Summarizer not initialized"}
+async def reset_endpoint(session_id: str | None = None):
+    # Resetting never needs the Summarizer itself, so do not build it here
+    session_id = session_id or DEFAULT_SESSION_ID
+    # Summaries still in flight for the discarded context are dropped instead of logged after the reset
+    session_resets[session_id] = session_resets.get(session_id, 0) + 1
+    sessions.discard(session_id)
+    await asyncio.wrap_future(session_log_writer.submit(session_store.append, session_id, "reset"))
+    return {"status": "Summary context reset"}
 
 @app.post("/summarize")
 async def summarize_endpoint(req: SummarizeRequest):
-    if not gemini_summarizer:
-        return {"error": "Summarizer not initialized (Check server logs/API Key)"}
+    error = summarizer_unavailable()
+    if error:
+        return error
     
     try:
-        # Pass user_notes to the summarizer
-        result = gemini_summarizer.summarize(req.text, meeting_title=req.meeting_title, user_notes=req.user_notes)
-        if isinstance(result, dict):
-            return result
-        return {"summary": result}
+        # Single-flight per session: overlapping requests (auto-summarize timer,
+        # manual clicks, other tabs) share the running call or merge into one follow-up
+        summarizer = await get_session(req.session_id)
+        meeting_title, user_notes = req.meeting_title, req.user_notes
+        if user_notes is None:
+            # The page already logged its notes and attendees; do not make it re-send them every time
+            state = await run_in_threadpool(session_store.get, req.session_id or DEFAULT_SESSION_ID)
+            state = state or {"notes": [], "meta": {}}
+            user_notes = list(state["notes"])
+            participants = state["meta"].get("participants")
+            if participants:
+                user_notes.insert(0, f"참석자 명단: {', '.join(participants)}")
+            meeting_title = meeting_title or state["meta"].get("meeting_title")
+        flight = summarizer.coalescer.submit(req.text, meeting_title=meeting_title, user_notes=user_notes,
+                                             offset=req.offset)
+        if req.stream:
+            return sse_response(flight.subscribe())
+        return await flight.result()
     except Exception as e:
         return {"error": str(e)}
 
@@ -85,42 +292,285 @@ async def summarize_endpoint(req: SummarizeRequest):
 async def analyze_audio_endpoint(
     file: UploadFile = File(...), 
     meeting_title: str = Form(None),
-    user_notes: str = Form(None)  # Received as JSON string
+    user_notes: str = Form(None),  # Received as JSON string
+    session_id: str = Form(None),
+    stream: bool = Form(False)
 ):
-    if not gemini_summarizer:
-        return {"error": "Summarizer not initialized"}
+    error = summarizer_unavailable()
+    if error:
+        return error
     
-    # Save UploadFile to a temporary file
-    temp_filename = f"temp_{file.filename}"
     try:
-        with open(temp_filename, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        # Hash and size-check the spooled upload in one pass; it is handed to Gemini as-is
+        audio = await run_in_threadpool(ingest_upload, file)
         
         # Parse user_notes if present
-        import json
-        notes_list = []
+        notes_list = parse_user_notes(user_notes)
+
+        print(f"Processing audio: {audio}, Title: {meeting_title}, Notes: {len(notes_list)}")
+        summarizer = await get_session(session_id)
+        # Queued behind any running text summary of this session so the two never race on current_summary
+        flight = summarizer.coalescer.submit_audio(
+            audio.file, meeting_title=meeting_title, user_notes=notes_list, mime_type=audio.mime_type,
+            sha256=audio.sha256, size=audio.size
+        )
+        if stream:
+            return sse_response(flight.subscribe())
+        return await flight.result()
+    except Exception as e:
+        # AudioTooLargeError included: surfaces the size cap message to the client
+        return {"error": str(e)}
+
+async def run_audio_job(job, summarizer, audio, meeting_title, notes_list):
+    """Job body for /jobs/analyze_audio: streams the analysis and mirrors it into job progress."""
+    # Workers run outside any request; attribute tokens and cost to the submitting endpoint
+    metrics.current_endpoint.set("/jobs/analyze_audio")
+    await job.update(phase="uploading", progress={"bytes": audio.size})
+    result = {"error": "Analysis ended without a result"}
+    flight = summarizer.coalescer.submit_audio(
+        audio.file, meeting_title=meeting_title, user_notes=notes_list, mime_type=audio.mime_type,
+        sha256=audio.sha256, size=audio.size
+    )
+    async for event in flight.subscribe():
+        if "delta" in event:
+            partial = job.partial + event["delta"]
+            await job.update(phase="generating", partial=partial,
+                             progress={"bytes": audio.size, "chars": len(partial)})
+        elif event.get("done"):
+            result = {k: v for k, v in event.items() if k != "done"}
+    return result
+
+@app.post("/jobs/analyze_audio")
+async def submit_audio_job_endpoint(
+    file: UploadFile = File(...),
+    meeting_title: str = Form(None),
+    user_notes: str = Form(None),
+    session_id: str = Form(None),
+    priority: int = Form(0)
+):
+    """Queue an audio analysis and return its job id immediately."""
+    error = summarizer_unavailable()
+    if error:
+        return error
+
+    try:
+        # The job outlives this request (and its upload buffer): copy and hash in one pass
+        audio = await run_in_threadpool(detach_audio, file)
+        notes_list = parse_user_notes(user_notes)
+        summarizer = await get_session(session_id)
+
+        async def work(job):
+            return await run_audio_job(job, summarizer, audio, meeting_title, notes_list)
+
+        try:
+            job = job_queue.submit("analyze_audio", work, priority=priority,
+                                   meta={"session_id": session_id, "filename": audio.filename},
+                                   cleanup=audio.file.close)
+        except QueueFullError:
+            audio.file.close()
+            raise
+        print(f"Queued audio job {job.id}: {audio}")
+        return {"job_id": job.id, "status": job.status, "queued": job_queue.queued_count()}
+    except Exception as e:
+        return {"error": str(e)}
+
+@app.get("/jobs/{job_id}")
+async def job_status_endpoint(job_id: str):
+    _, job = find_job(job_id)
+    if not job:
+        return {"error": "Unknown job id"}
+    return job.snapshot()
+
+@app.get("/jobs/{job_id}/events")
+async def job_events_endpoint(job_id: str):
+    """SSE stream of job snapshots until the job finishes. Disconnecting does not cancel the job."""
+    queue, job = find_job(job_id)
+    if not job:
+        return {"error": "Unknown job id"}
+    return sse_response(queue.watch(job))
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job_endpoint(job_id: str):
+    """Cancel a job that has not started yet."""
+    queue, _ = find_job(job_id)
+    if queue and await queue.cancel(job_id):
+        return {"status": "cancelled"}
+    return {"error": "Job is not queued"}
+
+def parse_user_notes(user_notes):
+    """Parse the JSON-encoded user_notes form field."""
+    if not user_notes:
+        return []
+    try:
+        return json.loads(user_notes)
+    except:
+        print("Failed to parse user_notes JSON")
+        return []
+
+@app.post("/recordings/{recording_id}/chunks/{index}")
+async def upload_chunk_endpoint(
+    recording_id: str,
+    index: int,
+    file: UploadFile = File(...),
+    session_id: str = Form(None),
+    meeting_title: str = Form(None),
+    user_notes: str = Form(None)
+):
+    """Append one numbered chunk of a live recording. Re-sending the same chunk is a no-op."""
+    error = summarizer_unavailable()
+    if error:
+        return error
+    try:
+        recording = chunk_store.get(recording_id)
+        data = await chunk_store.read_chunk(file)
+        status = await run_in_threadpool(chunk_store.put_chunk, recording, index, data)
+
+        # Latest context from the client is used for background segment analysis
+        recording.session_id = session_id or recording.session_id
+        recording.meeting_title = meeting_title or recording.meeting_title
         if user_notes:
-            try:
-                notes_list = json.loads(user_notes)
-            except:
-                print("Failed to parse user_notes JSON")
+            recording.user_notes = parse_user_notes(user_notes)
+        if file.content_type and file.content_type.startswith("audio/"):
+            recording.mime_type = file.content_type.split(";")[0]
 
-        print(f"Processing audio file: {temp_filename}, Title: {meeting_title}, Notes: {len(notes_list)}")
-        result = gemini_summarizer.analyze_audio(temp_filename, meeting_title=meeting_title, user_notes=notes_list)
-        
-        return result
+        chunk_store.maybe_schedule(recording, await get_session(recording.session_id))
+        return {"status": status, **recording.status()}
+    except AudioTooLargeError as e:
+        return JSONResponse({"error": str(e)}, status_code=413)
     except Exception as e:
         return {"error": str(e)}
+
+@app.get("/recordings/{recording_id}")
+async def recording_status_endpoint(recording_id: str):
+    """Which chunks the server has, so a client can resume after a dropped connection."""
+    try:
+        return chunk_store.get(recording_id).status()
+    except Exception as e:
+        return {"error": str(e)}
+
+@app.post("/recordings/{recording_id}/finalize")
+async def finalize_recording_endpoint(recording_id: str):
+    """Analyze whatever tail of the recording has not been analyzed yet and return the minute."""
+    error = summarizer_unavailable()
+    if error:
+        return error
+    try:
+        recording = chunk_store.get(recording_id)
+        return await chunk_store.finalize(recording, await get_session(recording.session_id))
+    except Exception as e:
+        return {"error": str(e)}
+
+@app.post("/transcribe")
+async def transcribe_endpoint(
+    file: UploadFile = File(...),
+    language: str = Form(None)
+):
+    """Transcribe audio locally with faster-whisper and return timestamped segments."""
+    try:
+        audio = await run_in_threadpool(ingest_upload, file)
+        print(f"Transcribing audio: {audio}")
+        return await whisper_pool.transcribe_async(audio.file, language=language)
+    except Exception as e:
+        return {"error": str(e)}
+
+@app.websocket("/ws/transcribe")
+async def transcribe_websocket(websocket: WebSocket, language: str | None = None):
+    """
+    Live transcription: the client sends 16 kHz mono int16 PCM frames as binary
+    messages and receives interim/final hypotheses shaped like recognition.onresult.
+    """
+    from stream_transcriber import StreamingSession, recognition_result  # numpy; only needed for live transcription
+
+    await websocket.accept()
+    stream = StreamingSession()
+    partial_task = None
+
+    async def send_partial(index, samples):
+        try:
+            text = await whisper_pool.decode_samples_async(samples, language=language, final=False)
+            # Skip stale interims for an utterance that has already been finalized
+            if text and index == stream.result_index:
+                await websocket.send_json(recognition_result(index, text, False))
+        except Exception as e:
+            print(f"Interim decode failed: {e}")
+
+    async def send_final(index, samples):
+        text = await whisper_pool.decode_samples_async(samples, language=language, final=True)
+        if text:
+            await websocket.send_json(recognition_result(index, text, True))
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            if message.get("bytes"):
+                action = stream.feed(message["bytes"])
+            elif message.get("text") == "stop":
+                break
+            else:
+                continue
+
+            if action == "final":
+                index = stream.result_index
+                await send_final(index, stream.take_utterance())
+            elif action == "partial" and (partial_task is None or partial_task.done()):
+                # Never queue interims: if the last one is still decoding, drop this tick
+                partial_task = asyncio.create_task(send_partial(stream.result_index, stream.utterance_audio()))
+
+        tail = stream.flush()
+        if tail is not None and len(tail):
+            await send_final(stream.result_index - 1, tail)
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        print(f"Transcription websocket error: {e}")
     finally:
-        # Cleanup temp file
-        if os.path.exists(temp_filename):
-            os.remove(temp_filename)
+        if partial_task and not partial_task.done():
+            partial_task.cancel()
 
 @app.get("/calendar/events")
-async def get_calendar_events():
-    """Fetch upcoming calendar events."""
-    result = calendar_service.get_upcoming_events(max_results=10)
-    return result
+async def get_calendar_events(refresh: bool = False):
+    """Fetch upcoming calendar events (from the local event cache; refresh=true syncs first)."""
+    # Building the service (first use) loads the Google client libraries; keep that off the loop too
+    return await run_in_threadpool(lambda: get_calendar_service().get_upcoming_events(max_results=10, refresh=refresh))
+
+class SessionEvent(BaseModel):
+    kind: str  # transcript | note | meta
+    data: Any = None
+
+class SessionEventsRequest(BaseModel):
+    events: list[SessionEvent]
+
+@app.post("/sessions/{session_id}/events")
+async def append_session_events_endpoint(session_id: str, req: SessionEventsRequest):
+    """Append transcript lines, notes and metadata changes (title, attendees, ...) to the session log."""
+    def append_all():
+        seq = None
+        for event in req.events:
+            if event.kind not in CLIENT_EVENT_KINDS:
+                raise ValueError(f"Unsupported session event kind: {event.kind!r}")
+            seq = session_store.append(session_id, event.kind, event.data)
+        return seq
+
+    try:
+        seq = await run_in_threadpool(append_all)
+    except ValueError as e:
+        return {"error": str(e)}
+    return {"status": "ok", "seq": seq}
+
+@app.get("/sessions/{session_id}")
+async def get_session_endpoint(session_id: str):
+    """Recorded state of a meeting session, for restoring the page after a crash or restart."""
+    state = await run_in_threadpool(session_store.get, session_id)
+    if state is None:
+        return {"error": "Unknown session"}
+    return state
+
+@app.get("/sessions")
+async def list_sessions_endpoint(limit: int = 20):
+    return {"sessions": await run_in_threadpool(session_store.list_sessions, limit)}
 
 class SaveMinutesRequest(BaseModel):
     text: str
@@ -129,66 +579,72 @@ class SaveMinutesRequest(BaseModel):
 
 @app.post("/save_minutes")
 async def save_minutes_endpoint(req: SaveMinutesRequest):
-    """Save minutes to Drive and optionally attach to Calendar event."""
-    
-    # 1. Create filename with timestamp to avoid duplicates
-    import datetime
-    now = datetime.datetime.now()
-    date_str = now.strftime("%Y-%m-%d")
-    time_str = now.strftime("%H-%M")
-    filename = f"[회의록] {date_str} {req.meeting_title} ({time_str})"
-    
-    # 2. Upload to Drive
-    file_id, web_link = calendar_service.upload_to_drive(filename, req.text)
-    
-    if not file_id:
-        return {"error": "Google Drive 업로드 실패"}
-    
-    result_msg = f"회의록이 저장되었습니다. (Drive)\n링크: {web_link}"
-    
-    # 3. Attach to Calendar if event_id is present
-    if req.event_id:
-        success, msg = calendar_service.attach_to_calendar_event(
-            req.event_id, file_id, web_link, filename
-        )
-        if success:
-            result_msg += "\n\n캘린더 일정에도 첨부되었습니다! 📅"
-        else:
-            result_msg += f"\n\n캘린더 첨부 실패: {msg}"
-            
-    return {"status": "success", "message": result_msg, "link": web_link}
+    """Queue saving minutes to Drive (and attaching them to a Calendar event); follow /jobs/{job_id}."""
+    filename = minutes_filename(req.meeting_title)
+    saver = MinutesSaver(await run_in_threadpool(get_calendar_service))
+
+    async def work(job):
+        return await saver.run(job, req.text, filename, event_id=req.event_id)
+
+    try:
+        job = save_queue.submit("save_minutes", work, meta={"filename": filename, "event_id": req.event_id})
+    except QueueFullError as e:
+        return {"error": str(e)}
+    return {"status": "queued", "job_id": job.id, "message": f"저장 중입니다: {filename}"}
+
+@app.get("/presets")
+async def list_presets_endpoint(title: str | None = None, participant: str | None = None):
+    """All presets, or only those matching a meeting title / including a participant."""
+    if title is None and participant is None:
+        return {"presets": preset_store.all()}
+    names = preset_store.match_title(title) if title is not None else preset_store.with_participant(participant)
+    return {"presets": {name: preset_store.get(name) for name in names}}
 
 @app.post("/presets")
 async def save_pset_endpoint(data: dict):
-    preset_name = data.get("name")
-    participants = data.get("participants", [])
-    
-    if not preset_name or not participants:
-        return {"status": "error", "message": "Invalid data"}
-    
-    presets = {}
-    if os.path.exists("attendee_presets.json"):
-        try:
-            with open("attendee_presets.json", "r", encoding="utf-8") as f:
-                presets = json.load(f)
-        except: pass
-        
-    presets[preset_name] = participants
-    
-    with open("attendee_presets.json", "w", encoding="utf-8") as f:
-        json.dump(presets, f, ensure_ascii=False, indent=4)
-        
+    try:
+        # Atomic read-modify-write (fsync + rename) under the store's lock, off the event loop
+        presets = await run_in_threadpool(preset_store.save, data.get("name"), data.get("participants", []))
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}
+    except OSError as e:
+        return {"status": "error", "message": f"Failed to save presets: {e}"}
+    return {"status": "success", "presets": presets}
+
+@app.delete("/presets/{name}")
+async def delete_preset_endpoint(name: str):
+    try:
+        presets = await run_in_threadpool(preset_store.delete, name)
+    except OSError as e:
+        return {"status": "error", "message": f"Failed to save presets: {e}"}
     return {"status": "success", "presets": presets}
 
 @app.get("/contacts/search")
-async def search_contacts_endpoint(q: str):
-    if not calendar_service.service:
-        calendar_service.authenticate()
-    
-    results = calendar_service.search_contacts(q)
-    return {"results": results}
+async def search_contacts_endpoint(q: str, limit: int = 10):
+    directory = await run_in_threadpool(get_contact_directory)
+    directory.start()  # Sync runs on the event loop; no-op once started
+    # On a cold start, waiting for the in-flight first sync beats a duplicate People API round-trip
+    if await directory.wait_ready(float(os.getenv("SCRIBE_CONTACTS_COLD_WAIT_SECONDS", "1"))):
+        # Answered from memory; the People API is only used by the background sync
+        return {"results": directory.search(q, limit)}
+
+    # First sync still running (or failing): ask the People API directly, off the event loop
+    def search_remote():
+        calendar_service = get_calendar_service()
+        if not calendar_service.service:
+            calendar_service.authenticate()
+        return calendar_service.search_contacts(q)
+
+    return {"results": await run_in_threadpool(search_remote)}
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Prometheus text exposition of request, Gemini and Google API metrics."""
+    return Response(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
 
 def run_server():
+    import uvicorn
+
     host = os.getenv("SCRIBE_HOST", "127.0.0.1")
     port = int(os.getenv("SCRIBE_PORT", "8000"))
     
@@ -196,5 +652,10 @@ def run_server():
     print(f"Open http://{host}:{port} in Chrome to start transcription.")
     uvicorn.run(app, host=host, port=port)
 
+# Import-time budget: everything above runs before the server can bind its port
+import_ms = (time.perf_counter() - _import_started) * 1000
+if import_ms > float(os.getenv("SCRIBE_IMPORT_BUDGET_MS", "1000")):
+    print(f"Warning: importing scribe took {import_ms:.0f} ms (SCRIBE_IMPORT_BUDGET_MS); check for eager heavy imports")
+
 if __name__ == "__main__":
     run_server()
@@ -0,0 +1,95 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_SESSION_ID = "default"
+
+
+class SessionRegistry:
+    """
+    Bounded in-memory registry of per-meeting objects keyed by session id.
+    Entries are evicted least-recently-used first once max_sessions is
+    exceeded, and dropped after idle_ttl seconds without access.
+    `on_evict(session_id, value)` is called for LRU and idle evictions,
+    `on_create(session_id, value)` for every newly created entry.
+    """
+
+    def __init__(self, factory, max_sessions=None, idle_ttl=None, clock=time.monotonic, on_evict=None,
+                 on_create=None):
+        self.factory = factory
+        self.on_evict = on_evict
+        self.on_create = on_create
+        self.max_sessions = max_sessions or int(os.getenv("SCRIBE_MAX_SESSIONS", "64"))
+        if idle_ttl is None:
+            idle_ttl = float(os.getenv("SCRIBE_SESSION_TTL_SECONDS", "7200"))
+        self.idle_ttl = idle_ttl
+        self.clock = clock
+        self._sessions = OrderedDict()  # session_id -> [value, last_access]
+        self._lock = threading.Lock()
+
+    def get(self, session_id=None):
+        """Return the object for session_id, creating it on first use."""
+        session_id = session_id or DEFAULT_SESSION_ID
+        now = self.clock()
+        with self._lock:
+            self._evict_expired(now)
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                entry = [self.factory(), now]
+                if self.on_create:
+                    self.on_create(session_id, entry[0])
+                self._sessions[session_id] = entry
+                while len(self._sessions) > self.max_sessions:
+                    evicted_id, (evicted, _) = self._sessions.popitem(last=False)
+                    print(f"Session evicted (LRU): {evicted_id}")
+                    self._evicted(evicted_id, evicted)
+            else:
+                entry[1] = now
+                self._sessions.move_to_end(session_id)
+            return entry[0]
+
+    def peek(self, session_id=None):
+        """Return the object for session_id without creating or touching it."""
+        with self._lock:
+            entry = self._sessions.get(session_id or DEFAULT_SESSION_ID)
+            return entry[0] if entry else None
+
+    def discard(self, session_id=None):
+        """Forget a session. Returns True if it existed."""
+        with self._lock:
+            return self._sessions.pop(session_id or DEFAULT_SESSION_ID, None) is not None
+
+    def evict_expired(self):
+        """Drop every session idle for longer than idle_ttl. Returns the count."""
+        with self._lock:
+            return self._evict_expired(self.clock())
+
+    def _evict_expired(self, now):
+        if self.idle_ttl <= 0:
+            return 0
+        expired = [sid for sid, (_, last) in self._sessions.items() if now - last > self.idle_ttl]
+        for sid in expired:
+            value, _ = self._sessions.pop(sid)
+            print(f"Session expired (idle): {sid}")
+            self._evicted(sid, value)
+        return len(expired)
+
+    def _evicted(self, session_id, value):
+        if self.on_evict:
+            try:
+                self.on_evict(session_id, value)
+            except Exception as e:
+                print(f"Session eviction hook failed for {session_id}: {e}")
+
+    def session_ids(self):
+        with self._lock:
+            return list(self._sessions.keys())
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
+
+    def __contains__(self, session_id):
+        with self._lock:
+            return session_id in self._sessions
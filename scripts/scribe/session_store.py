@@ -0,0 +1,326 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# Record kinds: transcript line / note appended, metadata merged, summary version, reset
+EVENT_KINDS = ("transcript", "note", "meta", "summary", "reset")
+CLIENT_EVENT_KINDS = ("transcript", "note", "meta")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS session_log (
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    payload TEXT,
+    at REAL NOT NULL,
+    PRIMARY KEY (session_id, seq)
+);
+CREATE TABLE IF NOT EXISTS session_snapshot (
+    session_id TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    state TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS session_index (
+    session_id TEXT PRIMARY KEY,
+    meeting_title TEXT,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class SessionState:
+    """Meeting state rebuilt by replaying a session's log: transcript, notes, metadata, recent summaries."""
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.transcript = []  # Final transcript lines, in order
+        self.notes = []
+        self.meta = {}  # meeting_title, participants, event_id, summarized_chars, ...
+        self.summaries = []  # Most recent versions, oldest first: {"version", "summary", "at"}
+        self.summary_version = 0
+        self.seq = 0
+        self.updated_at = 0.0
+        self.log_records = 0  # Records since the last snapshot
+
+    def apply(self, kind, payload, at, max_versions):
+        if kind == "transcript":
+            self.transcript.append(str(payload))
+        elif kind == "note":
+            self.notes.append(str(payload))
+        elif kind == "meta":
+            if not isinstance(payload, dict):
+                raise ValueError("meta events need an object payload")
+            self.meta.update(payload)
+        elif kind == "summary":
+            self.summary_version += 1
+            self.summaries.append({"version": self.summary_version, "summary": str(payload), "at": at})
+            del self.summaries[:-max_versions]
+        elif kind == "reset":
+            # Same scope as the page's reset: transcript and summary context; notes and attendees stay
+            self.transcript = []
+            self.summaries = []
+            self.meta.pop("summarized_chars", None)
+        else:
+            raise ValueError(f"Unknown session event kind: {kind!r}")
+        self.updated_at = at
+
+    @property
+    def summary(self):
+        return self.summaries[-1]["summary"] if self.summaries else ""
+
+    def to_dict(self):
+        return {"transcript": self.transcript, "notes": self.notes, "meta": self.meta,
+                "summaries": self.summaries, "summary_version": self.summary_version, "updated_at": self.updated_at}
+
+    @classmethod
+    def from_dict(cls, session_id, seq, data):
+        state = cls(session_id)
+        state.transcript = data.get("transcript", [])
+        state.notes = data.get("notes", [])
+        state.meta = data.get("meta", {})
+        state.summaries = data.get("summaries", [])
+        state.summary_version = data.get("summary_version", 0)
+        state.updated_at = data.get("updated_at", 0.0)
+        state.seq = seq
+        return state
+
+    def view(self):
+        """Copy of the state for API responses."""
+        return {"session_id": self.session_id, "seq": self.seq, "updated_at": self.updated_at,
+                "transcript": list(self.transcript), "notes": list(self.notes), "meta": dict(self.meta),
+                "summary": self.summary, "summary_version": self.summary_version,
+                "summaries": [dict(s) for s in self.summaries]}
+
+
+class SessionStore:
+    """
+    Durable meeting sessions in SQLite (SCRIBE_SESSION_DB).
+
+    Every change is an append-only log record (session_id, seq, kind,
+    payload). Appends update the in-memory state immediately and are
+    written by a background thread in batches, one transaction (one fsync,
+    WAL + synchronous=FULL) per SCRIBE_SESSION_FLUSH_MS, so a crash loses at
+    most that window. A session is recovered from its latest snapshot plus
+    the log records after it. Once SCRIBE_SESSION_COMPACT_RECORDS records
+    have piled up, the snapshot is rewritten and the log truncated in the
+    same transaction; only the last SCRIBE_SESSION_SUMMARY_VERSIONS summary
+    versions are kept, and sessions idle for SCRIBE_SESSION_RETENTION_DAYS
+    are purged, so storage and recovery time stay bounded.
+    """
+
+    def __init__(self, path=None, flush_interval=None, compact_every=None, max_versions=None,
+                 retention_days=None, max_loaded=256, clock=time.time):
+        self.path = path or os.getenv("SCRIBE_SESSION_DB", "scribe_sessions.db")
+        self.flush_interval = flush_interval if flush_interval is not None else float(
+            os.getenv("SCRIBE_SESSION_FLUSH_MS", "200")) / 1000.0
+        self.compact_every = compact_every or int(os.getenv("SCRIBE_SESSION_COMPACT_RECORDS", "500"))
+        self.max_versions = max_versions or int(os.getenv("SCRIBE_SESSION_SUMMARY_VERSIONS", "10"))
+        self.retention = 86400 * (retention_days if retention_days is not None else float(
+            os.getenv("SCRIBE_SESSION_RETENTION_DAYS", "30")))
+        self.max_loaded = max_loaded
+        self.clock = clock
+        self._conn = None
+        self._states = OrderedDict()  # session_id -> SessionState (recently used, loaded from disk)
+        self._pending = []  # Log records not written yet
+        self._compact_due = set()
+        self._lock = threading.Lock()  # States and pending records
+        self._db_lock = threading.Lock()  # The connection; always taken before _lock
+        self._wake = threading.Event()
+        self._closed = False
+        self._writer = None
+        self._last_maintenance = time.monotonic()
+
+    # --- database ----------------------------------------------------------
+
+    def _db(self):
+        # Opened on first use so importing the server never touches the disk
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=FULL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _read(self, session_id):
+        """Recover one session: snapshot plus the log records after it (None if unknown)."""
+        db = self._db()
+        row = db.execute("SELECT seq, state FROM session_snapshot WHERE session_id = ?", (session_id,)).fetchone()
+        state = SessionState.from_dict(session_id, row[0], json.loads(row[1])) if row else None
+        records = db.execute("SELECT seq, kind, payload, at FROM session_log WHERE session_id = ? AND seq > ? "
+                             "ORDER BY seq", (session_id, state.seq if state else 0)).fetchall()
+        if state is None and not records:
+            return None
+        state = state or SessionState(session_id)
+        for seq, kind, payload, at in records:
+            state.apply(kind, json.loads(payload), at, self.max_versions)
+            state.seq = seq
+        state.log_records = len(records)
+        return state
+
+    def _state(self, session_id, create):
+        with self._lock:
+            state = self._states.get(session_id)
+            if state is not None:
+                self._states.move_to_end(session_id)
+                return state
+        with self._db_lock, self._lock:
+            state = self._states.get(session_id)
+            if state is None:
+                # Sessions are only unloaded once all their records are on disk, so this read is complete
+                state = self._read(session_id)
+                if state is None:
+                    if not create:
+                        return None
+                    state = SessionState(session_id)
+                self._states[session_id] = state
+            return state
+
+    # --- writes ------------------------------------------------------------
+
+    def append(self, session_id, kind, payload=None):
+        """Apply one event to the session and queue its log record. Returns the record's sequence number."""
+        if kind not in EVENT_KINDS:
+            raise ValueError(f"Unknown session event kind: {kind!r}")
+        encoded = json.dumps(payload, ensure_ascii=False)
+        while True:
+            state = self._state(session_id, create=True)
+            with self._lock:
+                if self._states.get(session_id) is not state:
+                    continue  # Unloaded in between; load it again
+                at = self.clock()
+                state.apply(kind, payload, at, self.max_versions)
+                state.seq += 1
+                state.log_records += 1
+                self._pending.append((session_id, state.seq, kind, encoded, at))
+                if state.log_records >= self.compact_every:
+                    self._compact_due.add(session_id)
+                seq = state.seq
+                break
+        self._start_writer()
+        return seq
+
+    def flush(self):
+        """Write queued records (and due snapshots) in one transaction. Returns the number of records."""
+        with self._db_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+                snapshots = []
+                for session_id in self._compact_due:
+                    state = self._states.get(session_id)
+                    if state is not None:
+                        # Every change to this state up to state.seq is in this batch or already on disk
+                        snapshots.append((session_id, state.seq, json.dumps(state.to_dict(), ensure_ascii=False)))
+                        state.log_records = 0
+                compact_due, self._compact_due = self._compact_due, set()
+                index = {}
+                for session_id, _, _, _, _ in batch:
+                    state = self._states.get(session_id)
+                    if state is not None:
+                        index[session_id] = (session_id, state.meta.get("meeting_title"), state.updated_at)
+            if not batch and not snapshots:
+                return 0
+            db = self._db()
+            try:
+                with db:
+                    db.executemany("INSERT INTO session_log (session_id, seq, kind, payload, at) VALUES (?, ?, ?, ?, ?)",
+                                   batch)
+                    db.executemany("INSERT OR REPLACE INTO session_index (session_id, meeting_title, updated_at) "
+                                   "VALUES (?, ?, ?)", list(index.values()))
+                    for session_id, seq, state_json in snapshots:
+                        db.execute("INSERT OR REPLACE INTO session_snapshot (session_id, seq, state) VALUES (?, ?, ?)",
+                                   (session_id, seq, state_json))
+                        db.execute("DELETE FROM session_log WHERE session_id = ? AND seq <= ?", (session_id, seq))
+            except Exception:
+                with self._lock:  # Keep them for the next attempt, in order
+                    self._pending[:0] = batch
+                    self._compact_due |= compact_due
+                raise
+            self._unload_idle()
+            return len(batch)
+
+    def _unload_idle(self):
+        with self._lock:
+            pending_ids = {record[0] for record in self._pending}
+            for session_id in list(self._states):
+                if len(self._states) <= self.max_loaded:
+                    break
+                if session_id not in pending_ids and session_id not in self._compact_due:
+                    del self._states[session_id]
+
+    # --- reads -------------------------------------------------------------
+
+    def get(self, session_id):
+        """The session's current state (see SessionState.view), or None if it has never been written."""
+        state = self._state(session_id, create=False)
+        if state is None:
+            return None
+        with self._lock:
+            return state.view()
+
+    def list_sessions(self, limit=20):
+        """Most recently updated sessions on disk: [{"session_id", "meeting_title", "updated_at"}]."""
+        self.flush()
+        with self._db_lock:
+            rows = self._db().execute("SELECT session_id, meeting_title, updated_at FROM session_index "
+                                      "ORDER BY updated_at DESC LIMIT ?", (limit,)).fetchall()
+        return [{"session_id": sid, "meeting_title": title, "updated_at": at} for sid, title, at in rows]
+
+    # --- maintenance -------------------------------------------------------
+
+    def purge_expired(self):
+        """Delete sessions idle for longer than the retention period. Returns the count."""
+        if self.retention <= 0:
+            return 0
+        cutoff = self.clock() - self.retention
+        with self._db_lock:
+            db = self._db()
+            expired = [row[0] for row in db.execute(
+                "SELECT session_id FROM session_index WHERE updated_at < ?", (cutoff,)).fetchall()]
+            with self._lock:
+                pending_ids = {record[0] for record in self._pending}
+                expired = [sid for sid in expired if sid not in pending_ids]
+                for session_id in expired:
+                    self._states.pop(session_id, None)
+            with db:
+                for table in ("session_log", "session_snapshot", "session_index"):
+                    db.executemany(f"DELETE FROM {table} WHERE session_id = ?", [(sid,) for sid in expired])
+            db.execute("PRAGMA wal_checkpoint(TRUNCATE)")  # Keep the WAL from growing without bound
+        if expired:
+            print(f"Purged {len(expired)} expired meeting sessions")
+        return len(expired)
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+                if time.monotonic() - self._last_maintenance > 3600:
+                    self._last_maintenance = time.monotonic()
+                    self.purge_expired()
+            except Exception as e:
+                print(f"Session log write failed (will retry): {e}")
+
+    def _start_writer(self):
+        if self._writer is None and not self._closed:
+            with self._lock:
+                if self._writer is None:
+                    self._writer = threading.Thread(target=self._run, name="session-log-writer", daemon=True)
+                    self._writer.start()
+
+    def close(self):
+        """Stop the writer and write everything still queued."""
+        self._closed = True
+        self._wake.set()
+        if self._writer is not None:
+            self._writer.join(timeout=5)
+            self._writer = None
+        self.flush()
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
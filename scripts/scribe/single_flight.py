@@ -0,0 +1,179 @@
+import asyncio
+
+import metrics
+
+
+class Flight:
+    """
+    One summarizer call and everyone waiting on it. Events from the
+    summarizer stream are recorded so late subscribers get a full replay.
+
+    Text flights summarize transcript segments and can absorb later
+    segments until they start; `end` is the client transcript offset (in
+    characters) they cover, when the client sent one. Call flights run a
+    fixed event source (audio analysis) and never merge. `endpoint` is the
+    submitter's metrics.current_endpoint, restored while the flight runs.
+    """
+
+    def __init__(self, text=None, meeting_title=None, user_notes=None, end=None, source=None):
+        self.texts = [text] if text else []
+        self.meeting_title = meeting_title
+        self.user_notes = user_notes
+        self.end = end
+        self.source = source
+        self.endpoint = metrics.current_endpoint.get()
+        self.callers = 1
+        self.events = []
+        self.done = False
+        self._changed = asyncio.Condition()
+
+    @property
+    def mergeable(self):
+        return self.source is None
+
+    @property
+    def text(self):
+        return "\n".join(t.strip() for t in self.texts if t.strip())
+
+    def merge(self, text, meeting_title=None, user_notes=None, end=None):
+        """Fold another request's segment in; the latest title and notes win."""
+        if text:
+            self.texts.append(text)
+        if end is not None:
+            self.end = max(self.end or 0, end)
+        if meeting_title:
+            self.meeting_title = meeting_title
+        if user_notes:
+            self.user_notes = user_notes
+        self.callers += 1
+
+    async def publish(self, event):
+        async with self._changed:
+            self.events.append(event)
+            if event.get("done"):
+                self.done = True
+            self._changed.notify_all()
+
+    async def subscribe(self):
+        """Yield every event of this flight, from the beginning."""
+        index = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: index < len(self.events) or self.done)
+                events = self.events[index:]
+            for event in events:
+                yield event
+            index += len(events)
+            if self.done and index >= len(self.events):
+                return
+
+    async def result(self):
+        """Final event as a response body (/summarize or /analyze_audio)."""
+        final = {"error": "Summarization ended without a result"}
+        async for event in self.subscribe():
+            if event.get("done"):
+                final = {k: v for k, v in event.items() if k != "done"}
+        if "error" in final and self.mergeable:
+            return {"summary": f"Error during summarization: {final['error']}", "error": final["error"]}
+        return final
+
+
+class SummaryCoalescer:
+    """
+    Per-session single-flight for everything that updates the running summary.
+
+    Flights run one at a time, in arrival order, so incremental text
+    summaries and audio analyses never race on current_summary. Text
+    requests arriving while a flight runs are merged into the one queued
+    text flight behind it. Duplicates are recognised by the client's
+    transcript offset (`offset`: where `text` starts in its transcript),
+    not by text equality, so a genuinely repeated line is still summarized:
+    a request whose range is already covered shares that flight's result,
+    and a client resending from its last acknowledged offset only adds the
+    part past what is in flight. Requests without an offset are always new.
+    """
+
+    def __init__(self, summarizer):
+        self.summarizer = summarizer
+        self.running = None
+        self.queue = []  # Flights waiting behind `running`, in order
+        self._task = None
+
+    def submit(self, text, meeting_title=None, user_notes=None, offset=None):
+        """Return the Flight that will cover `text` (starting one if idle)."""
+        text = text or ""
+        end = offset + len(text) if offset is not None else None
+        if offset is not None:
+            covered = self._covered_end()
+            if covered is not None and covered >= end:
+                flight = self._flight_covering(end)
+                flight.callers += 1
+                metrics.SUMMARY_COALESCED.inc(outcome="duplicate")
+                return flight
+            if covered is not None and covered > offset:
+                text = text[covered - offset:]
+
+        last = self.queue[-1] if self.queue else None
+        if last is not None and last.mergeable:
+            last.merge(text, meeting_title, user_notes, end)
+            metrics.SUMMARY_COALESCED.inc(outcome="merged")
+            return last
+        return self._enqueue(Flight(text, meeting_title, user_notes, end=end))
+
+    def submit_call(self, source):
+        """
+        Run `source()` (an async iterator of summarizer events, e.g. an audio
+        analysis stream) once every earlier flight has finished.
+        """
+        return self._enqueue(Flight(source=source))
+
+    def submit_audio(self, audio, **kwargs):
+        """Queue summarizer.analyze_audio_stream(audio, **kwargs) behind earlier flights."""
+        return self.submit_call(lambda: self.summarizer.analyze_audio_stream(audio, **kwargs))
+
+    def _covered_end(self):
+        ends = [f.end for f in [self.running] + self.queue if f is not None and f.end is not None]
+        return max(ends) if ends else None
+
+    def _flight_covering(self, end):
+        for flight in [self.running] + self.queue:
+            if flight is not None and flight.end is not None and flight.end >= end:
+                return flight
+
+    def _enqueue(self, flight):
+        if self.running is None:
+            self.running = flight
+            self._task = asyncio.create_task(self._run())
+        else:
+            self.queue.append(flight)
+        return flight
+
+    def _events(self, flight):
+        if flight.source is not None:
+            return flight.source()
+        return self.summarizer.summarize_stream(
+            flight.text, meeting_title=flight.meeting_title, user_notes=flight.user_notes)
+
+    async def _run(self):
+        flight = self.running
+        while flight is not None:
+            # The drain task inherited the first submitter's context; bill each flight to its own endpoint
+            token = metrics.current_endpoint.set(flight.endpoint)
+            try:
+                async for event in self._events(flight):
+                    if event.get("done") and flight.callers > 1:
+                        event = dict(event, coalesced_requests=flight.callers)
+                    await flight.publish(event)
+            except Exception as e:
+                print(f"Error during coalesced summarization: {e}")
+            finally:
+                metrics.current_endpoint.reset(token)
+            if not flight.done:
+                await flight.publish({"error": "Summarization ended without a result", "done": True})
+            # The next flight (if any) starts only now, on top of the updated summary
+            self.running = self.queue.pop(0) if self.queue else None
+            flight = self.running
+
+    @property
+    def busy(self):
+        return self.running is not None
@@ -0,0 +1,132 @@
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+
+class EnergyVad:
+    """
+    Cheap frame-level voice activity detector.
+    Speech is any frame whose RMS clears an adaptive noise floor by `ratio`,
+    so it runs on every incoming frame without touching the model.
+    """
+
+    def __init__(self, ratio=3.0, min_rms=0.004, floor_decay=0.95):
+        self.ratio = ratio
+        self.min_rms = min_rms
+        self.floor_decay = floor_decay
+        self.noise_floor = min_rms
+
+    def is_speech(self, frame):
+        rms = float(np.sqrt(np.mean(frame * frame))) if len(frame) else 0.0
+        speech = rms > max(self.min_rms, self.noise_floor * self.ratio)
+        if not speech:
+            # Track background level only on non-speech frames
+            self.noise_floor = self.floor_decay * self.noise_floor + (1 - self.floor_decay) * rms
+        return speech
+
+
+class StreamingSession:
+    """
+    VAD-gated utterance segmentation for one live audio stream.
+    feed() takes 16 kHz mono PCM (int16 little-endian) and reports when the
+    caller should run an interim decode ("partial") or a final decode of a
+    completed utterance ("final"). Decoding itself is left to the caller.
+    """
+
+    def __init__(self, frame_ms=30, partial_interval=None, silence_ms=None, max_utterance_s=None,
+                 min_speech_ms=250, preroll_ms=300, vad=None):
+        self.frame_len = SAMPLE_RATE * frame_ms // 1000
+        self.partial_samples = int(SAMPLE_RATE * (partial_interval or 0.6))
+        self.silence_frames = (silence_ms or 700) // frame_ms
+        self.max_utterance_samples = int(SAMPLE_RATE * (max_utterance_s or 15))
+        self.min_speech_frames = min_speech_ms // frame_ms
+        self.preroll_frames = preroll_ms // frame_ms
+        self.vad = vad or EnergyVad()
+
+        self.result_index = 0  # Index of the utterance currently being built
+        self._pending = np.zeros(0, dtype=np.float32)  # Samples not yet framed
+        self._preroll = []
+        self._frames = []
+        self._speech_frames = 0
+        self._silence_run = 0
+        self._since_partial = 0
+
+    @property
+    def in_utterance(self):
+        return self._speech_frames >= self.min_speech_frames
+
+    def utterance_audio(self):
+        return np.concatenate(self._frames) if self._frames else np.zeros(0, dtype=np.float32)
+
+    def feed(self, pcm_bytes):
+        """Append PCM and return "final", "partial" or None."""
+        samples = np.frombuffer(pcm_bytes, dtype="<i2").astype(np.float32) / 32768.0
+        self._pending = np.concatenate([self._pending, samples])
+
+        action = None
+        while len(self._pending) >= self.frame_len:
+            frame = self._pending[:self.frame_len]
+            self._pending = self._pending[self.frame_len:]
+            if self._push_frame(frame):
+                return "final"
+            if self.in_utterance and self._since_partial >= self.partial_samples:
+                self._since_partial = 0
+                action = "partial"
+        return action
+
+    def _push_frame(self, frame):
+        speech = self.vad.is_speech(frame)
+        if not self._frames and not speech:
+            # Idle: keep a short pre-roll so word onsets are not clipped
+            self._preroll.append(frame)
+            if len(self._preroll) > self.preroll_frames:
+                self._preroll.pop(0)
+            return False
+
+        if not self._frames:
+            self._frames.extend(self._preroll)
+            self._preroll = []
+        self._frames.append(frame)
+        self._since_partial += len(frame)
+
+        if speech:
+            self._speech_frames += 1
+            self._silence_run = 0
+        else:
+            self._silence_run += 1
+            if not self.in_utterance and self._silence_run >= self.silence_frames:
+                # A short blip, not speech: drop it
+                self._reset_utterance()
+                return False
+
+        total = sum(len(f) for f in self._frames)
+        ended = self.in_utterance and self._silence_run >= self.silence_frames
+        return ended or total >= self.max_utterance_samples
+
+    def take_utterance(self):
+        """Return the completed utterance audio (trailing silence trimmed) and start the next one."""
+        frames = self._frames[:len(self._frames) - self._silence_run] if self._silence_run else self._frames
+        audio = np.concatenate(frames) if frames else np.zeros(0, dtype=np.float32)
+        self._reset_utterance()
+        self.result_index += 1
+        return audio
+
+    def flush(self):
+        """Return any in-progress utterance at end of stream, or None."""
+        if self.in_utterance:
+            return self.take_utterance()
+        return None
+
+    def _reset_utterance(self):
+        self._frames = []
+        self._speech_frames = 0
+        self._silence_run = 0
+        self._since_partial = 0
+
+
+def recognition_result(result_index, transcript, is_final):
+    """Shape a hypothesis like a Web Speech API SpeechRecognitionEvent."""
+    return {
+        "resultIndex": result_index,
+        "results": [{"isFinal": is_final, "alternatives": [{"transcript": transcript}]}],
+    }
@@ -1,39 +1,87 @@
-from google import genai
+import asyncio
 import os
-from dotenv import load_dotenv
+from audio_ingest import guess_audio_mime_type
+from context_budget import ContextBudget, estimate_tokens
+from response_cache import ResponseCache
+from file_manager import GeminiFileManager
+from rate_limiter import RateLimiter
+from single_flight import SummaryCoalescer
+import metrics
 
 class Summarizer:
-    def __init__(self, api_key=None, model_name=None):
-        load_dotenv()
+    def __init__(self, api_key=None, model_name=None, client=None, cache=None, file_manager=None, limiter=None):
         self.api_key = api_key or os.getenv("GOOGLE_API_KEY")
-        if not self.api_key:
+        if not self.api_key and client is None:
             raise ValueError("GOOGLE_API_KEY is not set in environment variables or provided.")
-        
+
         # Priority: Argument > Env Var > Default
         self.model_name = model_name or os.getenv("GEMINI_MODEL_NAME", "gemini-1.5-flash")
-        
-        self.client = genai.Client(api_key=self.api_key)
+
+        # A shared client lets per-meeting summarizers reuse one connection pool
+        if client is None:
+            from google import genai  # Heavy import; only needed when no client is injected
+            client = genai.Client(api_key=self.api_key)
+        self.client = client
+        self.on_summary = None  # Called with every new running summary (session store persistence)
+        self.restored = None  # Future of the one-time resume from the session store (set by the server)
         self.current_summary = ""  # Store the running summary
+        # Serializes incremental updates of current_summary (one Gemini call in flight)
+        self.coalescer = SummaryCoalescer(self)
+        # Prompt-keyed response cache, shared across sessions like the client
+        self.cache = cache or ResponseCache()
+        # Dedups audio uploads by SHA-256 and deletes remote files when unused
+        self.files = file_manager or GeminiFileManager(self.client)
+        # RPM/TPM pacing, adaptive concurrency and retries; shared so all sessions respect one quota
+        self.limiter = limiter or RateLimiter(self.model_name)
+
+        # Map-reduce settings for long transcripts (characters / concurrent calls)
+        self.map_reduce_threshold = int(os.getenv("SUMMARY_MAP_REDUCE_CHARS", "12000"))
+        self.map_chunk_chars = int(os.getenv("SUMMARY_CHUNK_CHARS", "6000"))
+        self.map_parallelism = int(os.getenv("SUMMARY_MAX_PARALLEL", "4"))
+
+        # Bound the context re-sent on every incremental call
+        self.budget = ContextBudget()
+        self.token_counter = os.getenv("SUMMARY_TOKEN_COUNTER", "local")  # local | api
+        # Optional CPU stage before audio upload (silence trim, 16 kHz mono, Opus)
+        self.preprocess = os.getenv("SCRIBE_AUDIO_PREPROCESS", "0") == "1"
+
+        # Segmented analysis of long recordings (seconds); parallelism is SUMMARY_MAX_PARALLEL
+        self.audio_segment_mode = os.getenv("SUMMARY_AUDIO_SEGMENT_MODE", "auto")  # auto | always | off
+        self.audio_segment_threshold = float(os.getenv("SUMMARY_AUDIO_SEGMENT_THRESHOLD_SECONDS", "1200"))
+        self.audio_window_seconds = float(os.getenv("SUMMARY_AUDIO_WINDOW_SECONDS", "600"))
+        self.audio_max_window_seconds = float(os.getenv("SUMMARY_AUDIO_MAX_WINDOW_SECONDS", "1800"))
+        self.audio_overlap_seconds = float(os.getenv("SUMMARY_AUDIO_OVERLAP_SECONDS", "30"))
         print(f"Summarizer initialized with model: {self.model_name}")
 
+    @property
+    def current_summary(self):
+        return self._current_summary
+
+    @current_summary.setter
+    def current_summary(self, summary):
+        changed = summary != getattr(self, "_current_summary", None)
+        self._current_summary = summary
+        if changed and summary and self.on_summary:
+            try:
+                self.on_summary(summary)
+            except Exception as e:
+                print(f"Summary hook failed: {e}")
+
     def reset(self):
         """Reset the accumulated summary context."""
         self.current_summary = ""
         print("Summary context reset.")
 
-    def summarize(self, text, meeting_title=None, user_notes=None):
-        """
-        Summarize the provided text using Gemini.
-        If previous summary exists, it performs an incremental update.
-        """
-        if not text or len(text.strip()) == 0:
-            return {"summary": self.current_summary, "usage": None}
+    def for_session(self):
+        """Create a summarizer with its own summary context sharing this client."""
+        return Summarizer(api_key=self.api_key, model_name=self.model_name, client=self.client, cache=self.cache,
+                          file_manager=self.files, limiter=self.limiter)
 
-        print("Summarizing text (Incremental)...")
-        
+    def _build_summary_prompt(self, text, meeting_title=None, user_notes=None):
+        """Build the (incremental) text summarization prompt."""
         # Prepare title string
         title_str = meeting_title if meeting_title else "General Meeting"
-        
+
         # Prepare User Notes Section
         notes_section = ""
         if user_notes and len(user_notes) > 0:
@@ -41,7 +89,7 @@ class Summarizer:
             for note in user_notes:
                 notes_section += f"- {note}\n"
             notes_section += "\n(End of Human Notes)\n"
-        
+
         if self.current_summary:
             prompt_template = os.getenv(
                 "GEMINI_INCREMENTAL_PROMPT",
@@ -69,47 +117,350 @@ class Summarizer:
                       "**Instructions**:\n"
                       "1. Create a structured summary.\n"
                       "2. **Reflect any Human Scribe Notes** in the summary as verified facts.")
+        return prompt
+
+    def _build_usage(self, response):
+        """Extract token usage and estimated cost from a Gemini response."""
+        usage = getattr(response, "usage_metadata", None)
+        input_tokens = (usage.prompt_token_count or 0) if usage else 0
+        output_tokens = (usage.candidates_token_count or 0) if usage else 0
+        total_tokens = (usage.total_token_count or 0) if usage else 0
+
+        # Calculate cost (Gemini 1.5 Flash pricing: Input $0.075/1M, Output $0.30/1M)
+        # Note: Pricing may vary based on specific model version and region.
+        total_cost = self._calculate_cost(input_tokens, output_tokens)
+        metrics.record_usage(self.model_name, input_tokens, output_tokens, total_cost)
+
+        print(f"Usage: Input {input_tokens}, Output {output_tokens}, Cost ${total_cost:.6f}")
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": total_tokens,
+            "estimated_cost_usd": total_cost,
+            "currency": "USD"
+        }
+
+    def _cached_usage(self):
+        """Usage block for a response served from the cache (nothing billed)."""
+        metrics.record_cache_hit()
+        return {
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "total_tokens": 0,
+            "estimated_cost_usd": 0.0,
+            "currency": "USD",
+            "cached": True
+        }
 
+    @staticmethod
+    def _token_cost(contents):
+        """Estimated prompt tokens for the rate limiter (text parts only; reconciled after the call)."""
+        parts = contents if isinstance(contents, list) else [contents]
+        return sum(estimate_tokens(p) for p in parts if isinstance(p, str))
 
+    @staticmethod
+    def _billed_tokens(response):
+        usage = getattr(response, "usage_metadata", None)
+        return (usage.total_token_count or 0) if usage else None
+
+    async def _generate_async(self, contents, operation="generate"):
+        """generate_content through the shared rate limiter (paced, retried on 429/5xx)."""
+        return await self.limiter.call(
+            lambda: self.client.aio.models.generate_content(model=self.model_name, contents=contents),
+            operation, self._token_cost(contents), self._billed_tokens)
+
+    async def _generate_text_async(self, prompt):
+        """generate_content for a text prompt through the response cache. Returns (text, usage)."""
+        key = self.cache.make_key(self.model_name, prompt)
+        cached = self.cache.get(key)
+        if cached is not None:
+            print("Response cache hit (0 tokens billed)")
+            return cached, self._cached_usage()
+        response = await self._generate_async(prompt)
+        self.cache.put(key, response.text)
+        return response.text, self._build_usage(response)
+
+    def _merge_usage(self, usages):
+        """Sum several usage blocks into one."""
+        usages = [u for u in usages if u]
+        if not usages:
+            return None
+        merged = {
+            "input_tokens": sum(u["input_tokens"] for u in usages),
+            "output_tokens": sum(u["output_tokens"] for u in usages),
+            "total_tokens": sum(u["total_tokens"] for u in usages),
+            "estimated_cost_usd": sum(u["estimated_cost_usd"] for u in usages),
+            "currency": "USD"
+        }
+        if all(u.get("cached") for u in usages):
+            merged["cached"] = True
+        return merged
+
+    def _split_transcript(self, text, max_chars):
+        """
+        Split a transcript into chunks of roughly max_chars, cutting only
+        before the '- ' segment lines the client builds.
+        """
+        chunks = []
+        current = []
+        size = 0
+        for line in text.splitlines():
+            if current and size + len(line) > max_chars and line.lstrip().startswith("- "):
+                chunks.append("\n".join(current))
+                current = []
+                size = 0
+            current.append(line)
+            size += len(line) + 1
+        if current:
+            chunks.append("\n".join(current))
+        return chunks
+
+    def _needs_map_reduce(self, text):
+        return self.map_reduce_threshold > 0 and len(text) > self.map_reduce_threshold
+
+    def _build_map_prompt(self, chunk, index, total, meeting_title=None):
+        title_str = meeting_title if meeting_title else "General Meeting"
+        return (f"Meeting Title: {title_str}\n\n"
+                f"This is part {index + 1} of {total} of a long meeting transcript:\n\n{chunk}\n\n"
+                "**Task**: Summarize ONLY this part.\n"
+                "**Instructions**:\n"
+                "1. List the topics discussed, decisions made and action items (with owners if mentioned).\n"
+                "2. Keep speaker names and numbers exactly as stated.\n"
+                "3. Be concise; this is an intermediate note, not the final minute.\n"
+                "4. Keep the output in Korean.")
+
+    def _build_reduce_prompt(self, partials, meeting_title=None, user_notes=None):
+        title_str = meeting_title if meeting_title else "General Meeting"
+
+        notes_section = ""
+        if user_notes and len(user_notes) > 0:
+            notes_section = "\n\n📝 **Human Scribe Notes (HIGH PRIORITY - USE AS GUIDE):**\n"
+            for note in user_notes:
+                notes_section += f"- {note}\n"
+            notes_section += "\n(End of Human Notes)\n"
+
+        previous = ""
+        if self.current_summary:
+            previous = f"Here is the summary of the meeting so far:\n{self.current_summary}\n\n"
+
+        parts = "\n\n".join(f"### Part {i + 1}\n{p}" for i, p in enumerate(partials))
+        return (f"{previous}"
+                f"Meeting Title: {title_str}\n\n"
+                f"{notes_section}"
+                f"Here are notes for consecutive parts of the new transcript, in order:\n\n{parts}\n\n"
+                "**Task**: Merge everything into a single meeting minute.\n"
+                "**Instructions**:\n"
+                "1. Structure: **## 1. 회의 개요 (Overview)**, **## 2. 주요 논의 (Key Topics)**, "
+                "**## 3. 결정 사항 (Decisions)**, **## 4. 향후 계획 (Action Items)**.\n"
+                "2. Remove duplicates across parts and keep the chronological flow.\n"
+                "3. **Reflect any Human Scribe Notes** as verified facts.\n"
+                "4. Keep the output in Korean.")
+
+    async def _map_transcript(self, text, meeting_title=None):
+        """Summarize transcript chunks concurrently (bounded). Returns (partials, usages)."""
+        chunks = self._split_transcript(text, self.map_chunk_chars)
+        semaphore = asyncio.Semaphore(max(1, self.map_parallelism))
+        print(f"Map-reduce summarization: {len(chunks)} chunks, parallelism {self.map_parallelism}")
+
+        async def summarize_chunk(index, chunk):
+            async with semaphore:
+                return await self._generate_text_async(
+                    self._build_map_prompt(chunk, index, len(chunks), meeting_title)
+                )
+
+        results = await asyncio.gather(*(summarize_chunk(i, c) for i, c in enumerate(chunks)))
+        return [r[0] for r in results], [r[1] for r in results]
+
+    async def _summarize_map_reduce(self, text, meeting_title=None, user_notes=None):
+        user_notes, compact_usage = await self._fit_context_async(user_notes)
+        partials, usages = await self._map_transcript(text, meeting_title)
+        summary, reduce_usage = await self._generate_text_async(
+            self._build_reduce_prompt(partials, meeting_title, user_notes)
+        )
+        usage = self._merge_usage([compact_usage] + usages + [reduce_usage])
+        usage["map_reduce_chunks"] = len(partials)
+
+        self.current_summary = summary
+        return {"summary": self.current_summary, "usage": usage}
+
+    def _build_compact_prompt(self):
+        return (f"Here is the running meeting minute:\n{self.current_summary}\n\n"
+                "**Task**: Compact this minute so that later updates stay small.\n"
+                "**Instructions**:\n"
+                f"1. Target length: about {self.budget.compact_target_tokens} tokens.\n"
+                "2. Condense older discussion in the topic sections into short bullets.\n"
+                "3. Keep ALL decisions and action items (owners, dates, numbers) intact.\n"
+                "4. Keep the same Markdown section structure and the same language (Korean).")
+
+    async def _count_tokens_async(self, text):
+        if self.token_counter == "api":
+            try:
+                response = await self.limiter.call(
+                    lambda: self.client.aio.models.count_tokens(model=self.model_name, contents=text),
+                    "count_tokens")
+                return response.total_tokens
+            except Exception as e:
+                print(f"count_tokens failed, using local estimate: {e}")
+        return estimate_tokens(text)
+
+    async def _fit_context_async(self, user_notes, timeline=False):
+        """
+        Keep the re-sent context within budget: dedupe/trim notes and compact
+        current_summary once it crosses SUMMARY_CONTEXT_MAX_TOKENS.
+        timeline=True (audio) keeps the first and last notes when trimming.
+        Returns (notes, compaction usage or None).
+        """
+        notes = self.budget.fit_notes(user_notes, timeline=timeline)
+        if not self.current_summary:
+            return notes, None
+        tokens = await self._count_tokens_async(self.current_summary)
+        if not self.budget.needs_compaction(tokens):
+            return notes, None
+
+        print(f"Compacting running summary ({tokens} > {self.budget.summary_max_tokens} tokens)...")
+        response = await self._generate_async(self._build_compact_prompt(), "compact")
+        self.current_summary = response.text
+        return notes, self._build_usage(response)
+
+    @staticmethod
+    def _run_sync(coro):
+        """
+        Run a coroutine to completion for the blocking API (scripts, no event
+        loop). Inside a running loop it raises instead of stalling the loop:
+        await the *_async method there.
+        """
         try:
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=prompt
-            )
-            
-            # Extract token usage
-            usage = response.usage_metadata
-            input_tokens = usage.prompt_token_count if usage else 0
-            output_tokens = usage.candidates_token_count if usage else 0
-            total_tokens = usage.total_token_count if usage else 0
-            
-            # Calculate cost (Gemini 1.5 Flash pricing: Input $0.075/1M, Output $0.30/1M)
-            # Note: Pricing may vary based on specific model version and region.
-            input_price = float(os.getenv("GEMINI_INPUT_PRICE_PER_1M", 0.075))
-            output_price = float(os.getenv("GEMINI_OUTPUT_PRICE_PER_1M", 0.30))
-            
-            input_cost = (input_tokens / 1_000_000) * input_price
-            output_cost = (output_tokens / 1_000_000) * output_price
-            total_cost = input_cost + output_cost
-            
-            print(f"Usage: Input {input_tokens}, Output {output_tokens}, Cost ${total_cost:.6f}")
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+        coro.close()
+        raise RuntimeError("Blocking Summarizer call inside a running event loop; await the *_async method instead")
+
+    def summarize(self, text, meeting_title=None, user_notes=None):
+        """Blocking wrapper around summarize_async()."""
+        return self._run_sync(self.summarize_async(text, meeting_title, user_notes))
+
+    async def summarize_async(self, text, meeting_title=None, user_notes=None):
+        """
+        Summarize the provided text using Gemini (async client, client.aio).
+        If previous summary exists, it performs an incremental update.
+        Texts longer than SUMMARY_MAP_REDUCE_CHARS are split on segment lines,
+        summarized concurrently and merged (map-reduce).
+        """
+        if not text or len(text.strip()) == 0:
+            return {"summary": self.current_summary, "usage": None}
+
+        try:
+            if self._needs_map_reduce(text):
+                return await self._summarize_map_reduce(text, meeting_title, user_notes)
+
+            print("Summarizing text (Incremental)...")
+            user_notes, compact_usage = await self._fit_context_async(user_notes)
+            prompt = self._build_summary_prompt(text, meeting_title, user_notes)
+            summary, usage = await self._generate_text_async(prompt)
+            usage = self._merge_usage([compact_usage, usage])
 
             # Update the running summary
-            self.current_summary = response.text
+            self.current_summary = summary
 
-            return {
-                "summary": self.current_summary,
-                "usage": {
-                    "input_tokens": input_tokens,
-                    "output_tokens": output_tokens,
-                    "total_tokens": total_tokens,
-                    "estimated_cost_usd": total_cost,
-                    "currency": "USD"
-                }
-            }
+            return {"summary": self.current_summary, "usage": usage}
         except Exception as e:
             return {"summary": f"Error during summarization: {e}", "error": str(e)}
 
+    async def summarize_stream(self, text, meeting_title=None, user_notes=None):
+        """
+        Streaming variant of summarize_async().
+        Yields {"delta": ...} events while Gemini generates, then a final
+        {"summary": ..., "usage": ..., "done": True} event.
+        """
+        if not text or len(text.strip()) == 0:
+            yield {"summary": self.current_summary, "usage": None, "done": True}
+            return
+
+        extra_usages = []
+        usage_fields = None
+        try:
+            user_notes, compact_usage = await self._fit_context_async(user_notes)
+            extra_usages.append(compact_usage)
+            if self._needs_map_reduce(text):
+                # Map phase is not streamed; the reduce (final minute) is
+                partials, map_usages = await self._map_transcript(text, meeting_title)
+                extra_usages.extend(map_usages)
+                usage_fields = {"map_reduce_chunks": len(partials)}
+                prompt = self._build_reduce_prompt(partials, meeting_title, user_notes)
+            else:
+                print("Summarizing text (Incremental, streaming)...")
+                prompt = self._build_summary_prompt(text, meeting_title, user_notes)
+        except Exception as e:
+            print(f"Error preparing summary: {e}")
+            yield {"error": str(e), "done": True}
+            return
+
+        async for event in self._generate_stream(prompt, extra_usages=extra_usages, usage_fields=usage_fields):
+            yield event
+
+    async def _generate_stream(self, contents, extra_usages=None, usage_fields=None):
+        """Run generate_content_stream and translate chunks into SSE-ready events."""
+        parts = []
+        usage_chunk = None
+        # Only plain text prompts are cacheable (audio prompts reference uploaded files)
+        cache_key = self.cache.make_key(self.model_name, contents) if isinstance(contents, str) else None
+        cached = self.cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            print("Response cache hit (0 tokens billed)")
+            self.current_summary = cached
+            usage = self._merge_usage((extra_usages or []) + [self._cached_usage()])
+            if usage_fields:
+                usage.update(usage_fields)
+            yield {"delta": cached}
+            yield {"summary": cached, "usage": usage, "done": True}
+            return
+
+        cost = self._token_cost(contents)
+        attempt = 0
+        try:
+            while True:
+                await self.limiter.acquire(cost, "generate_stream")
+                error = None
+                try:
+                    with metrics.gemini_call(self.model_name, "generate_stream"):
+                        stream = await self.client.aio.models.generate_content_stream(
+                            model=self.model_name,
+                            contents=contents
+                        )
+                        async for chunk in stream:
+                            # usage_metadata is cumulative; the last chunk that carries it is authoritative
+                            if getattr(chunk, "usage_metadata", None):
+                                usage_chunk = chunk
+                            delta = chunk.text
+                            if delta:
+                                parts.append(delta)
+                                yield {"delta": delta}
+                except Exception as e:
+                    error = e
+                finally:
+                    self.limiter.release(cost, None if error else self._billed_tokens(usage_chunk), exc=error)
+                if error is None:
+                    break
+                # Retry only while nothing has been streamed to the client yet
+                attempt += 1
+                delay = None if parts else self.limiter.backoff(attempt, error, "generate_stream")
+                if delay is None:
+                    raise error
+                await asyncio.sleep(delay)
+
+            # Update the running summary only once the full minute has arrived
+            self.current_summary = "".join(parts)
+            if cache_key:
+                self.cache.put(cache_key, self.current_summary)
+            usage = self._merge_usage((extra_usages or []) + [self._build_usage(usage_chunk)])
+            if usage_fields:
+                usage.update(usage_fields)
+            yield {"summary": self.current_summary, "usage": usage, "done": True}
+        except Exception as e:
+            print(f"Error during streaming generation: {e}")
+            yield {"error": str(e), "done": True}
+
     def _calculate_cost(self, input_tokens, output_tokens):
         input_price = float(os.getenv("GEMINI_INPUT_PRICE_PER_1M", 0.075))
         output_price = float(os.getenv("GEMINI_OUTPUT_PRICE_PER_1M", 0.30))
@@ -117,91 +468,257 @@ class Summarizer:
         output_cost = (output_tokens / 1_000_000) * output_price
         return input_cost + output_cost
 
+    def _guess_mime_type(self, audio_path):
+        return guess_audio_mime_type(audio_path)
+
+    async def _upload_audio_async(self, audio, mime_type=None, sha256=None, size=0):
+        """
+        Upload a path or an already-open binary file object to the Gemini Files API.
+        Passing the request's upload buffer directly avoids an extra copy on disk.
+        With a sha256 the upload goes through the file manager, which reuses an
+        earlier upload of the same bytes; the caller must then release(sha256).
+        Returns (file handle, usage fields describing the upload).
+        """
+        if isinstance(audio, (str, os.PathLike)):
+            mime_type = mime_type or self._guess_mime_type(str(audio))
+        mime_type = mime_type or "audio/mp3"
+        if sha256:
+            audio_file, reused = await self.files.acquire(sha256, audio, mime_type, size)
+            metrics.UPLOAD_BYTES.inc(size, reused=reused)
+            return audio_file, {"upload_reused": reused, "upload_bytes_saved": size if reused else 0}
+
+        print(f"Uploading audio file: {audio if isinstance(audio, (str, os.PathLike)) else 'upload buffer'}")
+        with metrics.gemini_call(self.model_name, "upload"):
+            audio_file = await self.client.aio.files.upload(file=audio, config={'mime_type': mime_type})
+        metrics.UPLOAD_BYTES.inc(size, reused=False)
+        print(f"File uploaded. URI: {audio_file.uri} (MIME: {mime_type})")
+        return audio_file, {}
+
+    async def _preprocess_audio_async(self, audio, mime_type, sha256, size, user_notes):
+        """
+        Trim silence, downmix to 16 kHz mono and re-encode to Opus before upload
+        (SCRIBE_AUDIO_PREPROCESS=1). Note timestamps are remapped onto the trimmed
+        timeline. Falls back to the original audio if preprocessing fails.
+        Returns (audio, mime_type, sha256, size, user_notes, usage fields).
+        """
+        if not self.preprocess:
+            return audio, mime_type, sha256, size, user_notes, {}
+        try:
+            from audio_preprocess import preprocess_audio, remap_notes
+            result = await asyncio.to_thread(preprocess_audio, audio, size)
+        except Exception as e:
+            print(f"Audio preprocessing failed, uploading the original: {e}")
+            return audio, mime_type, sha256, size, user_notes, {}
+
+        stats = result.stats
+        print(f"Preprocessed audio: {stats['bytes_in']} -> {stats['bytes_out']} bytes, "
+              f"{stats['seconds_in']}s -> {stats['seconds_out']}s")
+        metrics.PREPROCESS_SAVED.inc(stats["bytes_saved"], unit="bytes")
+        metrics.PREPROCESS_SAVED.inc(stats["seconds_saved"], unit="seconds")
+        fields = {"preprocess": {**stats, "time_map": result.time_map.to_list()}}
+        return (result.file, result.mime_type, result.sha256, result.size,
+                remap_notes(user_notes, result.time_map), fields)
+
+    def _build_audio_prompt(self, meeting_title=None, user_notes=None):
+        """Build the audio analysis prompt (full or incremental)."""
+        title_str = meeting_title if meeting_title else "General Meeting"
+
+        # Prepare User Notes Section
+        notes_section = ""
+        if user_notes and len(user_notes) > 0:
+            notes_section = "\n\n📝 **Human Scribe Notes (TIMELINE LOG - CRITICAL):**\n"
+            notes_section += "Use these timestamped notes to identify speakers and verify facts.\n"
+            for note in user_notes:
+                notes_section += f"- {note}\n"
+            notes_section += "\n(End of Human Notes)\n"
+
+        if self.current_summary:
+            print("Analyzing audio with incremental context...")
+            prompt = (
+                "You are a professional meeting scribe. \n"
+                "We are in the middle of a meeting. Here is the meeting minute so far:\n"
+                f"{self.current_summary}\n\n"
+                f"Meeting Title: {title_str}\n\n"
+                f"{notes_section}"
+                "**Task**: Listen to the ATTACHED AUDIO (which is the next part of the meeting) and UPDATE the meeting minute.\n"
+                "**Instructions:**\n"
+                "1. **Merge** new information into the existing structure (Overview, Key Topics, Decisions, Action Items).\n"
+                "2. **Identify Speakers**: Use the provided Human Scribe Notes to correctly label speakers.\n"
+                "3. Language: **Korean** (keep technical terms in English).\n"
+                "4. Output the **entire updated meeting minute** in Markdown."
+            )
+        else:
+            prompt = (
+                "You are a professional meeting scribe. "
+                "Listen to the attached audio and generate a structured meeting minute.\n"
+                f"Meeting Title: {title_str}\n\n"
+                f"{notes_section}"
+                "**Instructions:**\n"
+                "1. **Identify Speakers**: Distinction between speakers is crucial. Use the Human Scribe Notes to assign names if provided.\n"
+                "2. Language: **Korean** (keep technical terms in English).\n"
+                "3. Format: Use Markdown.\n"
+                "4. Structure:\n"
+                "   - **## 1. 회의 개요 (Overview)**: Brief context.\n"
+                "   - **## 2. 주요 논의 (Key Topics)**: Bullet points of discussed items.\n"
+                "   - **## 3. 결정 사항 (Decisions)**: Clear conclusions.\n"
+                "   - **## 4. 향후 계획 (Action Items)**: To-do list.\n"
+                "   - **## 5. 상세 대화록 (Transcript)**: (Optional) If possible, provide a segmented transcript with speaker labels."
+            )
+        return prompt
+
+    # Lowest bitrate a speech recording plausibly has (6 kbps Opus); smaller uploads cannot be long
+    MIN_AUDIO_BYTES_PER_SECOND = 750
+
+    async def _plan_audio_segments_async(self, audio, size=0):
+        """
+        Windows [(start, end)] for segmented analysis, or None for a single call.
+        Recordings past SUMMARY_AUDIO_SEGMENT_THRESHOLD_SECONDS are split into at
+        most SUMMARY_MAX_PARALLEL windows (each between SUMMARY_AUDIO_WINDOW_SECONDS
+        and SUMMARY_AUDIO_MAX_WINDOW_SECONDS long), so they are analyzed in a
+        single concurrent round and wall-clock time stays roughly flat.
+        """
+        if self.audio_segment_mode == "off":
+            return None
+        if (self.audio_segment_mode == "auto" and size
+                and size < self.audio_segment_threshold * self.MIN_AUDIO_BYTES_PER_SECOND):
+            return None  # Skip the probe (a container open, or a demux scan for WebM)
+        try:
+            from audio_preprocess import probe_duration, plan_windows
+            duration = await asyncio.to_thread(probe_duration, audio)
+        except Exception as e:
+            print(f"Could not determine audio duration, analyzing in one call: {e}")
+            return None
+        if not duration or (self.audio_segment_mode != "always" and duration < self.audio_segment_threshold):
+            return None
+
+        window = duration / max(1, self.map_parallelism)
+        window = min(max(window, self.audio_window_seconds), self.audio_max_window_seconds)
+        windows = plan_windows(duration, window, self.audio_overlap_seconds)
+        return windows if len(windows) > 1 else None
+
+    def _build_audio_map_prompt(self, index, total, start, end, meeting_title=None, user_notes=None):
+        title_str = meeting_title if meeting_title else "General Meeting"
+        notes_section = ""
+        if user_notes:
+            notes_section = "📝 **Human Scribe Notes for this part:**\n" + "".join(f"- {n}\n" for n in user_notes) + "\n"
+        return (f"Meeting Title: {title_str}\n\n"
+                f"{notes_section}"
+                f"The attached audio is part {index + 1} of {total} of a long meeting recording, "
+                f"covering {self._format_offset(start)}-{self._format_offset(end)} of the full recording. "
+                f"Consecutive parts overlap by about {int(self.audio_overlap_seconds)} seconds.\n\n"
+                "**Task**: Take notes on ONLY this part.\n"
+                "**Instructions**:\n"
+                "1. List topics discussed, decisions made and action items (with owners if mentioned).\n"
+                "2. **Identify Speakers** using the Human Scribe Notes if provided.\n"
+                "3. Add a short segmented transcript with speaker labels; give timestamps relative "
+                "to the FULL recording (add the part's start offset).\n"
+                "4. Be concise; this is an intermediate note, not the final minute. Keep the output in Korean.")
+
+    @staticmethod
+    def _format_offset(seconds):
+        seconds = int(seconds)
+        return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+    def _build_audio_reduce_prompt(self, partials, meeting_title=None, user_notes=None):
+        """`partials` are (start, end, text) for the segments that were actually analyzed."""
+        title_str = meeting_title if meeting_title else "General Meeting"
+        notes_section = ""
+        if user_notes:
+            notes_section = "📝 **Human Scribe Notes (TIMELINE LOG - CRITICAL):**\n" + "".join(f"- {n}\n" for n in user_notes) + "\n"
+        previous = ""
+        if self.current_summary:
+            previous = f"Here is the meeting minute so far (earlier audio):\n{self.current_summary}\n\n"
+
+        parts = "\n\n".join(
+            f"### Part {i + 1} ({self._format_offset(start)}-{self._format_offset(end)})\n{p}"
+            for i, (start, end, p) in enumerate(partials)
+        )
+        return (f"{previous}"
+                f"Meeting Title: {title_str}\n\n"
+                f"{notes_section}"
+                f"Here are notes for consecutive, slightly overlapping parts of the recording, in order:\n\n{parts}\n\n"
+                "**Task**: Merge everything into a single meeting minute.\n"
+                "**Instructions:**\n"
+                "1. Parts overlap: merge statements that appear at the end of one part and the start of the next.\n"
+                "2. Language: **Korean** (keep technical terms in English). Format: Markdown.\n"
+                "3. Structure:\n"
+                "   - **## 1. 회의 개요 (Overview)**: Brief context.\n"
+                "   - **## 2. 주요 논의 (Key Topics)**: Bullet points of discussed items.\n"
+                "   - **## 3. 결정 사항 (Decisions)**: Clear conclusions.\n"
+                "   - **## 4. 향후 계획 (Action Items)**: To-do list.\n"
+                "   - **## 5. 상세 대화록 (Transcript)**: Segmented transcript with speaker labels, in chronological order.")
+
+    async def _map_audio_segments(self, audio, windows, meeting_title=None, user_notes=None):
+        """
+        Split audio into windows and analyze them concurrently (bounded by
+        SUMMARY_MAX_PARALLEL). Returns (partials, usages, upload fields), one
+        (start, end, text) partial per segment split_audio() produced; windows
+        that yielded no audio are skipped, so the spans come from the segments.
+        """
+        from audio_preprocess import split_audio, notes_in_window
+
+        segments = await asyncio.to_thread(split_audio, audio, windows)
+        semaphore = asyncio.Semaphore(max(1, self.map_parallelism))
+        print(f"Segmented audio analysis: {len(segments)} windows, parallelism {self.map_parallelism}")
+
+        async def analyze_segment(index, segment):
+            async with semaphore:
+                handle, fields = await self._upload_audio_async(segment.file, segment.mime_type,
+                                                                segment.sha256, segment.size)
+                try:
+                    prompt = self._build_audio_map_prompt(index, len(segments), segment.start, segment.end,
+                                                          meeting_title,
+                                                          notes_in_window(user_notes, segment.start, segment.end))
+                    response = await self._generate_async([prompt, handle])
+                    return response.text, self._build_usage(response), fields
+                finally:
+                    self.files.release(segment.sha256, handle)
+
+        results = await asyncio.gather(*(analyze_segment(i, seg) for i, seg in enumerate(segments)))
+        upload_fields = {
+            "audio_segments": len(segments),
+            "upload_reused": all(r[2]["upload_reused"] for r in results),
+            "upload_bytes_saved": sum(r[2]["upload_bytes_saved"] for r in results),
+        }
+        partials = [(seg.start, seg.end, r[0]) for seg, r in zip(segments, results)]
+        return partials, [r[1] for r in results], upload_fields
+
     def analyze_audio(self, audio_path, meeting_title=None, user_notes=None):
+        """Blocking wrapper around analyze_audio_async()."""
+        return self._run_sync(self.analyze_audio_async(audio_path, meeting_title, user_notes))
+
+    async def analyze_audio_async(self, audio, meeting_title=None, user_notes=None, mime_type=None,
+                                  sha256=None, size=0):
         """
-        Uploads an audio file to Gemini and generates a structured meeting minute.
+        Upload audio to Gemini and generate a structured meeting minute.
+        Both the upload and the generation run on the genai async client so
+        the event loop stays responsive. `audio` is a file path or an open
+        binary file object (with mime_type). Pass the content sha256 (and
+        size) to reuse an earlier upload; without it the remote file is
+        deleted once the analysis is done.
         """
-        print(f"Uploading audio file: {audio_path}")
+        audio_file = None
         try:
-            # 1. Upload the file to Gemini
-            mime_type = "audio/mp3"
-            if audio_path.lower().endswith(".webm"):
-                mime_type = "audio/webm"
-            elif audio_path.lower().endswith(".wav"):
-                mime_type = "audio/wav"
-            elif audio_path.lower().endswith(".m4a"):
-                mime_type = "audio/mp4"
-
-            with open(audio_path, "rb") as f:
-                audio_file = self.client.files.upload(file=f, config={'mime_type': mime_type})
-            print(f"File uploaded. URI: {audio_file.uri} (MIME: {mime_type})")
+            # 1. Optionally shrink the audio, then upload it to Gemini
+            audio, mime_type, sha256, size, user_notes, upload_fields = await self._preprocess_audio_async(
+                audio, mime_type, sha256, size, user_notes)
+            windows = await self._plan_audio_segments_async(audio, size)
+            if windows:
+                return await self._analyze_audio_segmented(audio, windows, meeting_title, user_notes, upload_fields)
+            audio_file, fields = await self._upload_audio_async(audio, mime_type, sha256, size)
+            upload_fields.update(fields)
 
             # 2. Prepare Prompt
-            title_str = meeting_title if meeting_title else "General Meeting"
-            
-            # Prepare User Notes Section
-            notes_section = ""
-            if user_notes and len(user_notes) > 0:
-                notes_section = "\n\n📝 **Human Scribe Notes (TIMELINE LOG - CRITICAL):**\n"
-                notes_section += "Use these timestamped notes to identify speakers and verify facts.\n"
-                for note in user_notes:
-                    notes_section += f"- {note}\n"
-                notes_section += "\n(End of Human Notes)\n"
-            
-            if self.current_summary:
-                print("Analyzing audio with incremental context...")
-                prompt = (
-                    "You are a professional meeting scribe. \n"
-                    "We are in the middle of a meeting. Here is the meeting minute so far:\n"
-                    f"{self.current_summary}\n\n"
-                    f"Meeting Title: {title_str}\n\n"
-                    f"{notes_section}"
-                    "**Task**: Listen to the ATTACHED AUDIO (which is the next part of the meeting) and UPDATE the meeting minute.\n"
-                    "**Instructions:**\n"
-                    "1. **Merge** new information into the existing structure (Overview, Key Topics, Decisions, Action Items).\n"
-                    "2. **Identify Speakers**: Use the provided Human Scribe Notes to correctly label speakers.\n"
-                    "3. Language: **Korean** (keep technical terms in English).\n"
-                    "4. Output the **entire updated meeting minute** in Markdown."
-                )
-            else:
-                prompt = (
-                    "You are a professional meeting scribe. "
-                    "Listen to the attached audio and generate a structured meeting minute.\n"
-                    f"Meeting Title: {title_str}\n\n"
-                    f"{notes_section}"
-                    "**Instructions:**\n"
-                    "1. **Identify Speakers**: Distinction between speakers is crucial. Use the Human Scribe Notes to assign names if provided.\n"
-                    "2. Language: **Korean** (keep technical terms in English).\n"
-                    "3. Format: Use Markdown.\n"
-                    "4. Structure:\n"
-                    "   - **## 1. 회의 개요 (Overview)**: Brief context.\n"
-                    "   - **## 2. 주요 논의 (Key Topics)**: Bullet points of discussed items.\n"
-                    "   - **## 3. 결정 사항 (Decisions)**: Clear conclusions.\n"
-                    "   - **## 4. 향후 계획 (Action Items)**: To-do list.\n"
-                    "   - **## 5. 상세 대화록 (Transcript)**: (Optional) If possible, provide a segmented transcript with speaker labels."
-                )
+            user_notes, compact_usage = await self._fit_context_async(user_notes, timeline=True)
+            prompt = self._build_audio_prompt(meeting_title, user_notes)
 
             # 3. Generate Content
-            # Note: 1.5 Flash is multimodal and can take the file object directly in the contents list
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=[prompt, audio_file]
-            )
-            
+            response = await self._generate_async([prompt, audio_file])
+
             # 4. Extract usage
-            usage = None
-            if hasattr(response, "usage_metadata"):
-                usage = {
-                    "input_tokens": response.usage_metadata.prompt_token_count,
-                    "output_tokens": response.usage_metadata.candidates_token_count,
-                    "total_tokens": response.usage_metadata.total_token_count,
-                    "estimated_cost_usd": self._calculate_cost(
-                        response.usage_metadata.prompt_token_count,
-                        response.usage_metadata.candidates_token_count
-                    ),
-                    "currency": "USD"
-                }
-            
+            usage = self._merge_usage([compact_usage, self._build_usage(response)])
+            usage.update(upload_fields)
+
             # Update current summary with this high quality version
             self.current_summary = response.text
 
@@ -210,3 +727,63 @@ class Summarizer:
         except Exception as e:
             print(f"Error in analyze_audio: {e}")
             return {"error": str(e)}
+        finally:
+            await self._release_audio(audio_file, sha256)
+
+    async def _release_audio(self, audio_file, sha256):
+        """Managed uploads (with a sha256) are released for reuse; one-off uploads are deleted."""
+        if audio_file is None:
+            return
+        if sha256:
+            self.files.release(sha256, audio_file)
+        else:
+            await self.files.delete(audio_file)
+
+    async def _analyze_audio_segmented(self, audio, windows, meeting_title, user_notes, upload_fields):
+        """Map-reduce over overlapping audio windows: parallel partial notes, then one merged minute."""
+        user_notes, compact_usage = await self._fit_context_async(user_notes, timeline=True)
+        partials, usages, fields = await self._map_audio_segments(audio, windows, meeting_title, user_notes)
+        summary, reduce_usage = await self._generate_text_async(
+            self._build_audio_reduce_prompt(partials, meeting_title, user_notes)
+        )
+        usage = self._merge_usage([compact_usage] + usages + [reduce_usage])
+        usage.update(upload_fields)
+        usage.update(fields)
+
+        self.current_summary = summary
+        return {"summary": summary, "usage": usage}
+
+    async def analyze_audio_stream(self, audio, meeting_title=None, user_notes=None, mime_type=None,
+                                   sha256=None, size=0):
+        """
+        Streaming variant of analyze_audio_async().
+        Yields the same events as summarize_stream().
+        """
+        audio_file = None
+        try:
+            try:
+                audio, mime_type, sha256, size, user_notes, upload_fields = await self._preprocess_audio_async(
+                    audio, mime_type, sha256, size, user_notes)
+                windows = await self._plan_audio_segments_async(audio, size)
+                user_notes, compact_usage = await self._fit_context_async(user_notes, timeline=True)
+                extra_usages = [compact_usage]
+                if windows:
+                    # Map phase is not streamed; the merged minute is
+                    partials, usages, fields = await self._map_audio_segments(audio, windows, meeting_title,
+                                                                              user_notes)
+                    extra_usages.extend(usages)
+                    contents = self._build_audio_reduce_prompt(partials, meeting_title, user_notes)
+                else:
+                    audio_file, fields = await self._upload_audio_async(audio, mime_type, sha256, size)
+                    contents = [self._build_audio_prompt(meeting_title, user_notes), audio_file]
+                upload_fields.update(fields)
+            except Exception as e:
+                print(f"Error in analyze_audio: {e}")
+                yield {"error": str(e), "done": True}
+                return
+
+            async for event in self._generate_stream(contents, extra_usages=extra_usages,
+                                                     usage_fields=upload_fields):
+                yield event
+        finally:
+            await self._release_audio(audio_file, sha256)
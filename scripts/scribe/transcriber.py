@@ -0,0 +1,122 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+def whisper_language(language):
+    """Map a BCP-47 tag like 'ko-KR' to the ISO code Whisper expects ('ko')."""
+    if not language:
+        return None
+    return language.split("-")[0].lower()
+
+
+class WhisperPool:
+    """
+    Process-wide faster-whisper model on CPU, loaded on first use (or at
+    startup with WHISPER_PRELOAD=1).
+    One WhisperModel (int8 by default) is shared by all requests; CTranslate2
+    runs up to `num_workers` decodes in parallel on it, and each file is decoded
+    in batches of `batch_size` VAD chunks through BatchedInferencePipeline.
+    Requests beyond `num_workers` wait in the pool's executor queue.
+    """
+
+    def __init__(self, model_size=None, compute_type=None, cpu_threads=None, num_workers=None, batch_size=None):
+        self.model_size = model_size or os.getenv("WHISPER_MODEL", "small")
+        self.compute_type = compute_type or os.getenv("WHISPER_COMPUTE_TYPE", "int8")
+        self.cpu_threads = cpu_threads if cpu_threads is not None else int(os.getenv("WHISPER_CPU_THREADS", "0"))
+        self.num_workers = num_workers or int(os.getenv("WHISPER_NUM_WORKERS", "2"))
+        self.batch_size = batch_size or int(os.getenv("WHISPER_BATCH_SIZE", "8"))
+        self.default_language = whisper_language(os.getenv("TRANSCRIPTION_LANGUAGE", "ko-KR"))
+
+        self.model = None
+        self.pipeline = None
+        self._load_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.num_workers, thread_name_prefix="whisper")
+
+    @property
+    def loaded(self):
+        return self.pipeline is not None
+
+    def load(self):
+        """Load the model once; safe to call from several threads."""
+        if self.pipeline is not None:
+            return self.pipeline
+        with self._load_lock:
+            if self.pipeline is None:
+                # Optional dependency: only needed when local transcription is used
+                from faster_whisper import WhisperModel, BatchedInferencePipeline
+
+                print(f"Loading Whisper model '{self.model_size}' "
+                      f"(compute_type={self.compute_type}, cpu_threads={self.cpu_threads}, workers={self.num_workers})...")
+                self.model = WhisperModel(
+                    self.model_size,
+                    device="cpu",
+                    compute_type=self.compute_type,
+                    cpu_threads=self.cpu_threads,
+                    num_workers=self.num_workers,
+                )
+                self.pipeline = BatchedInferencePipeline(model=self.model)
+                print("Whisper model loaded.")
+        return self.pipeline
+
+    def transcribe(self, audio, language=None):
+        """
+        Transcribe a path, binary file object or 16 kHz float32 array.
+        Blocking; returns text plus timestamped segments.
+        """
+        pipeline = self.load()
+        segments, info = pipeline.transcribe(
+            audio,
+            language=whisper_language(language) or self.default_language,
+            batch_size=self.batch_size,
+        )
+        # segments is a lazy generator; decoding happens while iterating
+        segment_list = [
+            {"start": round(seg.start, 2), "end": round(seg.end, 2), "text": seg.text.strip()}
+            for seg in segments
+        ]
+        return {
+            "text": "\n".join(seg["text"] for seg in segment_list if seg["text"]),
+            "language": info.language,
+            "duration": round(info.duration, 2),
+            "segments": segment_list,
+        }
+
+    async def transcribe_async(self, audio, language=None):
+        """Run transcribe() on the pool's own executor so the event loop is never blocked."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.transcribe, audio, language)
+
+    def decode_samples(self, samples, language=None, final=True):
+        """
+        Decode one short in-memory utterance (16 kHz float32) for live captions.
+        Interim passes use greedy search; final passes use beam search.
+        """
+        self.load()
+        segments, _ = self.model.transcribe(
+            samples,
+            language=whisper_language(language) or self.default_language,
+            beam_size=5 if final else 1,
+            condition_on_previous_text=False,
+            without_timestamps=True,
+            vad_filter=False,
+        )
+        return " ".join(seg.text.strip() for seg in segments).strip()
+
+    async def decode_samples_async(self, samples, language=None, final=True):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.decode_samples, samples, language, final)
+
+    def preload_in_background(self):
+        threading.Thread(target=self._preload, name="whisper-preload", daemon=True).start()
+
+    def _preload(self):
+        try:
+            self.load()
+        except Exception as e:
+            print(f"Warning: Failed to preload Whisper model: {e}")
+
+    def close(self):
+        """Stop accepting work and drop queued decodes (running ones finish in their threads)."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
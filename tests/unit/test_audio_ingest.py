@@ -0,0 +1,110 @@
+"""
+파일명: tests/unit/test_audio_ingest.py
+목적: scripts/scribe/audio_ingest.py 단위 테스트
+기능:
+  - 업로드 버퍼의 SHA-256/크기 계산 및 되감기 검증
+  - 크기 제한 초과 시 AudioTooLargeError 검증
+  - MIME 타입 추정 검증
+  - 임시 파일 분리(detach_audio) 시 복사와 해시를 한 번의 읽기로 처리하는지 검증
+  - UploadLimitMiddleware의 Content-Length/스트림 기준 413 거부 검증
+변경이력:
+  - 2026-10-17: 최초 구현
+"""
+
+import hashlib
+import io
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts" / "scribe"))
+
+from audio_ingest import AudioTooLargeError, UploadLimitMiddleware, detach_audio, guess_audio_mime_type, ingest_upload
+
+
+def make_upload(data, filename="system.webm", content_type="audio/webm"):
+    return SimpleNamespace(file=io.BytesIO(data), filename=filename, content_type=content_type)
+
+
+def test_ingest_hashes_and_rewinds():
+    data = b"abc" * 1000
+    audio = ingest_upload(make_upload(data), max_bytes=10_000)
+    assert audio.size == len(data)
+    assert audio.sha256 == hashlib.sha256(data).hexdigest()
+    assert audio.mime_type == "audio/webm"
+    assert audio.file.read() == data
+
+
+def test_ingest_enforces_size_cap():
+    with pytest.raises(AudioTooLargeError):
+        ingest_upload(make_upload(b"x" * 2048), max_bytes=1024)
+
+
+class CountingReader(io.BytesIO):
+    def __init__(self, data):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+def test_detach_copies_and_hashes_in_one_pass():
+    data = b"abc" * 500_000
+    upload = make_upload(data)
+    upload.file = CountingReader(data)
+    audio = detach_audio(upload, max_bytes=len(data))
+    try:
+        assert upload.file.bytes_read == len(data)
+        assert audio.file is not upload.file
+        assert audio.size == len(data)
+        assert audio.sha256 == hashlib.sha256(data).hexdigest()
+        assert audio.file.read() == data
+    finally:
+        audio.file.close()
+
+
+def test_middleware_rejects_oversized_uploads_before_spooling(monkeypatch):
+    pytest.importorskip("fastapi")
+    from fastapi import FastAPI, File, UploadFile
+    from fastapi.testclient import TestClient
+    import audio_ingest
+
+    monkeypatch.setattr(audio_ingest, "FORM_OVERHEAD_BYTES", 1024)
+    app = FastAPI()
+    app.add_middleware(UploadLimitMiddleware, paths=("/upload",), max_bytes=4096)
+    handled = []
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        handled.append(file.filename)
+        return {"ok": True}
+
+    client = TestClient(app)
+    assert client.post("/upload", files={"file": ("a.webm", b"x" * 1000)}).json() == {"ok": True}
+
+    response = client.post("/upload", files={"file": ("b.webm", b"x" * 100_000)})
+    assert response.status_code == 413
+    assert "SCRIBE_MAX_AUDIO_MB" in response.json()["error"]
+
+    # Chunked body without Content-Length: cut off once the received bytes cross the cap
+    def body():
+        yield b"--b\r\nContent-Disposition: form-data; name=\"file\"; filename=\"c.webm\"\r\n\r\n"
+        for _ in range(100):
+            yield b"x" * 1000
+        yield b"\r\n--b--\r\n"
+
+    response = client.post("/upload", content=body(), headers={"content-type": "multipart/form-data; boundary=b"})
+    assert response.status_code == 413
+    assert handled == ["a.webm"]
+
+
+def test_guess_audio_mime_type():
+    assert guess_audio_mime_type("a.m4a") == "audio/mp4"
+    assert guess_audio_mime_type("a.wav", "application/octet-stream") == "audio/wav"
+    assert guess_audio_mime_type("blob", "audio/webm;codecs=opus") == "audio/webm"
+    assert guess_audio_mime_type("unknown.bin") == "audio/mp3"
@@ -0,0 +1,152 @@
+"""
+파일명: tests/unit/test_audio_preprocess.py
+목적: scripts/scribe/audio_preprocess.py의 업로드 전 오디오 전처리 단위 테스트
+기능:
+  - 무음 구간 제거 및 타임스탬프 매핑/메모 시간 보정 검증
+  - 스테레오 WAV의 16 kHz 모노 Opus 재인코딩 및 절감량 보고 검증
+  - 장시간 녹음의 겹침 구간 분할 계획 및 구간별 메모 선택 검증
+  - 오디오가 없어 빠진 구간이 있어도 부분 결과의 시간 라벨이 실제 구간을 따르는지 검증
+변경이력:
+  - 2026-10-17: 최초 구현
+"""
+
+import asyncio
+import io
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts" / "scribe"))
+
+from audio_preprocess import (SilenceTrimmer, TimeMap, notes_in_window, plan_windows, preprocess_audio,
+                              remap_notes)
+
+
+def test_trimmer_cuts_long_silence_and_keeps_padding():
+    trimmer = SilenceTrimmer(min_silence_frames=5, pad_frames=2)
+    tone = (np.sin(np.arange(480) / 3) * 8000).astype(np.int16)
+    quiet = np.zeros(480, dtype=np.int16)
+    pattern = [quiet] * 10 + [tone] * 4 + [quiet] * 3 + [tone] * 2 + [quiet] * 20 + [tone] * 3 + [quiet] * 10
+
+    kept = []
+    for index, frame in enumerate(pattern):
+        kept.extend(i for i, _ in trimmer.push(index, frame))
+    kept.extend(i for i, _ in trimmer.flush())
+
+    # Leading silence -> 2 frames of pre-roll; the short pause is kept whole;
+    # the long pause keeps 2 frames on each side; trailing silence is dropped
+    assert kept == [8, 9] + list(range(10, 19)) + [19, 20] + [37, 38] + [39, 40, 41] + [42, 43]
+
+
+def test_time_map_and_note_remapping():
+    time_map = TimeMap()
+    time_map.add(0.0, 10.0, 20.0)   # source 10-30s -> output 0-20s
+    time_map.add(20.0, 90.0, 30.0)  # source 90-120s -> output 20-50s
+
+    assert time_map.to_output(15.0) == 5.0
+    assert time_map.to_output(60.0) == 20.0  # Inside removed silence: snaps forward
+    assert time_map.to_source(25.0) == 95.0
+
+    notes = ["참석자 명단: 김철수", "[01:35] 예산 확정", "[00:12] 시작"]
+    assert remap_notes(notes, time_map) == ["참석자 명단: 김철수", "[00:25] (원본 01:35) 예산 확정", "[00:02] (원본 00:12) 시작"]
+
+
+def _wav(signal, rate, layout="stereo"):
+    av = pytest.importorskip("av")
+    channels = 2 if layout == "stereo" else 1
+    samples = (np.stack([signal] * channels) * 32767).astype(np.int16)
+    source = io.BytesIO()
+    with av.open(source, mode="w", format="wav") as container:
+        stream = container.add_stream("pcm_s16le", rate=rate, layout=layout)
+        frame = av.AudioFrame.from_ndarray(samples.T.reshape(1, -1).copy(), format="s16", layout=layout)
+        frame.sample_rate = rate
+        for packet in stream.encode(frame):
+            container.mux(packet)
+        for packet in stream.encode(None):
+            container.mux(packet)
+    size = len(source.getvalue())
+    source.seek(0)
+    return source, size
+
+
+def test_preprocess_downmixes_trims_and_reports_savings():
+    av = pytest.importorskip("av")
+    rate = 44100
+    silence = np.zeros(rate * 3)
+    tone = np.sin(np.arange(rate) * 2 * np.pi * 220 / rate) * 0.3
+    signal = np.concatenate([tone, silence, tone, silence, tone])
+    source, size = _wav(signal, rate)
+
+    result = preprocess_audio(source, size=size)
+
+    assert result.mime_type == "audio/ogg"
+    assert result.stats["seconds_in"] == pytest.approx(9.0, abs=0.05)
+    assert result.stats["seconds_saved"] > 5
+    assert result.stats["bytes_out"] < size / 20
+    assert len(result.time_map.segments) == 3
+    with av.open(result.file) as decoded:
+        assert decoded.streams.audio[0].codec_context.channels == 1
+
+
+def test_plan_windows_overlaps_and_folds_short_tail():
+    assert plan_windows(100.0, 300.0, 30.0) == [(0.0, 100.0)]
+    assert plan_windows(1300.0, 600.0, 30.0) == [(0.0, 600.0), (570.0, 1170.0), (1140.0, 1300.0)]
+    # A 50 s tail would be under a quarter window: folded into the previous window
+    assert plan_windows(1190.0, 600.0, 30.0) == [(0.0, 600.0), (570.0, 1190.0)]
+    assert len(plan_windows(68.0, 20.0, 30.0)) == 6
+
+    notes = ["참석자: 김철수", "[02:00] 예산", "[12:00] 일정", "[1:00:00] 마무리"]
+    assert notes_in_window(notes, 0.0, 600.0) == ["참석자: 김철수", "[02:00] 예산"]
+    assert notes_in_window(notes, 570.0, 1200.0) == ["참석자: 김철수", "[12:00] 일정"]
+
+
+def test_long_recording_is_analyzed_in_parallel_segments(monkeypatch):
+    pytest.importorskip("google.genai")
+    from fake_backend import FakeBackendConfig, FakeGenaiClient
+    from summarizer import Summarizer
+
+    monkeypatch.setenv("SUMMARY_AUDIO_SEGMENT_MODE", "always")
+    monkeypatch.setenv("SUMMARY_AUDIO_WINDOW_SECONDS", "4")
+    monkeypatch.setenv("SUMMARY_AUDIO_OVERLAP_SECONDS", "1")
+    monkeypatch.setenv("SUMMARY_MAX_PARALLEL", "2")
+    rate = 16000
+    source, size = _wav(np.sin(np.arange(rate * 10) * 2 * np.pi * 220 / rate) * 0.3, rate, layout="mono")
+
+    config = FakeBackendConfig(latency=0, output_chars=120, stream_chunks=3, upload_per_mb=0, google_latency=0)
+    summarizer = Summarizer(client=FakeGenaiClient(config))
+    summarizer.preprocess = False
+    result = asyncio.run(summarizer.analyze_audio_async(source, meeting_title="장시간 회의",
+                                                        mime_type="audio/wav", size=size))
+
+    assert "error" not in result, result
+    assert result["usage"]["audio_segments"] == 3
+    assert len(result["summary"]) == 120
+    assert summarizer.current_summary == result["summary"]
+
+
+def test_dropped_window_does_not_shift_part_labels(monkeypatch):
+    pytest.importorskip("google.genai")
+    import audio_preprocess
+    from audio_preprocess import AudioSegment
+    from fake_backend import FakeBackendConfig, FakeGenaiClient
+    from summarizer import Summarizer
+
+    windows = [(0.0, 600.0), (570.0, 1170.0), (1140.0, 1800.0)]
+
+    def split_without_middle(audio, planned):
+        assert planned == windows
+        return [AudioSegment(io.BytesIO(bytes([i]) * 64), "audio/ogg", 64, f"sha-{i}", *planned[i])
+                for i in (0, 2)]
+
+    monkeypatch.setattr(audio_preprocess, "split_audio", split_without_middle)
+    config = FakeBackendConfig(latency=0, output_chars=40, stream_chunks=1, upload_per_mb=0, google_latency=0)
+    summarizer = Summarizer(client=FakeGenaiClient(config))
+    partials, usages, fields = asyncio.run(summarizer._map_audio_segments(io.BytesIO(b"src"), windows))
+
+    assert [(start, end) for start, end, _ in partials] == [(0.0, 600.0), (1140.0, 1800.0)]
+    assert fields["audio_segments"] == 2
+    prompt = summarizer._build_audio_reduce_prompt(partials, "회의")
+    assert "### Part 2 (0:19:00-0:30:00)" in prompt
+    assert "0:09:30" not in prompt
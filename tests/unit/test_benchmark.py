@@ -0,0 +1,54 @@
+"""
+파일명: tests/unit/test_benchmark.py
+목적: scripts/scribe/fake_backend.py 및 benchmark.py 단위 테스트
+기능:
+  - 가짜 genai 클라이언트로 Summarizer 요약/비용 집계 동작 검증
+  - 백분위수 계산 및 기준선 대비 성능 회귀 판정 검증
+변경이력:
+  - 2026-10-17: 최초 구현
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts" / "scribe"))
+
+import pytest
+
+pytest.importorskip("google.genai")
+
+from benchmark import compare, percentile, summarize_latencies
+from fake_backend import FakeBackendConfig, FakeGenaiClient
+from summarizer import Summarizer
+
+
+def test_fake_client_drives_summarizer_without_network():
+    config = FakeBackendConfig(latency=0, output_chars=200, stream_chunks=4, upload_per_mb=0, google_latency=0)
+    summarizer = Summarizer(client=FakeGenaiClient(config))
+
+    result = asyncio.run(summarizer.summarize_async("[00:01] 화자1: 안녕하세요"))
+    assert len(result["summary"]) == 200
+    assert result["usage"]["output_tokens"] == 50
+    assert result["usage"]["estimated_cost_usd"] > 0
+
+    async def collect():
+        return [event async for event in summarizer.summarize_stream("[00:02] 화자2: 다음 안건입니다")]
+
+    events = asyncio.run(collect())
+    assert "".join(e.get("delta", "") for e in events) == events[-1]["summary"]
+    assert events[-1]["usage"]["output_tokens"] == 50
+
+
+def test_percentiles_and_regression_check():
+    ordered = [i / 1000 for i in range(1, 101)]
+    assert percentile(ordered, 50) == 0.05
+    assert percentile(ordered, 99) == 0.099
+
+    result = summarize_latencies(ordered, errors=0, elapsed=2.0, concurrency=4)
+    assert result["rps"] == 50.0
+    baseline = {"results": {"summarize": dict(result)}}
+
+    assert compare({"summarize": result}, baseline, tolerance=0.2) == []
+    slower = dict(result, rps=30.0, p99_ms=result["p99_ms"] * 2)
+    assert len(compare({"summarize": slower}, baseline, tolerance=0.2)) == 2
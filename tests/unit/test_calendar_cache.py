@@ -0,0 +1,96 @@
+"""
+파일명: tests/unit/test_calendar_cache.py
+목적: scripts/scribe/calendar_cache.py의 캘린더 이벤트 캐시 단위 테스트
+기능:
+  - 여러 캘린더 이벤트의 시작 시각 순 병합(k-way merge) 및 종료된 이벤트 제외 검증
+  - 동기화 토큰 기반 증분 동기화(수정/취소 반영) 및 조회 범위 소진 시 전체 재동기화 검증
+  - 조회 실패 시 기존 캐시 유지, 목록에서 빠진 캘린더 제거 검증
+변경이력:
+  - 2026-10-17: 최초 구현
+"""
+
+import datetime
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts" / "scribe"))
+
+from calendar_cache import EventCache
+
+NOW = 1_800_000_000.0
+
+
+def _event(event_id, start_hours, summary=None, status="confirmed"):
+    start = datetime.datetime.fromtimestamp(NOW + start_hours * 3600, datetime.timezone.utc)
+    end = start + datetime.timedelta(hours=1)
+    return {"id": event_id, "summary": summary or event_id, "status": status,
+            "start": {"dateTime": start.isoformat()}, "end": {"dateTime": end.isoformat()}}
+
+
+class FakeSource:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def __call__(self, sync_tokens, time_min, time_max):
+        self.calls.append(dict(sync_tokens))
+        return self.responses.pop(0)
+
+
+class Clock:
+    def __init__(self):
+        self.now = NOW
+
+    def __call__(self):
+        return self.now
+
+
+def test_merges_calendars_in_start_order_and_skips_ended_events():
+    source = FakeSource([{
+        "a": {"name": "업무", "items": [_event("a1", 1), _event("a2", 5), _event("past", -3)],
+              "sync_token": "a-1", "full": True},
+        "b": {"name": "개인", "items": [_event("b1", 3), _event("b2", 0.5, status="cancelled")],
+              "sync_token": "b-1", "full": True},
+    }])
+    cache = EventCache(source, refresh_seconds=60, window_days=30, clock=Clock())
+
+    events = cache.upcoming(10)
+    assert [e["id"] for e in events] == ["a1", "b1", "a2"]
+    assert events[1]["summary"] == "[개인] b1"
+    assert [e["id"] for e in cache.upcoming(2)] == ["a1", "b1"]
+    assert source.calls == [{}]  # Served from the cache the second time
+
+
+def test_incremental_sync_uses_tokens_and_resyncs_when_window_runs_out():
+    source = FakeSource([
+        {"a": {"name": "업무", "items": [_event("a1", 1), _event("a2", 2)], "sync_token": "a-1", "full": True}},
+        {"a": {"name": "업무", "items": [_event("a1", 1, summary="변경됨"), _event("a2", 2, status="cancelled")],
+               "sync_token": "a-2", "full": False}},
+        {"a": {"name": "업무", "items": [_event("a3", 24 * 20)], "sync_token": "a-3", "full": True}},
+    ])
+    clock = Clock()
+    cache = EventCache(source, refresh_seconds=60, window_days=30, clock=clock)
+    cache.sync()
+    cache.sync()
+
+    assert source.calls == [{}, {"a": "a-1"}]
+    assert [e["summary"] for e in cache.upcoming(10)] == ["[업무] 변경됨"]
+
+    clock.now += 86400 * 16  # More than half of the 30-day window used up
+    cache.sync()
+    assert source.calls[-1] == {"a": None}
+    assert [e["id"] for e in cache.upcoming(10)] == ["a3"]
+
+
+def test_failed_calendar_keeps_cached_events_and_removed_calendars_are_dropped():
+    source = FakeSource([
+        {"a": {"name": "업무", "items": [_event("a1", 1)], "sync_token": "a-1", "full": True},
+         "b": {"name": "개인", "items": [_event("b1", 2)], "sync_token": "b-1", "full": True}},
+        {"a": {"name": "업무", "error": "HttpError 500"}},
+    ])
+    cache = EventCache(source, refresh_seconds=60, window_days=30, clock=Clock())
+    cache.sync()
+    cache.sync()
+
+    assert [e["id"] for e in cache.upcoming(10)] == ["a1"]
+    assert cache.calendars["a"].sync_token == "a-1"
@@ -0,0 +1,158 @@
+"""
+파일명: tests/unit/test_chunk_ingest.py
+목적: scripts/scribe/chunk_ingest.py의 ChunkStore 단위 테스트
+기능:
+  - 청크 저장의 멱등성 및 충돌 검출 검증 (동시 재전송 포함)
+  - 구간 조립 시 WebM 헤더만 선행하고 0번 청크 오디오는 다시 보내지 않는지 검증
+  - 컨테이너를 해석할 수 없을 때 0번 청크 선행 방식으로 대체되는지 검증
+  - 청크 업로드를 나눠 읽고 청크당 최대 크기를 넘으면 거부하는지 검증
+변경이력:
+  - 2026-10-17: 최초 구현
+"""
+
+import asyncio
+import io
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts" / "scribe"))
+
+from audio_ingest import AudioTooLargeError
+from chunk_ingest import ChunkConflictError, ChunkStore, scan_webm
+
+
+def test_put_chunk_is_idempotent(tmp_path):
+    store = ChunkStore(root=str(tmp_path), segment_chunks=10, max_bytes=1024)
+    recording = store.get("rec-1")
+    assert store.put_chunk(recording, 0, b"header") == "stored"
+    assert store.put_chunk(recording, 0, b"header") == "duplicate"
+    with pytest.raises(ChunkConflictError):
+        store.put_chunk(recording, 0, b"other")
+    assert recording.total_bytes == len(b"header")
+
+
+def test_concurrent_retries_of_one_chunk_store_it_once(tmp_path):
+    store = ChunkStore(root=str(tmp_path), segment_chunks=10, max_bytes=1024 * 1024)
+    recording = store.get("rec-1")
+    data = b"x" * 200_000
+    results = []
+    barrier = threading.Barrier(8)
+
+    def put():
+        barrier.wait()
+        results.append(store.put_chunk(recording, 0, data))
+
+    threads = [threading.Thread(target=put) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(results) == ["duplicate"] * 7 + ["stored"]
+    assert recording.total_bytes == len(data)
+    assert sorted(p.name for p in (tmp_path / "rec-1").iterdir()) == ["000000.part"]
+    assert (tmp_path / "rec-1" / "000000.part").read_bytes() == data
+
+
+def test_resume_status_reports_gaps(tmp_path):
+    store = ChunkStore(root=str(tmp_path), segment_chunks=10, max_bytes=1024)
+    recording = store.get("rec-1")
+    for index in (0, 1, 3):
+        store.put_chunk(recording, index, bytes([index]))
+    status = recording.status()
+    assert status["received"] == [0, 1, 3]
+    assert status["next_index"] == 2
+
+
+def _element(element_id, payload, unknown_size=False):
+    size = b"\x01\xff\xff\xff\xff\xff\xff\xff" if unknown_size else bytes([0x80 | len(payload)])
+    return element_id + size + payload
+
+
+def _live_webm(clusters, blocks_per_cluster=3):
+    """Minimal MediaRecorder-style WebM: unknown-size Segment and Clusters, audio-N-M block payloads."""
+    header = (_element(b"\x1a\x45\xdf\xa3", b"\x42\x82\x84webm")
+              + b"\x18\x53\x80\x67\x01\xff\xff\xff\xff\xff\xff\xff"
+              + _element(b"\x15\x49\xa9\x66", b"info")
+              + _element(b"\x16\x54\xae\x6b", b"tracks"))
+    body = b"".join(
+        _element(b"\x1f\x43\xb6\x75", _element(b"\xe7", bytes([c])) + b"".join(
+            _element(b"\xa3", f"audio-{c}-{b}".encode()) for b in range(blocks_per_cluster)), unknown_size=True)
+        for c in range(clusters)
+    )
+    return header, header + body
+
+
+def test_assemble_sends_webm_header_without_chunk0_audio(tmp_path):
+    store = ChunkStore(root=str(tmp_path), segment_chunks=10, max_bytes=1024 * 1024)
+    recording = store.get("rec-1")
+    header, stream = _live_webm(clusters=8)
+    size = len(stream) // 6 + 1  # Timeslices that do not line up with Clusters
+    chunks = [stream[i:i + size] for i in range(0, len(stream), size)]
+    assert b"audio-0-" in chunks[0] and len(chunks) == 6
+    for index, data in enumerate(chunks):
+        store.put_chunk(recording, index, data)
+
+    first = store.assemble(recording, 0, 3).read()
+    assert first == b"".join(chunks[:3])
+
+    second = store.assemble(recording, 3, 6).read()
+    assert recording.header == header
+    assert second.startswith(header + b"\x1f\x43\xb6\x75")  # Header, then a whole Cluster
+    assert b"audio-0-" not in second  # Nothing from chunk 0 but the header
+    assert second.endswith(b"".join(chunks[3:]))
+    # Only the Cluster cut by the chunk 3 boundary overlaps the first segment
+    overlap = len(second) - len(header) - len(b"".join(chunks[3:]))
+    assert 0 < overlap < len(stream) // 8
+    clusters, resume = scan_webm(second)
+    assert clusters[0] == len(header) and resume == len(second)
+
+
+def test_assemble_falls_back_to_chunk0_for_unknown_containers(tmp_path):
+    store = ChunkStore(root=str(tmp_path), segment_chunks=10, max_bytes=1024)
+    recording = store.get("rec-1")
+    for index, data in enumerate([b"H", b"a", b"b", b"c"]):
+        store.put_chunk(recording, index, data)
+    assert store.assemble(recording, 0, 2).read() == b"Ha"
+    assert store.assemble(recording, 2, 4).read() == b"Hbc"
+
+
+class StreamedUpload:
+    """UploadFile stand-in without a known size (chunked request body)."""
+
+    def __init__(self, data):
+        self.file = io.BytesIO(data)
+        self.size = None
+        self.reads = []
+
+    async def read(self, size=-1):
+        piece = self.file.read(size)
+        self.reads.append(len(piece))
+        return piece
+
+
+def test_read_chunk_is_bounded_per_chunk(tmp_path):
+    store = ChunkStore(root=str(tmp_path), max_bytes=1024 * 1024, chunk_max_bytes=100 * 1024)
+    ok = StreamedUpload(b"a" * 90 * 1024)
+    assert asyncio.run(store.read_chunk(ok)) == b"a" * 90 * 1024
+    assert max(ok.reads) <= 64 * 1024
+
+    oversized = StreamedUpload(b"b" * 512 * 1024)
+    with pytest.raises(AudioTooLargeError):
+        asyncio.run(store.read_chunk(oversized))
+    assert sum(oversized.reads) <= 192 * 1024  # Stopped right after crossing the limit
+
+    known = StreamedUpload(b"")
+    known.size = 200 * 1024
+    with pytest.raises(AudioTooLargeError):
+        asyncio.run(store.read_chunk(known))
+    assert known.reads == []
+
+
+def test_invalid_recording_id(tmp_path):
+    store = ChunkStore(root=str(tmp_path))
+    with pytest.raises(ValueError):
+        store.get("../etc")
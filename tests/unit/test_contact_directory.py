@@ -0,0 +1,77 @@
+"""
+파일명: tests/unit/test_contact_directory.py
+목적: scripts/scribe/contact_directory.py의 로컬 연락처 색인 단위 테스트
+기능:
+  - 이름 접두어/부분 문자열/이메일/초성 검색 및 순위 검증
+  - 입력 중인 한글 음절(IME 조합 중) 매칭 검증
+  - 동기화 토큰 기반 증분 동기화(추가/수정/삭제) 반영 검증
+변경이력:
+  - 2026-10-17: 최초 구현
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts" / "scribe"))
+
+from contact_directory import ContactDirectory, choseong
+
+
+def _contact(contact_id, name, email="", organization=""):
+    label = f"{name} ({organization})" if organization else name
+    if email:
+        label += f" <{email}>"
+    return {"id": contact_id, "name": name, "email": email, "organization": organization, "label": label}
+
+
+class FakeSource:
+    def __init__(self):
+        self.calls = []
+        self.changes = [
+            {"contacts": [_contact("people/1", "김철수", "cs.kim@example.com", "개발팀"),
+                          _contact("people/2", "김철민", "cm.kim@example.com"),
+                          _contact("people/3", "이영희", "younghee@example.com", "기획팀"),
+                          _contact("people/4", "Alice Park", "alice@example.com")],
+             "deleted": [], "sync_token": "t1", "full": True},
+            {"contacts": [_contact("people/3", "이영희", "yh.lee@example.com", "전략팀")],
+             "deleted": ["people/2"], "sync_token": "t2", "full": False},
+        ]
+
+    def list_contact_changes(self, sync_token=None):
+        self.calls.append(sync_token)
+        return self.changes[len(self.calls) - 1]
+
+
+def test_choseong():
+    assert choseong("김철수") == "ㄱㅊㅅ"
+    assert choseong("Alice 박") == "Alice ㅂ"
+
+
+def test_search_modes_and_ranking():
+    directory = ContactDirectory(FakeSource(), sync_interval=0)
+    directory.sync()
+
+    assert directory.search("김철") == ["김철민 <cm.kim@example.com>", "김철수 (개발팀) <cs.kim@example.com>"]
+    assert directory.search("ㄱㅊㅅ") == ["김철수 (개발팀) <cs.kim@example.com>"]
+    assert directory.search("김처") == directory.search("김철")  # IME still composing "철"
+    assert directory.search("park") == ["Alice Park <alice@example.com>"]
+    assert directory.search("기획") == ["이영희 (기획팀) <younghee@example.com>"]
+    assert directory.search("a")[0] == "Alice Park <alice@example.com>"
+    assert directory.search("ㅇ") == ["이영희 (기획팀) <younghee@example.com>"]
+    assert directory.search("없는사람") == []
+    assert len(directory.search("example", limit=2)) == 2
+
+
+def test_incremental_sync_applies_updates_and_deletions():
+    source = FakeSource()
+    directory = ContactDirectory(source, sync_interval=0)
+    assert not directory.ready
+    directory.sync()
+    directory.sync()
+
+    assert source.calls == [None, "t1"]
+    assert directory.sync_token == "t2"
+    assert len(directory) == 3
+    assert directory.search("김철") == ["김철수 (개발팀) <cs.kim@example.com>"]
+    assert directory.search("기획") == []
+    assert directory.search("전략") == ["이영희 (전략팀) <yh.lee@example.com>"]
@@ -0,0 +1,51 @@
+"""
+파일명: tests/unit/test_context_budget.py
+목적: scripts/scribe/context_budget.py 단위 테스트
+기능:
+  - 로컬 토큰 추정 검증
+  - 메모 중복 제거(타임스탬프 포함 완전 일치) 및 예산 내 최신 메모 유지 검증
+  - 오디오 타임라인 메모의 처음/끝 유지(중간 생략) 검증
+변경이력:
+  - 2026-10-17: 최초 구현
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts" / "scribe"))
+
+from context_budget import ContextBudget, estimate_tokens
+
+
+def test_estimate_tokens_korean_denser_than_ascii():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("가" * 30) > estimate_tokens("a" * 30)
+
+
+def test_fit_notes_dedupes_exact_copies_and_pins_participants():
+    budget = ContextBudget(summary_max_tokens=1000, notes_max_tokens=1000)
+    notes = ["[00:10] 예산 승인", "참석자 명단: 홍길동", "[00:10]  예산 승인", "[05:00] 예산 승인", "[06:00] 다음 회의 일정"]
+    # Same text at another time is a separate timeline anchor
+    assert budget.fit_notes(notes) == ["참석자 명단: 홍길동", "[00:10] 예산 승인", "[05:00] 예산 승인",
+                                       "[06:00] 다음 회의 일정"]
+
+
+def test_fit_notes_keeps_newest_within_budget():
+    budget = ContextBudget(summary_max_tokens=1000, notes_max_tokens=30)
+    notes = [f"[00:{i:02d}] note number {i} " + "x" * 20 for i in range(10)]
+    kept = budget.fit_notes(notes)
+    assert kept and len(kept) < len(notes)
+    assert kept[-1] == notes[-1]
+
+
+def test_fit_notes_timeline_keeps_first_and_last():
+    budget = ContextBudget(summary_max_tokens=1000, notes_max_tokens=60)
+    notes = ["참석자 명단: 홍길동, 김철수"] + [f"[{i:02d}:00] 화자 확인 메모 {i}" for i in range(20)]
+    kept = budget.fit_notes(notes, timeline=True)
+
+    assert kept[0] == notes[0]
+    assert kept[1] == "[00:00] 화자 확인 메모 0"
+    assert kept[-1] == "[19:00] 화자 확인 메모 19"
+    assert 3 < len(kept) < len(notes)
+    assert kept[1:] == sorted(kept[1:], key=notes.index)  # Chronological order preserved
+    assert "[10:00] 화자 확인 메모 10" not in kept  # Trimmed from the middle
@@ -0,0 +1,106 @@
+"""
+파일명: tests/unit/test_file_manager.py
+목적: scripts/scribe/file_manager.py의 GeminiFileManager 단위 테스트
+기능:
+  - 동일 SHA-256 업로드 재사용 및 동시 업로드 병합 검증
+  - 참조 해제 후 유휴 파일 삭제 검증
+  - 만료된 파일 재업로드 시 사용 중인 원격 파일을 삭제하지 않는지 검증
+변경이력:
+  - 2026-10-17: 최초 구현
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts" / "scribe"))
+
+from file_manager import GeminiFileManager
+
+
+class FakeAsyncFiles:
+    def __init__(self):
+        self.uploads = 0
+        self.deleted = []
+
+    async def upload(self, file, config=None):
+        self.uploads += 1
+        await asyncio.sleep(0.01)
+        return SimpleNamespace(name=f"files/{self.uploads}", uri="uri", expiration_time=None)
+
+    async def delete(self, name, config=None):
+        self.deleted.append(name)
+
+
+def make_manager(idle_seconds=0):
+    files = FakeAsyncFiles()
+    client = SimpleNamespace(aio=SimpleNamespace(files=files))
+    return GeminiFileManager(client, idle_seconds=idle_seconds), files
+
+
+def test_same_content_is_uploaded_once():
+    async def run():
+        manager, files = make_manager()
+        first, reused_first = await manager.acquire("sha", b"", "audio/webm", 100)
+        manager.release("sha")
+        second, reused_second = await manager.acquire("sha", b"", "audio/webm", 100)
+        return manager, files, first, second, reused_first, reused_second
+
+    manager, files, first, second, reused_first, reused_second = asyncio.run(run())
+    assert files.uploads == 1
+    assert first is second
+    assert (reused_first, reused_second) == (False, True)
+    assert manager.stats["bytes_saved"] == 100
+
+
+def test_concurrent_acquire_coalesces_upload():
+    async def run():
+        manager, files = make_manager()
+        await asyncio.gather(*(manager.acquire("sha", b"", "audio/webm", 10) for _ in range(3)))
+        return files
+
+    assert asyncio.run(run()).uploads == 1
+
+
+def test_sweep_deletes_only_unreferenced_files():
+    async def run():
+        manager, files = make_manager(idle_seconds=0)
+        await manager.acquire("a", b"", "audio/webm", 10)
+        await manager.acquire("b", b"", "audio/webm", 10)
+        manager.release("a")
+        await asyncio.sleep(0.001)
+        deleted = await manager.sweep()
+        return deleted, files
+
+    deleted, files = asyncio.run(run())
+    assert deleted == 1
+    assert files.deleted == ["files/1"]
+
+
+def test_expired_file_in_use_is_deleted_only_after_release():
+    async def run():
+        manager, files = make_manager(idle_seconds=3600)
+        old, _ = await manager.acquire("sha", b"", "audio/webm", 10)
+        manager._files["sha"].expires_at = 0  # Past the reuse window while still referenced
+
+        new, reused = await manager.acquire("sha", b"", "audio/webm", 10)
+        await asyncio.sleep(0.01)
+        deleted_while_in_use = list(files.deleted)
+
+        manager.release("sha", old)
+        assert manager._files["sha"].refs == 1  # The new upload's reference is untouched
+        swept = await manager.sweep()
+        manager.release("sha", new)
+
+        # An unreferenced expired file is deleted in a tracked background task
+        manager._files["sha"].expires_at = 0
+        await manager.acquire("sha", b"", "audio/webm", 10)
+        await manager.close()
+        return files, old, new, reused, deleted_while_in_use, swept
+
+    files, old, new, reused, deleted_while_in_use, swept = asyncio.run(run())
+    assert new is not old and reused is False
+    assert deleted_while_in_use == []
+    assert swept == 1
+    assert files.deleted == [old.name, new.name]
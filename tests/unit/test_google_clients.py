@@ -0,0 +1,82 @@
+"""
+파일명: tests/unit/test_google_clients.py
+목적: scripts/scribe/google_clients.py의 Google API 클라이언트 캐시 단위 테스트
+기능:
+  - 서비스 객체 재사용 및 스레드별 인증 HTTP 세션 분리 검증
+  - 만료 전 백그라운드 토큰 갱신 및 갱신 콜백(token.json 저장) 호출 검증
+변경이력:
+  - 2026-10-17: 최초 구현
+"""
+
+import datetime
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("googleapiclient")
+pytest.importorskip("google_auth_httplib2")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts" / "scribe"))
+
+from google.oauth2.credentials import Credentials
+
+from google_clients import GoogleClients
+
+
+def _utcnow():
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+
+class RefreshingCredentials(Credentials):
+    def __init__(self, expires_in):
+        super().__init__(token="t0", refresh_token="r", client_id="c", client_secret="s",
+                         token_uri="https://oauth2.invalid/token")
+        self.expiry = _utcnow() + datetime.timedelta(seconds=expires_in)
+        self.refreshed = threading.Event()
+
+    def refresh(self, request):
+        self.token = "t1"
+        self.expiry = _utcnow() + datetime.timedelta(hours=1)
+        self.refreshed.set()
+
+
+def test_services_are_cached_and_http_sessions_are_per_thread():
+    clients = GoogleClients(refresh_margin=600)
+    clients.set_credentials(Credentials(token="t0"))
+    try:
+        drive = clients.service("drive", "v3")
+        assert clients.service("drive", "v3") is drive
+
+        sessions = []
+        thread = threading.Thread(target=lambda: sessions.append(clients.http()))
+        thread.start()
+        thread.join()
+        assert clients.http() is clients.http()
+        assert sessions[0] is not clients.http()
+        assert drive.files().list().http is clients.http()  # Requests run on the caller's session
+
+        clients.set_credentials(Credentials(token="t1"))
+        assert clients.service("drive", "v3") is not drive
+        assert clients.http().credentials.token == "t1"
+    finally:
+        clients.close()
+
+
+def test_credentials_are_refreshed_before_expiry():
+    saved = []
+    creds = RefreshingCredentials(expires_in=60)
+    clients = GoogleClients(refresh_margin=600)
+    clients.set_credentials(creds, on_refresh=saved.append)
+    try:
+        assert creds.refreshed.wait(5)
+        deadline = time.monotonic() + 5
+        while not saved and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert saved == [creds]
+        assert creds.token == "t1"
+        assert clients.seconds_until_refresh() > 0
+    finally:
+        clients.close()
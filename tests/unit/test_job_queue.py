@@ -0,0 +1,134 @@
+"""
+파일명: tests/unit/test_job_queue.py
+목적: scripts/scribe/job_queue.py의 JobQueue 단위 테스트
+기능:
+  - 우선순위 순서 처리 및 워커 수 제한 검증
+  - 작업 상태 스냅샷/감시 스트림 및 실패 처리 검증
+  - 대기 중 취소/종료된 작업의 cleanup 실행 검증
+변경이력:
+  - 2026-10-17: 최초 구현
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts" / "scribe"))
+
+from job_queue import JobQueue, QueueFullError
+
+
+def test_jobs_run_by_priority_with_bounded_workers():
+    async def scenario():
+        queue = JobQueue(workers=1)
+        queue.start()
+        order = []
+        gate = asyncio.Event()
+
+        async def blocker(job):
+            await gate.wait()
+            return {"summary": "first"}
+
+        def make_work(name):
+            async def work(job):
+                order.append(name)
+                return {"summary": name}
+            return work
+
+        first = queue.submit("test", blocker)
+        await asyncio.sleep(0)
+        low = queue.submit("test", make_work("low"), priority=0)
+        high = queue.submit("test", make_work("high"), priority=5)
+        assert queue.running_count() == 1 and queue.queued_count() == 2
+
+        gate.set()
+        async for _ in queue.watch(low):
+            pass
+        await queue.stop()
+        return order, first, high, low
+
+    order, first, high, low = asyncio.run(scenario())
+    assert order == ["high", "low"]
+    assert first.status == high.status == low.status == "done"
+    assert low.snapshot()["result"] == {"summary": "low"}
+
+
+def test_watch_reports_progress_and_failures():
+    async def scenario():
+        queue = JobQueue(workers=2)
+        queue.start()
+        cleaned = []
+
+        async def work(job):
+            await job.update(phase="generating", partial="abc")
+            await asyncio.sleep(0.01)
+            return {"error": "quota exceeded"}
+
+        job = queue.submit("test", work, cleanup=lambda: cleaned.append(True))
+        snapshots = [snap async for snap in queue.watch(job)]
+        await queue.stop()
+        return job, snapshots, cleaned
+
+    job, snapshots, cleaned = asyncio.run(scenario())
+    assert any(s["phase"] == "generating" and s["partial"] == "abc" for s in snapshots)
+    assert snapshots[-1]["status"] == "failed"
+    assert job.error == "quota exceeded"
+    assert cleaned == [True]
+
+
+def test_queue_limit_and_cancel():
+    async def scenario():
+        queue = JobQueue(workers=1, max_queued=1)
+        queue.start()
+        gate = asyncio.Event()
+
+        async def work(job):
+            await gate.wait()
+
+        queue.submit("test", work)
+        await asyncio.sleep(0)
+        waiting = queue.submit("test", work)
+        with pytest.raises(QueueFullError):
+            queue.submit("test", work)
+        assert await queue.cancel(waiting.id)
+        gate.set()
+        await queue.stop()
+        return waiting
+
+    assert asyncio.run(scenario()).status == "cancelled"
+
+
+def test_cancelled_queued_job_runs_cleanup():
+    async def scenario():
+        queue = JobQueue(workers=1)
+        queue.start()
+        gate = asyncio.Event()
+        cleaned = []
+
+        async def work(job):
+            await gate.wait()
+
+        running = queue.submit("test", work, cleanup=lambda: cleaned.append("running"))
+        await asyncio.sleep(0)
+        waiting = queue.submit("test", work, cleanup=lambda: cleaned.append("cancelled"))
+        leftover = queue.submit("test", work, cleanup=lambda: cleaned.append("leftover"))
+
+        assert await queue.cancel(waiting.id)
+        assert cleaned == ["cancelled"]  # Right away, not when a worker dequeues it
+        gate.set()
+        await asyncio.sleep(0.01)
+        assert running.status == leftover.status == "done"
+
+        # Stopping the queue cleans up both the interrupted and the never-started job
+        gate.clear()
+        queue.submit("test", work, cleanup=lambda: cleaned.append("interrupted"))
+        queue.submit("test", work, cleanup=lambda: cleaned.append("never started"))
+        await asyncio.sleep(0)
+        await queue.stop()
+        return cleaned
+
+    cleaned = asyncio.run(scenario())
+    assert cleaned[:3] == ["cancelled", "running", "leftover"]
+    assert sorted(cleaned[3:]) == ["interrupted", "never started"]
@@ -0,0 +1,99 @@
+"""
+파일명: tests/unit/test_metrics.py
+목적: scripts/scribe/metrics.py의 계측 지표 단위 테스트
+기능:
+  - Counter/Gauge/Histogram 텍스트 노출 형식 검증
+  - 레이블 값/HELP 이스케이프 및 히스토그램 누적 le 버킷 출력 검증
+  - Gemini 호출 시간 측정 및 엔드포인트별 토큰/비용 집계 검증
+변경이력:
+  - 2026-10-17: 최초 구현
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts" / "scribe"))
+
+import metrics
+from metrics import Counter, Gauge, Histogram, Registry
+
+
+def test_text_exposition_format():
+    registry = Registry()
+    requests = Counter("t_requests_total", "Requests.", ["endpoint"], registry=registry)
+    in_flight = Gauge("t_in_flight", "In flight.", registry=registry)
+    latency = Histogram("t_latency_seconds", "Latency.", ["endpoint"], buckets=(0.1, 1), registry=registry)
+
+    requests.inc(endpoint="/summarize")
+    requests.inc(2, endpoint="/summarize")
+    in_flight.labels().set(3)
+    latency.observe(0.05, endpoint="/summarize")
+    latency.observe(0.5, endpoint="/summarize")
+    latency.observe(5, endpoint="/summarize")
+
+    text = registry.render()
+    assert "# TYPE t_requests_total counter" in text
+    assert 't_requests_total{endpoint="/summarize"} 3' in text
+    assert "t_in_flight 3" in text
+    assert 't_latency_seconds_bucket{endpoint="/summarize",le="0.1"} 1' in text
+    assert 't_latency_seconds_bucket{endpoint="/summarize",le="1.0"} 2' in text
+    assert 't_latency_seconds_bucket{endpoint="/summarize",le="+Inf"} 3' in text
+    assert 't_latency_seconds_count{endpoint="/summarize"} 3' in text
+
+
+def test_label_values_and_help_are_escaped():
+    registry = Registry()
+    errors = Counter("t_errors_total", "Errors\nby \\ path.", ["path"], registry=registry)
+    errors.inc(path='C:\\tmp\\"a"\nb')
+
+    text = registry.render()
+    assert "# HELP t_errors_total Errors\\nby \\\\ path." in text
+    assert 't_errors_total{path="C:\\\\tmp\\\\\\"a\\"\\nb"} 1' in text
+    assert len(text.strip().splitlines()) == 3  # The line feed never breaks a sample line
+
+
+def test_histogram_le_buckets_are_cumulative_and_ordered():
+    registry = Registry()
+    latency = Histogram("t_seconds", "Latency.", buckets=(1, 0.25, 10), registry=registry)
+    for value in (0.1, 0.25, 0.3, 1, 20):
+        latency.observe(value)
+
+    lines = [line for line in registry.render().splitlines() if not line.startswith("#")]
+    assert lines == [
+        't_seconds_bucket{le="0.25"} 2',  # Upper bounds are inclusive
+        't_seconds_bucket{le="1.0"} 4',
+        't_seconds_bucket{le="10.0"} 4',
+        't_seconds_bucket{le="+Inf"} 5',
+        "t_seconds_sum 21.65",
+        "t_seconds_count 5",
+    ]
+
+
+def test_duplicate_metric_names_are_rejected():
+    registry = Registry()
+    Counter("t_total", "First.", registry=registry)
+    with pytest.raises(ValueError):
+        Gauge("t_total", "Second.", registry=registry)
+
+
+def test_gemini_call_records_latency_errors_and_usage():
+    with metrics.gemini_call("test-model", "generate"):
+        pass
+    with pytest.raises(RuntimeError):
+        with metrics.gemini_call("test-model", "generate"):
+            raise RuntimeError("quota")
+
+    token = metrics.current_endpoint.set("/summarize")
+    try:
+        metrics.record_usage("test-model", 100, 20, 0.5)
+    finally:
+        metrics.current_endpoint.reset(token)
+
+    labels = {"model": "test-model", "operation": "generate"}
+    assert metrics.GEMINI_LATENCY.labels(**labels).count >= 2
+    assert metrics.GEMINI_ERRORS.labels(**labels).value >= 1
+    assert metrics.GEMINI_IN_FLIGHT.labels(operation="generate").value == 0
+    assert metrics.GEMINI_TOKENS.labels(model="test-model", endpoint="/summarize", direction="input").value >= 100
+    assert 'scribe_gemini_cost_usd_total{model="test-model",endpoint="/summarize"}' in metrics.REGISTRY.render()
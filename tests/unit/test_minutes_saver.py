@@ -0,0 +1,90 @@
+"""
+파일명: tests/unit/test_minutes_saver.py
+목적: scripts/scribe/minutes_saver.py의 백그라운드 회의록 저장 작업 단위 테스트
+기능:
+  - 일시적 오류(5xx/429) 재시도 및 업로드 진행률 보고 검증
+  - 캘린더 이벤트 조회가 업로드와 동시에 진행되는지 검증
+  - 재시도 불가 오류 시 실패 결과 반환 검증
+변경이력:
+  - 2026-10-17: 최초 구현
+"""
+
+import asyncio
+import datetime
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts" / "scribe"))
+
+from job_queue import Job
+from minutes_saver import MinutesSaver, minutes_filename
+
+
+class ApiError(Exception):
+    def __init__(self, code):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+
+
+class FakeCalendar:
+    def __init__(self, upload_failures=(), latency=0.2):
+        self.upload_failures = list(upload_failures)
+        self.latency = latency
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def _record(self, name):
+        with self._lock:
+            self.calls.append((name, time.monotonic()))
+
+    def get_event(self, event_id):
+        self._record("get")
+        time.sleep(self.latency)
+        return {"id": event_id, "attachments": []}
+
+    def upload_to_drive(self, filename, content, mimetype="text/markdown", progress=None):
+        self._record("upload")
+        if self.upload_failures:
+            raise ApiError(self.upload_failures.pop(0))
+        time.sleep(self.latency)
+        progress(len(content), len(content))
+        return "file-1", "https://docs.example/file-1"
+
+    def attach_to_calendar_event(self, event_id, file_id, file_link, file_title, event=None):
+        self._record("attach" if event is not None else "attach+get")
+        return True, "https://calendar.example/evt"
+
+
+def test_filename():
+    assert minutes_filename("주간회의", datetime.datetime(2026, 3, 2, 14, 30)) == "[회의록] 2026-03-02 주간회의 (14-30)"
+
+
+def test_retries_transient_errors_and_overlaps_event_fetch():
+    calendar = FakeCalendar(upload_failures=[503])
+    saver = MinutesSaver(calendar, max_attempts=3, backoff_base=0.01)
+
+    async def run():
+        job = Job("save_minutes")
+        started = time.monotonic()
+        result = await saver.run(job, "회의 내용", "minutes", event_id="evt")
+        return job, result, time.monotonic() - started
+
+    job, result, elapsed = asyncio.run(run())
+    assert result["status"] == "success" and result["link"] == "https://docs.example/file-1"
+    assert "캘린더 일정에도 첨부" in result["message"]
+    assert [name for name, _ in calendar.calls].count("upload") == 2
+    assert calendar.calls[-1][0] == "attach"  # Prefetched event was used
+    assert elapsed < 0.35  # GET (0.2s) ran alongside the upload (0.2s)
+    assert job.progress["bytes"] == job.progress["total"]
+    assert job.progress["attempt"] == 2
+
+
+def test_permanent_upload_error_fails_without_retry():
+    calendar = FakeCalendar(upload_failures=[403])
+    saver = MinutesSaver(calendar, max_attempts=3, backoff_base=0.01)
+
+    result = asyncio.run(saver.run(Job("save_minutes"), "내용", "minutes"))
+    assert "Google Drive 업로드 실패" in result["error"]
+    assert [name for name, _ in calendar.calls] == ["upload"]
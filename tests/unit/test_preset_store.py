@@ -0,0 +1,75 @@
+"""
+파일명: tests/unit/test_preset_store.py
+목적: scripts/scribe/preset_store.py의 참석자 프리셋 저장소 단위 테스트
+기능:
+  - 동시 저장 시 데이터 유실 없음 및 원자적 파일 교체 검증
+  - 외부 수정(mtime 변경) 감지 후 메모리 캐시 갱신 검증
+  - 회의 제목/참석자 인덱스 조회 및 손상 파일 처리 검증
+변경이력:
+  - 2026-10-17: 최초 구현
+"""
+
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts" / "scribe"))
+
+from preset_store import PresetStore
+
+
+def test_concurrent_saves_are_not_lost(tmp_path):
+    path = tmp_path / "attendee_presets.json"
+    stores = [PresetStore(str(path)) for _ in range(2)]  # Two "workers" sharing the file
+
+    def save(i):
+        stores[i % 2].save(f"팀{i}", [f"user{i}@example.com"])
+
+    threads = [threading.Thread(target=save, args=(i,)) for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(json.loads(path.read_text(encoding="utf-8"))) == 20
+    assert len(stores[0]) == len(stores[1]) == 20
+    assert not [p for p in os.listdir(tmp_path) if p.endswith(".tmp")]
+
+
+def test_external_change_invalidates_cache_and_corrupt_file_keeps_last_copy(tmp_path):
+    path = tmp_path / "attendee_presets.json"
+    store = PresetStore(str(path))
+    assert store.as_json() == "{}"
+
+    store.save("주간회의", ["김철수", "이영희", "김철수"])
+    assert store.get("주간회의") == ["김철수", "이영희"]
+
+    path.write_text(json.dumps({"TF팀": ["박민수"], "외부 추가": ["김철수"]}, ensure_ascii=False), encoding="utf-8")
+    os.utime(path, ns=(0, 10**9))  # Different mtime even on coarse filesystem clocks
+    assert store.get("TF팀") == ["박민수"]
+    assert store.get("주간회의") is None
+
+    path.write_text("{broken", encoding="utf-8")
+    assert store.get("TF팀") == ["박민수"]
+
+    with pytest.raises(ValueError):
+        store.save("", ["누군가"])
+
+
+def test_title_and_participant_indexes(tmp_path):
+    store = PresetStore(str(tmp_path / "presets.json"))
+    store.save("주간회의", ["김철수", "이영희"])
+    store.save("TF팀", ["Park@Example.com"])
+    store.save("기획", ["이영희"])
+
+    assert store.match_title("3월 주간회의 (tf팀 합동)") == ["주간회의", "TF팀"]
+    assert store.match_title("전사 타운홀") == []
+    assert store.with_participant("이영희") == ["기획", "주간회의"]
+    assert store.with_participant("park@example.com") == ["TF팀"]
+
+    store.delete("기획")
+    assert store.with_participant("이영희") == ["주간회의"]
@@ -0,0 +1,107 @@
+"""
+파일명: tests/unit/test_rate_limiter.py
+목적: scripts/scribe/rate_limiter.py의 Gemini 호출 속도 제한/재시도 단위 테스트
+기능:
+  - RPM/TPM 토큰 버킷 대기 시간 계산 및 사용량 정산 검증
+  - 429/503 재시도(서버 재시도 힌트 반영) 및 적응형 동시성 축소 검증
+  - 재시도 불가 오류 즉시 실패 및 최대 대기 시간 초과 검증
+  - Summarizer 호출이 일시적 오류 후 정상 요약을 반환하는지 검증
+변경이력:
+  - 2026-10-17: 최초 구현
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts" / "scribe"))
+
+from rate_limiter import RateLimiter, RateLimitTimeout, TokenBucket, retry_after
+
+
+class FakeAPIError(Exception):
+    def __init__(self, code, details=""):
+        super().__init__(f"{code} {details}")
+        self.code = code
+        self.details = details
+
+
+def test_token_bucket_waits_and_reconciles():
+    bucket = TokenBucket(per_minute=60, capacity=2)
+    bucket.take(2, now=bucket.updated)
+    assert bucket.wait_time(1, now=bucket.updated) == pytest.approx(1.0)
+    assert bucket.wait_time(1, now=bucket.updated + 1.0) == 0.0
+    bucket.adjust(-5)  # Refund beyond capacity is clamped
+    assert bucket.tokens == 2
+    assert TokenBucket(per_minute=0).wait_time(10**9, now=0) == 0.0
+
+
+def test_retry_after_reads_gemini_hint():
+    assert retry_after(FakeAPIError(429, {"details": [{"retryDelay": "13s"}]})) == 13.0
+    assert retry_after(FakeAPIError(503, "overloaded")) is None
+
+
+def test_throttled_calls_retry_and_shrink_concurrency():
+    limiter = RateLimiter("test", max_concurrency=8, max_retries=3, backoff_base=0.001, backoff_max=0.05)
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) <= 2:
+            raise FakeAPIError(429, "{'retryDelay': '0.01s'}")
+        return "ok"
+
+    assert asyncio.run(limiter.call(flaky)) == "ok"
+    assert len(attempts) == 3
+    stats = limiter.stats()
+    assert stats["throttles"] == 2 and stats["retries"] == 2
+    assert stats["active"] == 0
+    assert 2 <= stats["concurrency_limit"] < 3  # 8 -> 4 -> 2, then grows back slowly
+
+
+def test_non_retryable_errors_and_max_wait():
+    limiter = RateLimiter("test", max_retries=3, backoff_base=0.001)
+
+    async def bad_request():
+        raise FakeAPIError(400, "invalid")
+
+    async def succeed():
+        return "first"
+
+    async def paced_calls(limiter):
+        assert await limiter.call(succeed) == "first"
+        await limiter.call(succeed)
+
+    with pytest.raises(FakeAPIError):
+        asyncio.run(limiter.call(bad_request))
+    assert limiter.stats()["retries"] == 0
+
+    with pytest.raises(RateLimitTimeout):
+        asyncio.run(paced_calls(RateLimiter("test", rpm=1, max_wait=0.1)))
+
+
+def test_summarizer_survives_transient_overload():
+    pytest.importorskip("google.genai")
+    from fake_backend import FakeBackendConfig, FakeGenaiClient
+    from summarizer import Summarizer
+
+    client = FakeGenaiClient(FakeBackendConfig(latency=0, output_chars=80, stream_chunks=2, upload_per_mb=0,
+                                               google_latency=0))
+    generate = client.aio.models.generate_content
+    failures = []
+
+    async def overloaded_once(**kwargs):
+        if not failures:
+            failures.append(1)
+            raise FakeAPIError(503, "UNAVAILABLE")
+        return await generate(**kwargs)
+
+    client.aio.models.generate_content = overloaded_once
+    summarizer = Summarizer(client=client, limiter=RateLimiter("test", backoff_base=0.001))
+    result = asyncio.run(summarizer.summarize_async("[00:01] 화자1: 예산 논의"))
+
+    assert "error" not in result
+    assert len(result["summary"]) == 80
+    assert summarizer.for_session().limiter is summarizer.limiter
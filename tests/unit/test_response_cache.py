@@ -0,0 +1,75 @@
+"""
+파일명: tests/unit/test_response_cache.py
+목적: scripts/scribe/response_cache.py 단위 테스트
+기능:
+  - 메모리 LRU 계층 적중/제거 검증
+  - 디스크 계층 저장/복원 및 TTL 만료 검증
+  - 디스크 크기 메모리 추적(쓰기마다 디렉터리 스캔 없음) 및 용량 초과 시 오래된 항목 제거 검증
+변경이력:
+  - 2026-10-17: 최초 구현
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts" / "scribe"))
+
+from response_cache import ResponseCache
+
+
+def test_key_depends_on_model_and_prompt():
+    assert ResponseCache.make_key("a", "p") != ResponseCache.make_key("b", "p")
+    assert ResponseCache.make_key("a", "p") == ResponseCache.make_key("a", "p")
+
+
+def test_memory_lru_eviction():
+    cache = ResponseCache(max_entries=2, ttl=0, disk_dir="")
+    cache.put("k1", "v1")
+    cache.put("k2", "v2")
+    assert cache.get("k1") == "v1"
+    cache.put("k3", "v3")
+    assert cache.get("k2") is None
+    assert cache.get("k1") == "v1"
+    assert cache.stats()["hits"] == 2
+
+
+def test_disk_tier_survives_new_instance(tmp_path):
+    cache = ResponseCache(max_entries=4, ttl=0, disk_dir=str(tmp_path))
+    cache.put("k", "회의록")
+    cache.close()
+    fresh = ResponseCache(max_entries=4, ttl=0, disk_dir=str(tmp_path))
+    assert fresh.get("k") == "회의록"
+
+
+def test_disk_tier_ttl(tmp_path):
+    cache = ResponseCache(max_entries=4, ttl=60, disk_dir=str(tmp_path))
+    cache.put("k", "v")
+    cache.flush()
+    old = time.time() - 120
+    path = tmp_path / "k.json"
+    path.write_text('{"created_at": %f, "text": "v"}' % old, encoding="utf-8")
+    fresh = ResponseCache(max_entries=4, ttl=60, disk_dir=str(tmp_path))
+    assert fresh.get("k") is None
+    assert not os.path.exists(path)
+
+
+def test_disk_size_is_tracked_without_rescanning(tmp_path, monkeypatch):
+    import response_cache
+
+    scans = []
+    listdir = os.listdir
+    monkeypatch.setattr(response_cache.os, "listdir", lambda path: scans.append(path) or listdir(path))
+
+    cache = ResponseCache(max_entries=100, ttl=0, disk_dir=str(tmp_path), disk_max_mb=1500 / (1024 * 1024))
+    for i in range(20):
+        cache.put(f"k{i:02d}", "x" * 100)
+    cache.flush()
+
+    files = sorted(p.name for p in tmp_path.glob("*.json"))
+    assert len(scans) == 1
+    assert sum((tmp_path / name).stat().st_size for name in files) <= 1500
+    assert cache._disk_bytes == sum((tmp_path / name).stat().st_size for name in files)
+    assert files[-1] == "k19.json" and "k00.json" not in files  # Oldest evicted first
+    cache.close()
@@ -0,0 +1,77 @@
+"""
+파일명: tests/unit/test_session_registry.py
+목적: scripts/scribe/session_registry.py의 SessionRegistry 단위 테스트
+기능:
+  - 세션별 객체 생성/재사용 검증
+  - LRU 및 유휴 TTL 기반 제거 검증
+  - 신규 세션 생성 훅(on_create) 호출 검증
+변경이력:
+  - 2026-10-17: 최초 구현
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts" / "scribe"))
+
+from session_registry import SessionRegistry, DEFAULT_SESSION_ID
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_creates_once_per_session():
+    registry = SessionRegistry(dict, max_sessions=4, idle_ttl=0)
+    a = registry.get("a")
+    assert registry.get("a") is a
+    assert registry.get("b") is not a
+    assert len(registry) == 2
+
+
+def test_none_maps_to_default_session():
+    registry = SessionRegistry(dict, max_sessions=4, idle_ttl=0)
+    assert registry.get(None) is registry.get(DEFAULT_SESSION_ID)
+
+
+def test_lru_eviction():
+    registry = SessionRegistry(dict, max_sessions=2, idle_ttl=0)
+    registry.get("a")
+    registry.get("b")
+    registry.get("a")  # b 가 가장 오래 사용되지 않은 세션
+    registry.get("c")
+    assert "a" in registry
+    assert "b" not in registry
+    assert "c" in registry
+
+
+def test_idle_ttl_eviction():
+    clock = FakeClock()
+    registry = SessionRegistry(dict, max_sessions=8, idle_ttl=10, clock=clock)
+    registry.get("a")
+    clock.now = 5
+    registry.get("b")
+    clock.now = 12
+    assert registry.evict_expired() == 1
+    assert registry.session_ids() == ["b"]
+
+
+def test_discard():
+    registry = SessionRegistry(dict, max_sessions=4, idle_ttl=0)
+    registry.get("a")
+    assert registry.discard("a") is True
+    assert registry.discard("a") is False
+    assert registry.peek("a") is None
+
+
+def test_on_create_runs_once_per_new_entry():
+    created = []
+    registry = SessionRegistry(dict, max_sessions=4, idle_ttl=0, on_create=lambda sid, value: created.append(sid))
+    registry.get("a")
+    registry.get("a")
+    registry.get(None)
+    assert created == ["a", DEFAULT_SESSION_ID]
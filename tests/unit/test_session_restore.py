@@ -0,0 +1,69 @@
+"""
+파일명: tests/unit/test_session_restore.py
+목적: scripts/scribe/scribe.py의 세션 복원(get_session) 단위 테스트
+기능:
+  - 동시 요청이 세션 복원을 한 번만 수행하는지 검증
+  - 복원 실패 후 다음 요청에서 다시 복원을 시도하는지 검증
+변경이력:
+  - 2026-10-17: 최초 구현
+"""
+
+import asyncio
+import sqlite3
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("fastapi")
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts" / "scribe"))
+
+import scribe
+from session_registry import SessionRegistry
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = SessionRegistry(lambda: SimpleNamespace(restored=None, current_summary="", on_summary=None))
+    monkeypatch.setattr(scribe, "sessions", registry)
+    return registry
+
+
+def test_concurrent_first_requests_restore_once(monkeypatch, registry):
+    reads = []
+
+    def get(session_id):
+        reads.append(session_id)
+        return {"summary": "이전 요약"}
+
+    monkeypatch.setattr(scribe.session_store, "get", get)
+
+    async def scenario():
+        return await asyncio.gather(*(scribe.get_session("s1") for _ in range(4)))
+
+    summarizers = asyncio.run(scenario())
+    assert all(s is summarizers[0] for s in summarizers)
+    assert reads == ["s1"]
+    assert summarizers[0].current_summary == "이전 요약"
+    assert summarizers[0].on_summary is not None
+
+
+def test_failed_restore_is_retried(monkeypatch, registry):
+    reads = []
+
+    def get(session_id):
+        reads.append(session_id)
+        if len(reads) == 1:
+            raise sqlite3.OperationalError("database is locked")
+        return {"summary": "이전 요약"}
+
+    monkeypatch.setattr(scribe.session_store, "get", get)
+
+    with pytest.raises(sqlite3.OperationalError):
+        asyncio.run(scribe.get_session("s1"))
+    summarizer = asyncio.run(scribe.get_session("s1"))
+
+    assert reads == ["s1", "s1"]
+    assert summarizer is registry.peek("s1")
+    assert summarizer.current_summary == "이전 요약"
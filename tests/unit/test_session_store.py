@@ -0,0 +1,92 @@
+"""
+파일명: tests/unit/test_session_store.py
+목적: scripts/scribe/session_store.py의 회의 세션 저장소(SQLite 추가 전용 로그) 단위 테스트
+기능:
+  - 전사/메모/메타데이터/요약 버전 기록 및 재시작 후 복구 검증
+  - 스냅샷 압축(compaction) 후 로그 정리 및 요약 버전 수 제한 검증
+  - 초기화(reset) 범위 및 보존 기간 경과 세션 삭제 검증
+변경이력:
+  - 2026-10-17: 최초 구현
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts" / "scribe"))
+
+from session_store import SessionStore
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_800_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _log_rows(path):
+    with sqlite3.connect(path) as db:
+        return db.execute("SELECT COUNT(*) FROM session_log").fetchone()[0]
+
+
+def test_state_survives_restart(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    store = SessionStore(path, flush_interval=60)
+    store.append("m1", "meta", {"meeting_title": "주간회의", "participants": ["김철수"]})
+    store.append("m1", "transcript", "- 안녕하세요")
+    store.append("m1", "transcript", "- 시작하겠습니다")
+    store.append("m1", "note", "[00:10] 예산 확인")
+    store.append("m1", "summary", "요약 v1")
+    assert store.get("m1")["summary"] == "요약 v1"  # Visible before it is written
+    store.close()
+
+    recovered = SessionStore(path).get("m1")
+    assert recovered["transcript"] == ["- 안녕하세요", "- 시작하겠습니다"]
+    assert recovered["notes"] == ["[00:10] 예산 확인"]
+    assert recovered["meta"] == {"meeting_title": "주간회의", "participants": ["김철수"]}
+    assert recovered["summary"] == "요약 v1" and recovered["seq"] == 5
+    assert SessionStore(path).get("unknown") is None
+
+    with pytest.raises(ValueError):
+        SessionStore(path).append("m1", "meta", "not an object")
+
+
+def test_compaction_truncates_log_and_bounds_summary_versions(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    store = SessionStore(path, flush_interval=60, compact_every=10, max_versions=3)
+    for i in range(25):
+        store.append("m1", "transcript", f"- 문장 {i}")
+        if i % 5 == 0:
+            store.append("m1", "summary", f"요약 {i}")
+        store.flush()
+    store.append("m1", "reset")
+    store.append("m1", "transcript", "- 새 시작")
+    store.close()
+
+    assert _log_rows(path) < 10
+    recovered = SessionStore(path, max_versions=3).get("m1")
+    assert recovered["transcript"] == ["- 새 시작"]
+    assert recovered["summary"] == "" and recovered["summary_version"] == 5
+    assert recovered["seq"] == 32
+
+    store = SessionStore(path, max_versions=3)
+    store.append("m1", "summary", "요약 새것")
+    assert [s["version"] for s in store.get("m1")["summaries"]] == [6]
+
+
+def test_list_and_purge_expired_sessions(tmp_path):
+    clock = Clock()
+    store = SessionStore(str(tmp_path / "sessions.db"), flush_interval=60, retention_days=30, clock=clock)
+    store.append("old", "meta", {"meeting_title": "지난 회의"})
+    clock.now += 86400 * 31
+    store.append("new", "meta", {"meeting_title": "오늘 회의"})
+
+    assert [s["session_id"] for s in store.list_sessions()] == ["new", "old"]
+    assert store.purge_expired() == 1
+    assert [s["meeting_title"] for s in store.list_sessions()] == ["오늘 회의"]
+    assert store.get("old") is None
+    store.close()
@@ -0,0 +1,160 @@
+"""
+파일명: tests/unit/test_single_flight.py
+목적: scripts/scribe/single_flight.py의 세션별 요약 요청 병합(single-flight) 단위 테스트
+기능:
+  - 진행 중 요청과 같은 전사 구간(offset) 요청의 결과 공유 검증
+  - 진행 중에 도착한 새 세그먼트들이 단 한 번의 후속 호출로 병합되는지 검증
+  - 전사문을 다시 보내는 클라이언트의 중복 구간을 offset 기준으로 제거하는지 검증
+  - 같은 문장이 반복되어도 새 offset이면 요약에서 빠지지 않는지 검증
+  - 오디오 분석 호출이 텍스트 요약과 순서대로 직렬 실행되는지 검증
+  - 대기열의 각 호출이 제출한 엔드포인트로 메트릭이 집계되는지 검증
+변경이력:
+  - 2026-10-17: 최초 구현
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts" / "scribe"))
+
+import metrics
+from single_flight import SummaryCoalescer
+
+
+class StubSummarizer:
+    def __init__(self):
+        self.calls = []
+        self.current_summary = ""
+
+    async def summarize_stream(self, text, meeting_title=None, user_notes=None):
+        self.calls.append((text, meeting_title))
+        await asyncio.sleep(0.02)
+        yield {"delta": "요약 "}
+        self.current_summary = f"{self.current_summary}|{text}"
+        yield {"summary": self.current_summary, "usage": None, "done": True}
+
+
+def test_concurrent_requests_share_and_merge_into_one_follow_up():
+    summarizer = StubSummarizer()
+
+    async def scenario():
+        coalescer = SummaryCoalescer(summarizer)
+        first = coalescer.submit("A", offset=0)
+        duplicate = coalescer.submit("A", offset=0)
+        second = coalescer.submit("B", meeting_title="주간 회의", offset=1)
+        third = coalescer.submit("C", offset=2)
+        results = await asyncio.gather(first.result(), duplicate.result(), second.result(), third.result())
+        return first, duplicate, second, third, results, coalescer
+
+    first, duplicate, second, third, results, coalescer = asyncio.run(scenario())
+
+    assert duplicate is first and third is second
+    assert summarizer.calls == [("A", None), ("B\nC", "주간 회의")]
+    assert results[0] == results[1] == {"summary": "|A", "usage": None, "coalesced_requests": 2}
+    assert results[2] == results[3] == {"summary": "|A|B\nC", "usage": None, "coalesced_requests": 2}
+    assert not coalescer.busy
+
+
+def test_resent_transcript_only_adds_new_part_and_streams_replay():
+    summarizer = StubSummarizer()
+
+    async def scenario():
+        coalescer = SummaryCoalescer(summarizer)
+        coalescer.submit("A", offset=0)
+        # Client resends everything since its last acknowledged summary
+        follow_up = coalescer.submit("A\nB", offset=0)
+        again = coalescer.submit("A\nB\nC", offset=0)
+        late_events = [event async for event in follow_up.subscribe()]
+        return follow_up, again, late_events
+
+    follow_up, again, late_events = asyncio.run(scenario())
+
+    assert again is follow_up
+    assert summarizer.calls[1][0] == "B\nC"
+    assert late_events[0] == {"delta": "요약 "}
+    assert late_events[-1]["done"]
+
+
+def test_repeated_line_at_a_new_offset_is_summarized():
+    summarizer = StubSummarizer()
+
+    async def scenario():
+        coalescer = SummaryCoalescer(summarizer)
+        first = coalescer.submit("네, 맞습니다", offset=0)
+        repeated = coalescer.submit("네, 맞습니다", offset=7)
+        unanchored = coalescer.submit("네, 맞습니다")
+        await asyncio.gather(first.result(), repeated.result())
+        return first, repeated, unanchored
+
+    first, repeated, unanchored = asyncio.run(scenario())
+
+    assert repeated is not first and unanchored is repeated
+    assert summarizer.calls == [("네, 맞습니다", None), ("네, 맞습니다\n네, 맞습니다", None)]
+
+
+def test_audio_call_runs_in_order_with_text_flights():
+    summarizer = StubSummarizer()
+    order = []
+
+    async def analyze():
+        order.append(("audio", summarizer.current_summary))
+        yield {"summary": "오디오", "transcript": "전사", "done": True}
+
+    async def scenario():
+        coalescer = SummaryCoalescer(summarizer)
+        before = coalescer.submit("A", offset=0)
+        audio = coalescer.submit_call(analyze)
+        after = coalescer.submit("B", offset=1)
+        results = await asyncio.gather(before.result(), audio.result(), after.result())
+        return audio, after, results
+
+    audio, after, results = asyncio.run(scenario())
+
+    assert after is not audio
+    assert order == [("audio", "|A")]
+    assert summarizer.calls == [("A", None), ("B", None)]
+    assert results[1] == {"summary": "오디오", "transcript": "전사"}
+
+
+def test_failed_audio_call_keeps_its_error():
+    async def broken():
+        yield {"error": "upload failed", "done": True}
+
+    async def scenario():
+        coalescer = SummaryCoalescer(StubSummarizer())
+        return await coalescer.submit_call(broken).result()
+
+    assert asyncio.run(scenario()) == {"error": "upload failed"}
+
+
+def test_each_flight_runs_under_its_submitters_endpoint():
+    summarizer = StubSummarizer()
+    seen = []
+
+    async def analyze():
+        seen.append(("audio", metrics.current_endpoint.get()))
+        yield {"summary": "오디오", "done": True}
+
+    async def record_text(text, meeting_title=None, user_notes=None):
+        seen.append(("text", metrics.current_endpoint.get()))
+        yield {"summary": text, "done": True}
+
+    summarizer.summarize_stream = record_text
+
+    async def submit_from(endpoint, submit):
+        token = metrics.current_endpoint.set(endpoint)
+        try:
+            return submit()
+        finally:
+            metrics.current_endpoint.reset(token)
+
+    async def scenario():
+        coalescer = SummaryCoalescer(summarizer)
+        first = await submit_from("/summarize", lambda: coalescer.submit("A", offset=0))
+        audio = await submit_from("/jobs/analyze_audio", lambda: coalescer.submit_call(analyze))
+        await asyncio.gather(first.result(), audio.result())
+
+    asyncio.run(scenario())
+
+    assert seen == [("text", "/summarize"), ("audio", "/jobs/analyze_audio")]
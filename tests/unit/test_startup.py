@@ -0,0 +1,35 @@
+"""
+파일명: tests/unit/test_startup.py
+목적: scripts/scribe/scribe.py 기동 시간(임포트 비용) 검사
+기능:
+  - scribe 임포트 시 무거운 모듈(google.genai, googleapiclient 등) 미로딩 검증
+  - 임포트 시간 예산(SCRIBE_IMPORT_BUDGET_MS) 경고 미발생 검증
+변경이력:
+  - 2026-10-17: 최초 구현
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIBE_DIR = Path(__file__).resolve().parents[2] / "scripts" / "scribe"
+HEAVY_MODULES = ("google.genai", "googleapiclient", "google_auth_oauthlib", "faster_whisper", "numpy", "uvicorn")
+
+
+def test_import_is_lazy_and_within_budget():
+    pytest.importorskip("fastapi")
+    code = (
+        "import sys, json, scribe; "
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    env = dict(os.environ, WHISPER_PRELOAD="0", SCRIBE_IMPORT_BUDGET_MS=os.getenv("SCRIBE_IMPORT_BUDGET_MS", "3000"))
+    result = subprocess.run([sys.executable, "-c", code], cwd=SCRIBE_DIR, env=env,
+                            capture_output=True, text=True, timeout=60)
+
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
+    assert "importing scribe took" not in result.stdout
@@ -0,0 +1,57 @@
+"""
+파일명: tests/unit/test_stream_transcriber.py
+목적: scripts/scribe/stream_transcriber.py의 VAD 기반 발화 분할 단위 테스트
+기능:
+  - 음성 구간 뒤 침묵에서 final 이벤트 발생 검증
+  - 짧은 잡음(blip) 무시 검증
+변경이력:
+  - 2026-10-17: 최초 구현
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts" / "scribe"))
+
+from stream_transcriber import SAMPLE_RATE, StreamingSession, recognition_result
+
+
+def pcm(seconds, amplitude):
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    tone = amplitude * np.sin(2 * np.pi * 220 * t)
+    return (tone * 32767).astype("<i2").tobytes()
+
+
+def feed_all(session, data, chunk=3200):
+    actions = []
+    for i in range(0, len(data), chunk):
+        action = session.feed(data[i:i + chunk])
+        if action:
+            actions.append(action)
+        if action == "final":
+            session.take_utterance()
+    return actions
+
+
+def test_speech_then_silence_is_finalized():
+    session = StreamingSession()
+    actions = feed_all(session, pcm(0.5, 0.0) + pcm(1.5, 0.3) + pcm(1.0, 0.0))
+    assert "partial" in actions
+    assert actions.count("final") == 1
+    assert session.result_index == 1
+
+
+def test_short_blip_is_ignored():
+    session = StreamingSession()
+    actions = feed_all(session, pcm(0.5, 0.0) + pcm(0.06, 0.3) + pcm(1.0, 0.0))
+    assert actions == []
+    assert session.flush() is None
+
+
+def test_recognition_result_shape():
+    event = recognition_result(2, "안녕하세요", True)
+    assert event["resultIndex"] == 2
+    assert event["results"][0]["isFinal"] is True
+    assert event["results"][0]["alternatives"][0]["transcript"] == "안녕하세요"
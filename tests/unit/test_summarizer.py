@@ -0,0 +1,168 @@
+"""
+파일명: tests/unit/test_summarizer.py
+목적: scripts/scribe/summarizer.py의 Summarizer 단위 테스트 (Gemini 호출 없이 가짜 클라이언트 사용)
+기능:
+  - 세그먼트 경계 기반 분할 검증
+  - map-reduce 요약의 병렬 실행 및 usage 합산 검증
+  - 비동기 요약/오디오 분석(스트리밍 포함) 및 동기 래퍼 검증
+  - 실행 중인 이벤트 루프 안에서 동기 래퍼 호출 시 RuntimeError 검증
+변경이력:
+  - 2026-10-17: 최초 구현
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("google.genai")
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts" / "scribe"))
+
+import fake_backend
+from summarizer import Summarizer
+
+
+class FakeAsyncModels:
+    def __init__(self):
+        self.prompts = []
+        self.active = 0
+        self.max_active = 0
+
+    async def generate_content(self, model, contents, config=None):
+        self.prompts.append(contents)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        usage = SimpleNamespace(prompt_token_count=10, candidates_token_count=5, total_token_count=15)
+        return SimpleNamespace(text=f"summary {len(self.prompts)}", usage_metadata=usage)
+
+
+def make_summarizer(monkeypatch, **env):
+    for key, value in env.items():
+        monkeypatch.setenv(key, value)
+    models = FakeAsyncModels()
+    client = SimpleNamespace(aio=SimpleNamespace(models=models))
+    return Summarizer(api_key="test", model_name="fake-model", client=client), models
+
+
+def test_split_transcript_on_segment_lines(monkeypatch):
+    summarizer, _ = make_summarizer(monkeypatch)
+    text = "\n".join(f"- segment {i} " + "x" * 40 for i in range(10))
+    chunks = summarizer._split_transcript(text, 120)
+    assert len(chunks) > 1
+    assert "\n".join(chunks) == text
+    assert all(chunk.startswith("- ") for chunk in chunks)
+
+
+def test_short_text_is_single_call(monkeypatch):
+    summarizer, models = make_summarizer(monkeypatch)
+    result = asyncio.run(summarizer.summarize_async("- hello"))
+    assert len(models.prompts) == 1
+    assert result["summary"] == summarizer.current_summary
+
+
+def test_map_reduce_for_long_text(monkeypatch):
+    summarizer, models = make_summarizer(
+        monkeypatch, SUMMARY_MAP_REDUCE_CHARS="500", SUMMARY_CHUNK_CHARS="200", SUMMARY_MAX_PARALLEL="2"
+    )
+    text = "\n".join(f"- segment {i} " + "y" * 50 for i in range(20))
+    result = asyncio.run(summarizer.summarize_async(text, meeting_title="주간 회의"))
+
+    chunks = result["usage"]["map_reduce_chunks"]
+    assert chunks > 2
+    assert len(models.prompts) == chunks + 1  # map calls + one reduce
+    assert models.max_active <= 2
+    assert result["usage"]["input_tokens"] == 10 * (chunks + 1)
+    assert "Part 1" in models.prompts[-1]
+
+
+def test_running_summary_is_compacted_over_budget(monkeypatch):
+    summarizer, models = make_summarizer(monkeypatch, SUMMARY_CONTEXT_MAX_TOKENS="50")
+    summarizer.current_summary = "## 2. 주요 논의\n" + "- 오래된 논의 내용\n" * 100
+    result = asyncio.run(summarizer.summarize_async("- new segment", user_notes=["[00:10] 메모", "[00:10]  메모"]))
+
+    assert len(models.prompts) == 2  # compaction + update
+    assert "Compact this minute" in models.prompts[0]
+    assert "오래된 논의 내용" not in models.prompts[1]
+    assert models.prompts[1].count("메모") == 1  # duplicate note removed
+    assert result["usage"]["input_tokens"] == 20
+
+
+def test_identical_request_is_served_from_cache(monkeypatch):
+    summarizer, models = make_summarizer(monkeypatch)
+    first = asyncio.run(summarizer.summarize_async("- same segment", meeting_title="회의"))
+
+    # A retry from the same context builds the same prompt
+    summarizer.current_summary = ""
+    second = asyncio.run(summarizer.summarize_async("- same segment", meeting_title="회의"))
+
+    assert len(models.prompts) == 1
+    assert second["summary"] == first["summary"]
+    assert second["usage"]["cached"] is True
+    assert second["usage"]["total_tokens"] == 0
+
+
+def make_fake_backend_summarizer(monkeypatch):
+    monkeypatch.setenv("SUMMARY_AUDIO_SEGMENT_MODE", "off")
+    config = fake_backend.FakeBackendConfig(latency=0, upload_per_mb=0, output_chars=40, stream_chunks=3)
+    client = fake_backend.FakeGenaiClient(config)
+    return Summarizer(api_key="test", model_name="fake-model", client=client), client
+
+
+def test_summarize_stream_yields_deltas_then_summary(monkeypatch):
+    summarizer, _ = make_fake_backend_summarizer(monkeypatch)
+
+    async def collect():
+        return [event async for event in summarizer.summarize_stream("- streamed segment")]
+
+    events = asyncio.run(collect())
+    assert len(events) > 2
+    assert events[-1]["done"] is True
+    assert events[-1]["summary"] == "".join(e["delta"] for e in events[:-1])
+    assert summarizer.current_summary == events[-1]["summary"]
+
+
+def test_analyze_audio_async_deletes_one_off_upload(monkeypatch, tmp_path):
+    summarizer, client = make_fake_backend_summarizer(monkeypatch)
+    audio = tmp_path / "meeting.webm"
+    audio.write_bytes(b"\x1a\x45\xdf\xa3" + b"\0" * 1024)
+
+    result = asyncio.run(summarizer.analyze_audio_async(str(audio), meeting_title="회의"))
+    assert result["summary"] == summarizer.current_summary
+    assert client.aio.files.uploaded == {}
+
+    async def collect():
+        return [event async for event in summarizer.analyze_audio_stream(str(audio))]
+
+    assert asyncio.run(collect())[-1]["done"] is True
+    assert client.aio.files.uploaded == {}
+
+
+def test_analyze_audio_async_keeps_managed_upload_for_reuse(monkeypatch, tmp_path):
+    summarizer, client = make_fake_backend_summarizer(monkeypatch)
+    audio = tmp_path / "meeting.webm"
+    audio.write_bytes(b"\0" * 1024)
+
+    asyncio.run(summarizer.analyze_audio_async(str(audio), sha256="abc", size=1024))
+    assert len(client.aio.files.uploaded) == 1
+    assert summarizer.files._files["abc"].refs == 0
+
+
+def test_sync_wrappers_refuse_to_block_a_running_loop(monkeypatch, tmp_path):
+    summarizer, client = make_fake_backend_summarizer(monkeypatch)
+    audio = tmp_path / "meeting.webm"
+    audio.write_bytes(b"\0" * 1024)
+
+    assert "error" not in summarizer.summarize("- plain call")
+
+    async def from_loop():
+        with pytest.raises(RuntimeError, match="_async"):
+            summarizer.summarize("- called from a coroutine")
+        with pytest.raises(RuntimeError, match="_async"):
+            summarizer.analyze_audio(str(audio))
+
+    asyncio.run(from_loop())
+    assert client.aio.files.uploaded == {}
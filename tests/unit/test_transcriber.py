@@ -0,0 +1,128 @@
+"""
+파일명: tests/unit/test_transcriber.py
+목적: scripts/scribe/transcriber.py의 WhisperPool 단위 테스트 (faster_whisper를 가짜 모델로 대체)
+기능:
+  - 지연 로딩 및 동시 요청 시 모델 1회 로딩 검증
+  - 배치 크기/언어 전달 및 세그먼트 변환 검증
+  - 워커 수(num_workers)에 따른 동시 디코딩 제한 검증
+  - close() 이후 작업 거부 검증
+변경이력:
+  - 2026-10-17: 최초 구현
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+from types import ModuleType, SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts" / "scribe"))
+
+from transcriber import WhisperPool, whisper_language
+
+
+class FakeWhisperModel:
+    instances = []
+
+    def __init__(self, model_size, **kwargs):
+        self.model_size = model_size
+        self.kwargs = kwargs
+        FakeWhisperModel.instances.append(self)
+        time.sleep(0.05)  # Make concurrent first loads overlap
+
+
+class FakePipeline:
+    def __init__(self, model):
+        self.model = model
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def transcribe(self, audio, language=None, batch_size=None):
+        self.calls.append({"audio": audio, "language": language, "batch_size": batch_size})
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.05)
+        with self._lock:
+            self.active -= 1
+        segments = (SimpleNamespace(start=i * 1.234, end=i * 1.234 + 1, text=f" 문장 {i} ") for i in range(3))
+        return segments, SimpleNamespace(language=language, duration=3.7021)
+
+
+@pytest.fixture
+def fake_whisper(monkeypatch):
+    FakeWhisperModel.instances = []
+    module = ModuleType("faster_whisper")
+    module.WhisperModel = FakeWhisperModel
+    module.BatchedInferencePipeline = FakePipeline
+    monkeypatch.setitem(sys.modules, "faster_whisper", module)
+    return module
+
+
+def test_whisper_language():
+    assert whisper_language("ko-KR") == "ko"
+    assert whisper_language("EN") == "en"
+    assert whisper_language(None) is None
+
+
+def test_model_is_loaded_lazily_and_once(fake_whisper):
+    pool = WhisperPool(model_size="tiny", num_workers=2)
+    try:
+        assert not pool.loaded
+        assert FakeWhisperModel.instances == []
+
+        threads = [threading.Thread(target=pool.load) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert pool.loaded
+        assert len(FakeWhisperModel.instances) == 1
+    finally:
+        pool.close()
+
+
+def test_transcribe_batches_and_formats_segments(fake_whisper, monkeypatch):
+    monkeypatch.setenv("TRANSCRIPTION_LANGUAGE", "ko-KR")
+    pool = WhisperPool(model_size="tiny", batch_size=16)
+    try:
+        result = pool.transcribe("meeting.wav")
+        assert pool.pipeline.calls == [{"audio": "meeting.wav", "language": "ko", "batch_size": 16}]
+        assert result["text"] == "문장 0\n문장 1\n문장 2"
+        assert result["segments"][1] == {"start": 1.23, "end": 2.23, "text": "문장 1"}
+        assert result["duration"] == 3.7
+
+        pool.transcribe("meeting.wav", language="en-US")
+        assert pool.pipeline.calls[-1]["language"] == "en"
+    finally:
+        pool.close()
+
+
+def test_pool_sizing_bounds_concurrent_decodes(fake_whisper, monkeypatch):
+    monkeypatch.setenv("WHISPER_NUM_WORKERS", "2")
+    monkeypatch.setenv("WHISPER_CPU_THREADS", "3")
+    pool = WhisperPool(model_size="tiny")
+    try:
+        async def run_all():
+            return await asyncio.gather(*(pool.transcribe_async(f"{i}.wav") for i in range(6)))
+
+        results = asyncio.run(run_all())
+        assert len(results) == 6
+        assert pool.pipeline.max_active == 2
+        assert FakeWhisperModel.instances[0].kwargs["num_workers"] == 2
+        assert FakeWhisperModel.instances[0].kwargs["cpu_threads"] == 3
+        assert FakeWhisperModel.instances[0].kwargs["compute_type"] == "int8"
+    finally:
+        pool.close()
+
+
+def test_close_rejects_new_work(fake_whisper):
+    pool = WhisperPool(model_size="tiny")
+    pool.close()
+    with pytest.raises(RuntimeError):
+        asyncio.run(pool.transcribe_async("late.wav"))